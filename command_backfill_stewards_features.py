@@ -0,0 +1,148 @@
+import sys
+import time
+import argparse
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pymongo import UpdateOne
+
+from database_management.mongodb import connect_to_mongodb
+from static.telegram import send_telegram_message
+from static.static_functions import DataFormatting
+
+
+# Re-tags stewardsCommentsLong over the full history (e.g. after the lookup table changes).
+# Streams chunks from Mongo or a local csv mirror, tags each DISTINCT comment once across a
+# process pool and writes back only the long_stew_* columns that actually changed.
+
+_TAGGER = None
+
+
+def _init_worker(tagger):
+    global _TAGGER
+    _TAGGER = tagger
+
+
+def _tag_batch(comments):
+    return _TAGGER.tag_many(comments)
+
+
+def tag_new_comments(comments, tagger, cache, pool=None, batch_size=500):
+    """Tag the comments not already in the cache, returns how many were tagged."""
+    new_comments = [c for c in dict.fromkeys(comments) if c not in cache]
+    if not new_comments:
+        return 0
+    batches = [new_comments[i:i + batch_size] for i in range(0, len(new_comments), batch_size)]
+    results = pool.map(_tag_batch, batches) if pool is not None else map(tagger.tag_many, batches)
+    for batch, tagged in zip(batches, results):
+        cache.update(zip(batch, tagged))
+    return len(new_comments)
+
+
+def _same_value(col, old, new, vocab):
+    if col == 'long_stew_feature_ids':
+        return list(vocab._parse_ids(old)) == new
+    if not isinstance(old, str):
+        old = ''
+    return old == new
+
+
+def stream_mongo_chunks(collection, chunk_size, cols):
+    projection = {'_id': 1, 'stewardsCommentsLong': 1, **{col: 1 for col in cols}}
+    cursor = collection.find({}, projection=projection, no_cursor_timeout=True).batch_size(chunk_size)
+    chunk = []
+    try:
+        for doc in cursor:
+            chunk.append(doc)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
+    finally:
+        cursor.close()
+
+
+def main_stew_backfill(source='mongo', collection_name='harness_historical', csv_path=None,
+                       chunk_size=20000, workers=4, dry_run=False):
+    static_functions = DataFormatting()
+    tagger = static_functions.get_stew_tagger()
+    vocab = static_functions.stew_vocab
+    stew_cols = static_functions.stew_feature_cols
+
+    if source == 'mongo':
+        collection = connect_to_mongodb(collection_name)
+        if collection is None:
+            return
+        chunks = stream_mongo_chunks(collection, chunk_size, stew_cols)
+        out_path = None
+    else:
+        chunks = pd.read_csv(csv_path, chunksize=chunk_size)
+        out_path = csv_path.replace('.csv', '_stew_backfill.csv')
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tagger,))
+
+    cache = {}
+    start = time.time()
+    n_rows = n_tagged = n_changed = 0
+    col_changes = {col: 0 for col in stew_cols}
+    try:
+        for i, chunk in enumerate(chunks):
+            comments = static_functions.clean_stew_comments(chunk['stewardsCommentsLong'])
+            comments = [c if isinstance(c, str) else None for c in comments]
+            n_tagged += tag_new_comments(comments, tagger, cache, pool)
+
+            old_rows = chunk.reindex(columns=stew_cols).to_dict('records')
+            new_values = {col: [] for col in stew_cols}
+            ops = []
+            for j, (comment, old_row) in enumerate(zip(comments, old_rows)):
+                new_row = dict(zip(stew_cols, cache[comment]))
+                changes = {col: val for col, val in new_row.items() if not _same_value(col, old_row[col], val, vocab)}
+                for col, val in new_row.items():
+                    new_values[col].append(val)
+                if not changes:
+                    continue
+                n_changed += 1
+                for col in changes:
+                    col_changes[col] += 1
+                if source == 'mongo':
+                    ops.append(UpdateOne({'_id': chunk['_id'].iat[j]}, {'$set': changes}))
+
+            if source == 'mongo':
+                if ops and not dry_run:
+                    collection.bulk_write(ops, ordered=False)
+            elif not dry_run:
+                for col in stew_cols:
+                    chunk[col] = new_values[col]
+                chunk.to_csv(out_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+            n_rows += len(chunk)
+            print(f'Chunk {i}: {n_rows} rows, {n_tagged} distinct comments tagged, {n_changed} rows changed '
+                  f'({time.time() - start:.1f}s)')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    summary = (f'Stewards backfill {"(dry run) " if dry_run else ""}finished: {n_rows} rows, '
+               f'{n_tagged} distinct comments, {n_changed} rows changed {col_changes} in {time.time() - start:.0f}s')
+    print(summary)
+    if source == 'mongo' and not dry_run:
+        send_telegram_message(summary)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Backfill stewards comment features over history')
+    parser.add_argument('--csv', default=None, help='Local mirror csv instead of Mongo')
+    parser.add_argument('--collection', default='harness_historical')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(sys.argv[1:])
+
+    main_stew_backfill(source='csv' if args.csv else 'mongo',
+                       collection_name=args.collection,
+                       csv_path=args.csv,
+                       chunk_size=args.chunk_size,
+                       workers=args.workers,
+                       dry_run=args.dry_run)
@@ -8,6 +8,7 @@ from static.telegram import send_telegram_message
 from data_acquisition.historic_cleaning import DataCleaning
 from static.static_data import StaticData
 from static.static_functions import DataFormatting
+from static.scheduling import run_schedule_forever
 
 
 # TODO
@@ -145,7 +146,7 @@ def main_db_run(force_full_check=False):
                          'stewardsCommentsLong', 'stewardsCommentsShort', 'trainerDOB', 
                          'trainerGender', 'trainerId', 'trainerName', 'trainerTitle', 'trotterInPacersRace', 
                          'bsp', 'preplay_last_price_taken', 'long_stew_unclustered_features', 
-                         'long_stew_clustered_features', 'date_added', 'date', 
+                         'long_stew_clustered_features', 'long_stew_feature_ids', 'date_added', 'date', 
                          'lead_time_value', 'additional_distance_travelled', 'top_speed', 
                          'first_50m', 'first_100m', 'first_200m', 'time_400m', 'time_800m', 
                          'time_1200m', 'time_1600m', 'width_800m_pj', 'width_400m_pj'
@@ -254,8 +255,7 @@ def main_db_schedule(wait):
     else:
         print("Waiting until next scheduled time...")
 
-    while True:
-        schedule.run_pending()
+    run_schedule_forever()
 
 if __name__ == "__main__":
     main_db_schedule(None)
@@ -2,187 +2,319 @@ import schedule
 import datetime
 import pandas as pd
 import asyncio
-import atexit
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 
 from data_acquisition.upcoming_data_source import GetUpcomingData
-from database_management.mongodb import clean_upcoming_greys_from_mongodb, save_to_mongodb
+from database_management.mongodb import sync_upcoming_to_mongodb
 from static.telegram import send_telegram_message
 from sp_data.betfair_data import pull_betfair_data
-from sp_data.betwatch_data import BetwatchData
+from sp_data.betwatch_data import get_shared_betwatch
 from retrying import retry    
 from static.static_data import StaticData
 from static.static_functions import DataFormatting
+from static.runner_names import RunnerLinkage
+from static.scheduling import run_schedule_forever, race_refresh_times, schedule_one_off_jobs
+
+# seconds each source gets before the run carries on without it
+SOURCE_TIMEOUTS = {'rise': 600, 'betwatch': 180, 'betfair': 120}
+# near-jump refreshes: races starting within this many minutes, re-run every NEAR_JUMP_EVERY minutes in racing hours
+NEAR_JUMP_MINUTES = 30
+NEAR_JUMP_EVERY = 5
+NEAR_JUMP_HOURS = (11, 23)
+BETWATCH_COLS = ['date', 'state', 'track', 'race_number', 'dogname', 'dog_number', 'betfair_dog_id', 'bsp', 'ltp', 'bsp_place']
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def window_tracks(meetings):
+    """RISE meeting tracks in Betwatch's spelling (same renames as build_upcoming_frame) for the Betwatch tracks filter."""
+    tracks = meetings['track'].astype(str).str.lower().str.strip().str.replace(' extra', '', regex=False)
+    tracks = tracks.replace(StaticData().track_name_updates)
+    return sorted(tracks.str.title().unique())
+
+
+def fetch_upcoming_sources(bw, timeouts=None, near_jump=None):
+    """
+    RISE fields, Betwatch runners and the Betfair mapping pulled at the same time, so a run takes as long
+    as the slowest source. A source that errors or runs past its timeout comes back as None.
+    near_jump=(minutes_ahead, minutes_behind) only pulls fields for races in that window and today's Betwatch races
+    at those meetings.
+
+    Betwatch and Betfair run on shared clients, so their timeouts are enforced inside the pulls (the Betwatch
+    coroutine is cancelled on its loop, the Betfair pull stops between requests) and their threads always finish.
+    Only the RISE fetch, which owns nothing shared, is waited on with a timeout and left behind when it overruns.
+    """
+    timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+    tracks = None
+    if near_jump is None:
+        get_fields = lambda: GetUpcomingData().get_upcoming_meetings()
+    else:
+        # the window comes from the day's schedule cached by the last full run, Betwatch only gets its meetings
+        source = GetUpcomingData()
+        window_races, meetings = source.races_starting_within(*near_jump)
+        if window_races is None:
+            return {name: None for name in SOURCE_TIMEOUTS}, {}
+        get_fields = lambda: source.get_race_fields(window_races['raceCode'].unique(), meetings)
+        tracks = window_tracks(meetings)
+    stages = {
+        'rise': get_fields,
+        'betwatch': lambda: bw.run(bw.pull_sequential_dates(num_search_days=2 if near_jump is None else 1,
+                                                            meeting_types='H',
+                                                            look_forwards=True,
+                                                            profile='upcoming_mapping',
+                                                            tracks=tracks),
+                                   timeout=timeouts['betwatch']),
+        'betfair': lambda: pull_betfair_data(race_code='harness', timeout=timeouts['betfair']), #horses, greyhounds, harness or all
+    }
+    results, timings = {}, {}
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=len(stages))
+    futures = {name: pool.submit(_timed, fn) for name, fn in stages.items()}
+    for name, future in futures.items():
+        remaining = max(timeouts[name] - (time.perf_counter() - start), 0) if name == 'rise' else None
+        try:
+            results[name], timings[name] = future.result(timeout=remaining)
+        except (FuturesTimeout, asyncio.TimeoutError, TimeoutError):
+            print(f'{name} fetch timed out after {timeouts[name]}s, carrying on without it')
+            results[name], timings[name] = None, 'timeout'
+        except Exception as e:
+            print(f'{name} fetch failed: {e}')
+            results[name], timings[name] = None, 'error'
+    # only an overrunning RISE fetch can still be going, it finishes on its own
+    pool.shutdown(wait=False)
+    timings['total'] = time.perf_counter() - start
+    print('Upcoming fetch timings: ' + ', '.join(f'{k} {v:.1f}s' if isinstance(v, float) else f'{k} {v}' for k, v in timings.items()))
+    return results, timings
+
+
+def build_upcoming_frame(master_upcoming_races, df_betwatch, betfair_data, alerts=True):
+    """RISE fields + Betwatch runners + Betfair markets -> the harness_upcoming rows, None if the runner merge fails."""
+    master_upcoming_races = master_upcoming_races.rename(columns={'plannedStartTimestamp': 'date'})
+
+    static_data = StaticData()
+    static_functions = DataFormatting()
+    track_update_dict = static_data.track_name_updates
+
+    # no betwatch means no tab numbers / betfair runner ids, the field is still written
+    df = df_betwatch if df_betwatch is not None else pd.DataFrame(columns=BETWATCH_COLS)
+
+    df['date'] = df['date'].apply(lambda x: pd.to_datetime(x, errors='coerce').strftime('%Y-%m-%d'))
+
+    master_upcoming_races['date'] = master_upcoming_races['date'].apply(lambda x: pd.to_datetime(x, errors='coerce'))
+    master_upcoming_races['date'] = master_upcoming_races['date'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None)
+
+    df['track'] = df['track'].apply(lambda x: x.lower().strip().replace(' extra', ''))
+    master_upcoming_races['track'] = master_upcoming_races['track'].apply(lambda x: x.lower().strip().replace(' extra', ''))
+
+    # trackname updates
+    master_upcoming_races['track'] = master_upcoming_races['track'].replace(track_update_dict)
+
+    seen = {}
+    new_cols = []
+
+    for col in master_upcoming_races.columns:
+        if col in seen:
+            seen[col] += 1
+            new_cols.append(f"{col}_{seen[col]}")
+        else:
+            seen[col] = 0
+            new_cols.append(col)
+
+    master_upcoming_races.columns = new_cols
+    master_upcoming_races = master_upcoming_races.rename(columns={'gait': 'gaitRace', 'gait_1': 'gaitHorse'})
+    master_upcoming_races = master_upcoming_races.rename(columns={'name': 'raceName', 'name_1': 'horseName'})
+    if 'raceCode_1' in master_upcoming_races.columns:
+        master_upcoming_races.drop(columns=['raceCode_1'], inplace=True)
+
+    df.rename(columns={'dogname': 'horseName',
+                       'dog_number': 'tab_horseNumber'}, inplace=True)
+    master_upcoming_races.drop(columns=['horseName'], inplace=True)
+    master_upcoming_races.rename(columns={'nameNoCountry': 'horseName'}, inplace=True)
+
+    master_upcoming_races['horseName'] = master_upcoming_races['horseName'].apply(lambda x: x.lower().strip())
+
+    # integer key join on canonical names through the linkage table, runners with a known betfair id match even if the names differ
+    linkage = RunnerLinkage()
+    try:
+        df_merged = linkage.merge_runners(master_upcoming_races, df.drop(columns=['state']),
+                                          left_on=('date', 'track', 'horseName'),
+                                          right_on=('date', 'track', 'horseName'),
+                                          right_betfair_col='betfair_dog_id',
+                                          source='betwatch_upcoming')
+        linkage.update_links(df_merged, betfair_id_col='betfair_dog_id')
+    except Exception as e:
+        print(f'Error merging master_upcoming_races and df: {e}')
+        return None
+
+    betfair_data = betfair_data if betfair_data is not None else pd.DataFrame()
+
+    if not betfair_data.empty:
+        betfair_data['date'] = betfair_data['market_start_time'].apply(lambda x: pd.to_datetime(str(x.date())).strftime('%Y-%m-%d'))
+
+        df_merged['raceNumber'] = pd.to_numeric(df_merged['raceNumber'], errors='coerce')
+        betfair_data['race_number'] = pd.to_numeric(betfair_data['race_number'], errors='coerce')
+
+        df_merged['track'] = df_merged['track'].apply(lambda x: x.lower().strip())
+        betfair_data['track'] = betfair_data['track'].apply(lambda x: x.lower().strip())
+
+        # Merge these two so we have the betfair market idx
+        # one row per market, the runner rows only multiplied the upcoming field before the dedup below
+        betfair_markets = betfair_data[['date', 'track', 'betfair_market_id', 'race_number']].drop_duplicates()
+        df_merged = df_merged.drop(columns=['race_number']).merge(betfair_markets, 
+                    left_on=['date', 'track', 'raceNumber'], 
+                    right_on=['date', 'track', 'race_number'],
+                    how='left')
+    else:
+        df_merged['betfair_market_id'] = None
+
+
+    df_merged = df_merged[~df_merged['state'].isin(['GBR'])]
+    no_betwatch_match = df_merged[(df_merged['betfair_market_id'].isna()) & (df_merged['trials'] == False)]
+    # no_betwatch_match.to_csv('no_betwatch_match.csv', index=False)
+    if no_betwatch_match.shape[0] > 0:
+        no_betwatch_match.to_csv('no_betfair_id.csv', index=False)
+        if alerts and datetime.datetime.now().hour > 10:
+            send_telegram_message(f'Found {no_betwatch_match.shape[0]} no betfair matches')
+
+    # drop duplicates based on conditions
+    df_merged.drop_duplicates(subset=['horseId', 'track', 'raceNumber'], inplace=True)
+
+    df_merged['date_added'] = datetime.datetime.now()
+
+    print(f'Found {len(df_merged["betfair_market_id"].unique())} unique betfair markets')
+
+    # check to make sure ive seen the track and distances before
+    df_merged = df_merged[~df_merged['distance'].isna()]
+    unique_tracks = df_merged['track'].unique()
+
+    for track in unique_tracks if alerts else []:
+        if track.lower().strip() not in static_data.aus_track_distances.keys():
+            send_telegram_message(f'Found a new track {track}??')
+
+        for distance in list(df_merged[df_merged['track'] == track]['distance'].unique()):
+            if distance not in static_data.aus_track_distances[track]:
+                send_telegram_message(f'Found a new distance {distance} for {track}??')
+
+    # FIX THE COLUMN NAMES I WANT TO ADD so it errors if theres any changes 
+    df_merged.rename(columns={'betfair_dog_id': 'betfair_horse_id'}, inplace=True)
+
+    # removed cols: 'distanceInLaps','leadTime', 'plannedStartTimeLocal',
+    # 'marginFirstToSecond', 'marginSecondToThird', 'mileRate',
+    # 'overallTime', 'quarter1', 'quarter2', 'quarter3', 'quarter4', 
+    # 'prizemoney13', 'prizemoney14', 'prizemoneyAll', 
+    # 'raceStatus', 'lastSixStartsFigureForm',
+    #  'driverInitials', 'driverLastName', 'driverNameShort', 'driverPreferredName', 'driverTitle',
+    # 'horseFoalDateTime','trainerBirthDateTime', 'trainerInitials', 'trainerLastName', 'trainerNameShort', 'trainerPreferredName', 'trainerTitle',
+
+
+    cols = ['ageRestriction', 'ageSexDescription', 'ageSexTrackRecord', 'alsoEligible',
+            'barrierDrawType', 'betTypes', 'blackType', 'claim', 'claimRestrictionText',
+            'discretionaryHandicap', 'distance', 'fieldSize',
+            'gaitRace', 'meetingCode', 'monte', 'raceName', 'nameShort', 'notes',
+            'numberAcrossFront',  'date',
+            'prizemoneyPositions', 'raceClass', 'raceClassRestriction',
+            'raceCode', 'raceNumber', 'raceStatus',
+            'stakes', 'startType', 'stateBred', 'trackCondition',
+            'age', 'barrier', 'breeder', 'breederId', 'claimingPrice', 'class',
+            'colour', 'colourId', 'driverBirthDateTime', 'driverConcessionFlag',
+            'driverGender', 'driverId', 'driverName', 
+            'emergency', 'engagements', 'freezebrand', 'gaitHorse', 'handicap',
+            'horseFoalDate',  'horseId', 'lateScratchingFlag',
+            'horseName', 'odStatus', 'saddlecloth', 'scratchingFlag', 'sex',
+             'trainerDOB', 'trainerGender', 'trainerId', 
+            'trainerName',  'trotterInPacersRace', 'club', 'clubId', 'dayNightTwilight',
+            'driversAvailableTime', 'featureRaceText', 'lateScratchingTime',
+            'meetingClass', 'state', 'tab', 'track', 'trackId', 'trials',
+            'tab_horseNumber', 'betfair_horse_id', 
+            'betfair_market_id', 'race_number', 'date_added']
+
+    df_merged = static_functions.format_upcoming_data(df_merged[cols])
+
+    if alerts and len(df_merged.trackCondition.unique()) > 1:
+        send_telegram_message(f'Multiple track conditions found: {df_merged.trackCondition.unique()}')
+
+    return df_merged
+
 
 def run():
     @retry(wait_fixed=10000, stop_max_attempt_number=3)
     def update_data():
         print(f'Resetting upcoming database at {datetime.datetime.now()}')
-        get_data = GetUpcomingData()
-        master_upcoming_races = get_data.get_upcoming_meetings()
+        bw = get_shared_betwatch()
+        sources, timings = fetch_upcoming_sources(bw)
+        degraded = [name for name in ['betwatch', 'betfair'] if sources[name] is None]
+        if degraded and datetime.datetime.now().hour > 10:
+            send_telegram_message(f'Upcoming run continuing without {", ".join(degraded)} ({timings})')
+
+        master_upcoming_races = sources['rise']
         if master_upcoming_races is None:
             print('No upcoming races found')
             return
-        master_upcoming_races.rename(columns={'plannedStartTimestamp': 'date'}, inplace=True)
-        
-        bw = BetwatchData()
-        static_data = StaticData()
-        static_functions = DataFormatting()
-        track_update_dict = static_data.track_name_updates
-
-        df = asyncio.run(bw.pull_sequential_dates(num_search_days=2, 
-                                                  meeting_types='H', 
-                                                  look_forwards=True))
-        
-        
-        df['date'] = df['date'].apply(lambda x: pd.to_datetime(x, errors='coerce').strftime('%Y-%m-%d'))
-        
-        master_upcoming_races['date'] = master_upcoming_races['date'].apply(lambda x: pd.to_datetime(x, errors='coerce'))
-        master_upcoming_races['date'] = master_upcoming_races['date'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None)
-        
-        df['track'] = df['track'].apply(lambda x: x.lower().strip().replace(' extra', ''))
-        master_upcoming_races['track'] = master_upcoming_races['track'].apply(lambda x: x.lower().strip().replace(' extra', ''))
-
-        # trackname updates
-        master_upcoming_races['track'] = master_upcoming_races['track'].replace(track_update_dict)
-        
-        seen = {}
-        new_cols = []
-        
-        for col in master_upcoming_races.columns:
-            if col in seen:
-                seen[col] += 1
-                new_cols.append(f"{col}_{seen[col]}")
-            else:
-                seen[col] = 0
-                new_cols.append(col)
-
-        master_upcoming_races.columns = new_cols
-        master_upcoming_races = master_upcoming_races.rename(columns={'gait': 'gaitRace', 'gait_1': 'gaitHorse'})
-        master_upcoming_races = master_upcoming_races.rename(columns={'name': 'raceName', 'name_1': 'horseName'})
-        if 'raceCode_1' in master_upcoming_races.columns:
-            master_upcoming_races.drop(columns=['raceCode_1'], inplace=True)
-
-        df.rename(columns={'dogname': 'horseName',
-                           'dog_number': 'tab_horseNumber'}, inplace=True)
-        master_upcoming_races.drop(columns=['horseName'], inplace=True)
-        master_upcoming_races.rename(columns={'nameNoCountry': 'horseName'}, inplace=True)
-
-        master_upcoming_races['horseName'] = master_upcoming_races['horseName'].apply(lambda x: x.lower().strip())
-        df['horseName'] = df['horseName'].apply(lambda x: x.lower().strip())
+        schedule_meeting_refreshes(master_upcoming_races)
 
-        try:
-            df_merged = master_upcoming_races.merge(df.drop(columns=['state']), 
-                                                left_on=['date', 'track', 'horseName'],
-                                                right_on=['date', 'track', 'horseName'],  
-                                                how='left')
-        except Exception as e:
-            print(f'Error merging master_upcoming_races and df: {e}')
+        df_merged = build_upcoming_frame(master_upcoming_races, sources['betwatch'], sources['betfair'])
+        if df_merged is None:
             return
 
-        betfair_data = pull_betfair_data(race_code='harness') #horses, greyhounds, harness or all
-
-        if not betfair_data.empty:
-            betfair_data['date'] = betfair_data['market_start_time'].apply(lambda x: pd.to_datetime(str(x.date())).strftime('%Y-%m-%d'))
-            
-            df_merged['raceNumber'] = pd.to_numeric(df_merged['raceNumber'], errors='coerce')
-            betfair_data['race_number'] = pd.to_numeric(betfair_data['race_number'], errors='coerce')
-
-            df_merged['track'] = df_merged['track'].apply(lambda x: x.lower().strip())
-            betfair_data['track'] = betfair_data['track'].apply(lambda x: x.lower().strip())
-            
-            # Merge these two so we have the betfair market idx
-            df_merged = df_merged.drop(columns=['race_number']).merge(betfair_data[['date', 'track', 'betfair_market_id', 'race_number']], 
-                        left_on=['date', 'track', 'raceNumber'], 
-                        right_on=['date', 'track', 'race_number'],
-                        how='left')
-        else:
-            df_merged['betfair_market_id'] = None
-
-        
-        df_merged = df_merged[~df_merged['state'].isin(['GBR'])]
-        no_betwatch_match = df_merged[(df_merged['betfair_market_id'].isna()) & (df_merged['trials'] == False)]
-        # no_betwatch_match.to_csv('no_betwatch_match.csv', index=False)
-        if no_betwatch_match.shape[0] > 0:
-            no_betwatch_match.to_csv('no_betfair_id.csv', index=False)
-            if datetime.datetime.now().hour > 10:
-                send_telegram_message(f'Found {no_betwatch_match.shape[0]} no betfair matches')
-
-        # drop duplicates based on conditions
-        df_merged.drop_duplicates(subset=['horseId', 'track', 'raceNumber'], inplace=True)
-
-        df_merged['date_added'] = datetime.datetime.now()
-
-        print(f'Found {len(df_merged["betfair_market_id"].unique())} unique betfair markets')
-
-        # check to make sure ive seen the track and distances before
-        df_merged = df_merged[~df_merged['distance'].isna()]
-        unique_tracks = df_merged['track'].unique()
-
-        for track in unique_tracks:
-            if track.lower().strip() not in static_data.aus_track_distances.keys():
-                send_telegram_message(f'Found a new track {track}??')
-
-            for distance in list(df_merged[df_merged['track'] == track]['distance'].unique()):
-                if distance not in static_data.aus_track_distances[track]:
-                    send_telegram_message(f'Found a new distance {distance} for {track}??')
-                
-        # FIX THE COLUMN NAMES I WANT TO ADD so it errors if theres any changes 
-        df_merged.rename(columns={'betfair_dog_id': 'betfair_horse_id'}, inplace=True)
-        
-        # removed cols: 'distanceInLaps','leadTime', 'plannedStartTimeLocal',
-        # 'marginFirstToSecond', 'marginSecondToThird', 'mileRate',
-        # 'overallTime', 'quarter1', 'quarter2', 'quarter3', 'quarter4', 
-        # 'prizemoney13', 'prizemoney14', 'prizemoneyAll', 
-        # 'raceStatus', 'lastSixStartsFigureForm',
-        #  'driverInitials', 'driverLastName', 'driverNameShort', 'driverPreferredName', 'driverTitle',
-        # 'horseFoalDateTime','trainerBirthDateTime', 'trainerInitials', 'trainerLastName', 'trainerNameShort', 'trainerPreferredName', 'trainerTitle',
-
-
-        cols = ['ageRestriction', 'ageSexDescription', 'ageSexTrackRecord', 'alsoEligible',
-                'barrierDrawType', 'betTypes', 'blackType', 'claim', 'claimRestrictionText',
-                'discretionaryHandicap', 'distance', 'fieldSize',
-                'gaitRace', 'meetingCode', 'monte', 'raceName', 'nameShort', 'notes',
-                'numberAcrossFront',  'date',
-                'prizemoneyPositions', 'raceClass', 'raceClassRestriction',
-                'raceCode', 'raceNumber', 'raceStatus',
-                'stakes', 'startType', 'stateBred', 'trackCondition',
-                'age', 'barrier', 'breeder', 'breederId', 'claimingPrice', 'class',
-                'colour', 'colourId', 'driverBirthDateTime', 'driverConcessionFlag',
-                'driverGender', 'driverId', 'driverName', 
-                'emergency', 'engagements', 'freezebrand', 'gaitHorse', 'handicap',
-                'horseFoalDate',  'horseId', 'lateScratchingFlag',
-                'horseName', 'odStatus', 'saddlecloth', 'scratchingFlag', 'sex',
-                 'trainerDOB', 'trainerGender', 'trainerId', 
-                'trainerName',  'trotterInPacersRace', 'club', 'clubId', 'dayNightTwilight',
-                'driversAvailableTime', 'featureRaceText', 'lateScratchingTime',
-                'meetingClass', 'state', 'tab', 'track', 'trackId', 'trials',
-                'tab_horseNumber', 'betfair_horse_id', 
-                'betfair_market_id', 'race_number', 'date_added']
-        
-        df_merged = static_functions.format_upcoming_data(df_merged[cols])
-    
-        if len(df_merged.trackCondition.unique()) > 1:
-            send_telegram_message(f'Multiple track conditions found: {df_merged.trackCondition.unique()}')
-                
         print('Saving to MongoDB')
-        save_to_mongodb(df_merged, collection_name='harness_upcoming')
-        clean_upcoming_greys_from_mongodb(collection_name='harness_upcoming')
+        # only new/changed/removed runners are written, so no dedup pass afterwards
+        sync_upcoming_to_mongodb(df_merged, collection_name='harness_upcoming')
         
         df_merged.to_csv('au_harness_upcoming.csv', index=False)
-        try:
-            if hasattr(bw.bw, '_BetwatchAsyncClient__exit'):
-                bw.bw._BetwatchAsyncClient__exit()
-                # Unregister the atexit handler after manual exit
-                atexit.unregister(bw.bw._BetwatchAsyncClient__exit)
-            else:
-                print("The __exit method does not exist.")
-        except Exception as e:
-            print(f'Error closing betwatch client {e}')
+        # shared betwatch client stays open for the next scheduled run
     try:
         update_data()
     except Exception as e:
         send_telegram_message(f'Error updating upcoming database: {e}')
 
+
+def run_near_jump(minutes_ahead=None, minutes_behind=5):
+    """
+    Fast refresh of just the races jumping in the next minutes_ahead: their fields, today's Betwatch
+    runners and the (cached) Betfair mapping, patched into harness_upcoming. No alerts, no csv.
+    """
+    minutes_ahead = minutes_ahead or NEAR_JUMP_MINUTES
+    start = time.perf_counter()
+    try:
+        sources, timings = fetch_upcoming_sources(get_shared_betwatch(), near_jump=(minutes_ahead, minutes_behind))
+        if sources['rise'] is None:
+            return
+        df_merged = build_upcoming_frame(sources['rise'], sources['betwatch'], sources['betfair'], alerts=False)
+        if df_merged is None or df_merged.empty:
+            return
+        counts = sync_upcoming_to_mongodb(df_merged, collection_name='harness_upcoming')
+        print(f'Near jump refresh: {df_merged["raceCode"].nunique()} races, {counts} in {time.perf_counter() - start:.1f}s')
+    except Exception as e:
+        print(f'Near jump refresh failed: {e}')
+
+
+def schedule_meeting_refreshes(upcoming_races, offsets_minutes=(30, 10), min_gap_minutes=15):
+    """
+    Extra one-off full runs T-30/T-10 before every non-trial race, so each meeting's whole window is
+    covered and not just its first race. Re-derived on every full run; times within min_gap_minutes
+    of the previous one share a run so stacked meetings don't queue back-to-back full pulls.
+    """
+    try:
+        races = upcoming_races
+        if 'trials' in races.columns:
+            races = races[races['trials'] != True]
+        race_starts = races.drop_duplicates(subset=['raceCode'])['plannedStartTimestamp']
+        refresh_times = race_refresh_times(race_starts, offsets_minutes=offsets_minutes, min_gap_minutes=min_gap_minutes)
+        schedule_one_off_jobs(run, refresh_times, tag='meeting_refresh')
+    except Exception as e:
+        print(f'Could not schedule meeting refreshes: {e}')
+
+
+def near_jump_job():
+    if NEAR_JUMP_HOURS[0] <= datetime.datetime.now().hour < NEAR_JUMP_HOURS[1]:
+        run_near_jump()
+
+
 # This will run only once (so that when restarting the script it will also run + schedule)
 def once():
     run()
@@ -191,6 +323,7 @@ def once():
 
 def main(wait=None):
     # start_times = ["06:00", "08:00", "09:00", "10:00", "11:00", "13:00", "15:00", "17:00", "19:00"]
+    # hourly baseline, the race-derived refreshes are added on top by each run (schedule_meeting_refreshes)
     start_times = ["09:00", "10:00", "11:00", "12:00", "13:00", 
                    "14:00", "15:00", "16:00", "17:00", "18:00"]
     for start_time in start_times:
@@ -202,13 +335,14 @@ def main(wait=None):
         schedule.every().saturday.at(start_time).do(run)
         schedule.every().sunday.at(start_time).do(run)
 
+    schedule.every(NEAR_JUMP_EVERY).minutes.do(near_jump_job)
+
     if not wait:
         schedule.every(1).seconds.do(once)
     else:
         print("Waiting until next scheduled time...")
 
-    while True:
-        schedule.run_pending()
+    run_schedule_forever()
 
 if __name__ == "__main__":
     main()
@@ -30,6 +30,7 @@ def clean_datafields_formats(df):
     # df['boxNumber'] = pd.to_numeric(df['boxNumber'], errors='coerce').fillna(0).astype(int)
     df['plannedStartTimestamp'] = pd.to_datetime(df['plannedStartTimestamp'], format='mixed')
     df['distance'] = df['distance'].apply(lambda x: int(str(x).replace('m', '')))
+    # stored spelling stays as it was, the betting joins build canonical keys themselves (static/runner_names.py)
     df['horseName'] = df['horseName'].apply(lambda x: str(x).lower().replace("'", "").replace(".", "").replace("?", "").replace("  ", " ").strip())
     df['resultMargin'] = pd.to_numeric(df['resultMargin']).fillna(0).astype(float)
     df['prizeMoney'] = pd.to_numeric(df['prizeMoney']).fillna(0).astype(float)
@@ -1,3 +1,4 @@
+import os
 import time
 import asyncio
 import pandas as pd
@@ -5,6 +6,8 @@ import numpy as np
 import datetime
 import unicodedata, re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from static.telegram import send_telegram_message
 from data_acquisition.data_cleaning import clean_error_dogs, clean_error_races, clean_datafields_formats, \
         bijective_dogname_and_id, bijective_race_ids, trainer_cleaning, check_order_of_runtime_and_places
@@ -16,8 +19,13 @@ from stew_reports.meta_processor import MetaProcessor
 
 
 class SectionalCleaning:
-    def __init__(self, read_database=False):
-        pass
+    def __init__(self, read_database=False, alias_table_path='sectional_name_aliases.csv', n_workers=1):
+        # Worker processes for the per-date rescue stages (1 = serial)
+        self.n_workers = max(1, int(n_workers or 1))
+        # Learned PDF name -> horseId aliases, persisted between runs
+        self.alias_table_path = alias_table_path
+        self.alias_cols = ['pdf_name', 'track', 'state', 'horseId', 'horseName', 'first_seen', 'last_seen']
+        self.alias_table = self._load_alias_table()
     
     # ---------- helpers ----------
     
@@ -156,10 +164,12 @@ class SectionalCleaning:
         s = re.sub(r"[^a-z0-9 ]", "", s)    # keep letters/digits/space
         return s
 
-    def _nospace(self, s: str) -> str:
+    @staticmethod
+    def _nospace(s: str) -> str:
         return s.replace(" ", "")
 
-    def _prefix_ok_adaptive(self, a: str, b: str, *, min_common_len: int,
+    @staticmethod
+    def _prefix_ok_adaptive(a: str, b: str, *, min_common_len: int,
                             max_tail_pct: float, max_next_word_len: int) -> bool:
         # choose (shorter, longer)
         if len(a) <= len(b):
@@ -187,10 +197,88 @@ class SectionalCleaning:
 
         return False
 
-    def _score_tuple(self, shorter_len: int, longer_len: int):
+    @staticmethod
+    def _score_tuple(shorter_len: int, longer_len: int):
         # lower is better
         return (abs(longer_len - shorter_len), -shorter_len, -longer_len)
 
+    # ---------- alias table ----------
+    def _load_alias_table(self) -> pd.DataFrame:
+        if self.alias_table_path and os.path.exists(self.alias_table_path):
+            try:
+                alias_df = pd.read_csv(self.alias_table_path, dtype=str)
+                alias_df['first_seen'] = pd.to_datetime(alias_df['first_seen'], errors='coerce')
+                alias_df['last_seen'] = pd.to_datetime(alias_df['last_seen'], errors='coerce')
+                print(f'Loaded {len(alias_df)} learned sectional name aliases')
+                return alias_df[self.alias_cols]
+            except Exception as e:
+                print(f'Could not read alias table {self.alias_table_path}: {e}')
+        return pd.DataFrame(columns=self.alias_cols)
+
+    def _save_alias_table(self):
+        if not self.alias_table_path:
+            return
+        try:
+            self.alias_table.to_csv(self.alias_table_path, index=False)
+        except Exception as e:
+            print(f'Could not save alias table {self.alias_table_path}: {e}')
+
+    def _resolve_known_aliases(self, L: pd.DataFrame, R: pd.DataFrame, *, date_col: str,
+                               id_col: str) -> pd.DataFrame:
+        # (pdf name, track) -> horseId, then (date, horseId) -> left row. One hash join each way.
+        known = pd.DataFrame(columns=["_lidx", "_ridx", "_match_type"])
+        if self.alias_table.empty or id_col not in L.columns or "track" not in R.columns:
+            return known
+
+        R_k = R[[date_col, "_name", "track", "_ridx"]]
+        L_k = pd.DataFrame({date_col: L[date_col], "horseId": L[id_col].astype(str), "_lidx": L["_lidx"]})
+        cand = (R_k.merge(self.alias_table[["pdf_name", "track", "horseId"]],
+                          left_on=["_name", "track"], right_on=["pdf_name", "track"], how="inner")
+                   .merge(L_k, on=[date_col, "horseId"], how="inner"))
+        if cand.empty:
+            return known
+        # keep strict 1→1
+        cand = cand.drop_duplicates(subset="_ridx").drop_duplicates(subset="_lidx")
+        known = cand[["_lidx", "_ridx"]].copy()
+        known["_match_type"] = "learned"
+        return known
+
+    def _update_alias_table(self, pairs: pd.DataFrame, L: pd.DataFrame, R: pd.DataFrame, *,
+                            date_col: str, id_col: str, left_name_col: str):
+        # pairs are the confident non-exact matches, exact names resolve in Stage A anyway
+        confirmed = pairs[["_lidx", "_ridx"]]
+        if confirmed.empty or id_col not in L.columns or "track" not in R.columns:
+            return
+
+        left_part = pd.DataFrame({"_lidx": L["_lidx"], "horseId": L[id_col].astype(str),
+                                  "horseName": L[left_name_col], "_lname": L["_name"]})
+        right_part = R[[c for c in ["_ridx", "_name", "track", "state", date_col] if c in R.columns]]
+        seen = (confirmed.astype({"_lidx": L["_lidx"].dtype, "_ridx": R["_ridx"].dtype})
+                         .merge(left_part, on="_lidx")
+                         .merge(right_part, on="_ridx")
+                         .rename(columns={"_name": "pdf_name", date_col: "_seen"}))
+        seen = seen[(seen["pdf_name"] != "") & (seen["pdf_name"] != seen["_lname"]) & seen["_seen"].notna()]
+        if seen.empty:
+            return
+        if "state" not in seen.columns:
+            seen["state"] = None
+        seen["first_seen"] = seen["_seen"]
+        seen["last_seen"] = seen["_seen"]
+
+        combined = seen[self.alias_cols]
+        if not self.alias_table.empty:
+            combined = pd.concat([self.alias_table, combined], ignore_index=True)
+        combined = (combined.groupby(["pdf_name", "track", "horseId"], as_index=False, dropna=False)
+                            .agg(state=("state", "last"), horseName=("horseName", "last"),
+                                 first_seen=("first_seen", "min"), last_seen=("last_seen", "max")))
+        # one horse per (pdf name, track): the most recently confirmed wins
+        combined = (combined.sort_values("last_seen")
+                            .drop_duplicates(subset=["pdf_name", "track"], keep="last"))
+        added = len(combined) - len(self.alias_table)
+        self.alias_table = combined[self.alias_cols].reset_index(drop=True)
+        self._save_alias_table()
+        print(f'Alias table updated: {len(seen)} confirmed matches, {added} new aliases, {len(self.alias_table)} total')
+
     # ---------- main ----------
     def staged_merge_with_aliases(
         self,
@@ -209,13 +297,18 @@ class SectionalCleaning:
         collapse_aliases: bool = False,  # keep one row per (left/date)
         nospace_in_rescue: bool = True,  # NEW: include nospace per-date matching in rescue union
         final_strip_spaces: bool = True, # backstop alias pass using nospace
+        id_col: str = "horseId",         # left id used by the learned alias table
+        use_alias_table: bool = True,    # resolve known aliases before rescue, and learn new ones
+        n_workers: int | None = None,    # rescue stage worker processes (None -> self.n_workers)
         debug: bool = False,
     ) -> pd.DataFrame:
         """
         1) Strict 1→1:
         - Stage A: exact on (date, normalized name [, extras])
+        - Stage K: learned aliases from previous runs, (name, track) → id → (date, id)
         - Rescue UNION: B (date+firstN), C (date+first2), D (per-date),  NS (per-date on nospace)
-            using adaptive prefix rule (percent tail or appended word).
+            using adaptive prefix rule (percent tail or appended word). Computed per date,
+            across n_workers processes when > 1, and merged in date order.
         - Global selection: mutual-best → degree-1 → greedy.
         2) Optional alias fill (many→one) on spaced names, then optional final nospace alias backstop.
         """
@@ -244,88 +337,60 @@ class SectionalCleaning:
         exact["_match_type"] = "exact"
         if debug: print(f"[A] exact: {len(exact)}")
 
+        # ---- Stage K: learned aliases (locked-in) ----
+        if use_alias_table:
+            known = self._resolve_known_aliases(
+                L.loc[~L["_lidx"].isin(exact["_lidx"])],
+                R.loc[~R["_ridx"].isin(exact["_ridx"])],
+                date_col=date_col, id_col=id_col)
+            if debug: print(f"[K] learned: {len(known)}")
+            if not known.empty:
+                exact = pd.concat([exact, known], ignore_index=True)
+
         usedL = set(exact["_lidx"])
         usedR = set(exact["_ridx"])
 
         base_L = L.loc[~L["_lidx"].isin(usedL)].copy()
         base_R = R.loc[~R["_ridx"].isin(usedR)].copy()
 
-        # ---- Build UNION of rescue candidate edges (li, ri, score) ----
-        edges = []
-
         def _ok(ln, rn):
             return self._prefix_ok_adaptive(ln, rn,
                                     min_common_len=min_common_len,
                                     max_tail_pct=max_tail_pct,
                                     max_next_word_len=max_next_word_len)
 
-        def _add(li, ln, ri, rn):
-            s_len = min(len(ln), len(rn)); t_len = max(len(ln), len(rn))
-            edges.append((li, ri, self._score_tuple(s_len, t_len)))
-
-        # B: date + first N chars
-        if not base_L.empty and not base_R.empty:
-            Lb = base_L[[date_col, "_name", "_lidx"]].copy(); Lb["_pref"] = Lb["_name"].str[:prefix_len]
-            Rb = base_R[[date_col, "_name", "_ridx"]].copy(); Rb["_pref"] = Rb["_name"].str[:prefix_len]
-            candB = pd.merge(Lb, Rb, how="inner", on=[date_col, "_pref"], suffixes=("_L","_R"))
-            if debug: print(f"[B] cand={len(candB)}")
-            for _, row in candB.iterrows():
-                li = row.get("_lidx_L", row["_lidx"]); ri = row.get("_ridx_R", row["_ridx"])
-                if li in usedL or ri in usedR: continue
-                ln, rn = row["_name_L"], row["_name_R"]
-                if _ok(ln, rn): _add(li, ln, ri, rn)
-
-        # C: date + first TWO chars
-        if not base_L.empty and not base_R.empty:
-            Lc = base_L[[date_col, "_name", "_lidx"]].copy(); Lc["_fc2"] = Lc["_name"].str[:2]
-            Rc = base_R[[date_col, "_name", "_ridx"]].copy(); Rc["_fc2"] = Rc["_name"].str[:2]
-            candC = pd.merge(Lc, Rc, how="inner", on=[date_col, "_fc2"], suffixes=("_L","_R"))
-            if debug: print(f"[C] cand={len(candC)}")
-            for _, row in candC.iterrows():
-                li = row.get("_lidx_L", row["_lidx"]); ri = row.get("_ridx_R", row["_ridx"])
-                if li in usedL or ri in usedR: continue
-                ln, rn = row["_name_L"], row["_name_R"]
-                if _ok(ln, rn): _add(li, ln, ri, rn)
-
-        # D: per-date all-pairs (spaced names)
+        # ---- Build UNION of rescue candidate edges (li, ri, score), one task per date ----
+        # B (date+firstN), C (date+first2), D (per-date) and NS (per-date nospace) only ever
+        # compare names on the same date, so each date is independent and can run in a worker.
+        edges = []
         if not base_L.empty and not base_R.empty:
-            R_by_date = {dt: grp for dt, grp in base_R.groupby(date_col)}
-            rawD = 0
+            R_by_date = {dt: list(zip(grp["_ridx"], grp["_name"])) for dt, grp in base_R.groupby(date_col)}
+            tasks = []
             for dt, gL in base_L.groupby(date_col):
-                if pd.isna(dt): continue
-                gR = R_by_date.get(dt)
-                if gR is None or gR.empty: continue
-                for _, lrow in gL.iterrows():
-                    ln, li = lrow["_name"], lrow["_lidx"]
-                    for _, rrow in gR.iterrows():
-                        rn, ri = rrow["_name"], rrow["_ridx"]
-                        if li in usedL or ri in usedR: continue
-                        if _ok(ln, rn):
-                            _add(li, ln, ri, rn)
-                        rawD += 1
-            if debug: print(f"[D] raw edges={rawD}")
-
-        # NS: per-date all-pairs on space-stripped names (NEW)
-        if nospace_in_rescue and not base_L.empty and not base_R.empty:
-            Lns = base_L.assign(_name_ns=base_L["_name"].map(self._nospace))
-            Rns = base_R.assign(_name_ns=base_R["_name"].map(self._nospace))
-            Rns_by_date = {dt: grp for dt, grp in Rns.groupby(date_col)}
-            rawNS = 0
-            for dt, gL in Lns.groupby(date_col):
-                if pd.isna(dt): continue
-                gR = Rns_by_date.get(dt)
-                if gR is None or gR.empty: continue
-                for _, lrow in gL.iterrows():
-                    ln_ns, li = lrow["_name_ns"], lrow["_lidx"]
-                    for _, rrow in gR.iterrows():
-                        rn_ns, ri = rrow["_name_ns"], rrow["_ridx"]
-                        if li in usedL or ri in usedR: continue
-                        if _ok(ln_ns, rn_ns):
-                            # score using ns-lengths (consistent)
-                            s_len = min(len(ln_ns), len(rn_ns)); t_len = max(len(ln_ns), len(rn_ns))
-                            edges.append((li, ri, self._score_tuple(s_len, t_len)))
-                        rawNS += 1
-            if debug: print(f"[NS] nospace raw edges={rawNS}")
+                if pd.isna(dt) or dt not in R_by_date: continue
+                tasks.append((list(zip(gL["_lidx"], gL["_name"])), R_by_date[dt]))
+
+            worker = partial(_rescue_edges_for_date,
+                             prefix_len=prefix_len,
+                             min_common_len=min_common_len,
+                             max_tail_pct=max_tail_pct,
+                             max_next_word_len=max_next_word_len,
+                             nospace=nospace_in_rescue)
+            n_workers = self.n_workers if n_workers is None else n_workers
+            if n_workers > 1 and len(tasks) > 1:
+                chunksize = max(1, len(tasks) // (n_workers * 4))
+                with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                    results = list(pool.map(worker, tasks, chunksize=chunksize))
+            else:
+                results = [worker(task) for task in tasks]
+            if debug: print(f"[Rescue] dates={len(tasks)} workers={n_workers if len(tasks) > 1 else 1}")
+
+            # Deterministic merge: stage order, then date order (pool.map keeps task order),
+            # so tie-breaks below are identical whatever the worker count.
+            for stage in ("B", "C", "D", "NS"):
+                stage_edges = [e for res in results for e in res[stage]]
+                if debug: print(f"[{stage}] edges={len(stage_edges)}")
+                edges.extend(stage_edges)
 
         # Dedup edges keeping best score
         if edges:
@@ -373,7 +438,8 @@ class SectionalCleaning:
                         li, sc = alive[0]
                         chosen.append((li, ri)); usedL.add(li); usedR.add(ri); changed = True
 
-            # greedy
+            # greedy (picks are used for this merge, but too weak to learn aliases from)
+            n_confident = len(chosen)
             remaining = sorted([(li, ri, sc) for (li, ri, sc) in edges if li not in usedL and ri not in usedR],
                             key=lambda x: x[2])
             for li, ri, sc in remaining:
@@ -381,6 +447,7 @@ class SectionalCleaning:
                 chosen.append((li, ri)); usedL.add(li); usedR.add(ri)
 
         rescue_pairs = pd.DataFrame(chosen, columns=["_lidx","_ridx"])
+        confident_rescue = rescue_pairs.iloc[:n_confident] if edges else rescue_pairs
         if not rescue_pairs.empty:
             rescue_pairs["_match_type"] = "rescue"
 
@@ -455,6 +522,14 @@ class SectionalCleaning:
 
         # ---- Combine pairs ----
         pairs = pd.concat([exact, rescue_pairs, alias_pairs], ignore_index=True)
+        if use_alias_table:
+            # Only re-confirmed aliases and mutual-best / degree-1 rescues are learned. Greedy
+            # rescues and many→one aliases would otherwise be applied as known aliases on every
+            # later run, making a single wrong pick permanent.
+            learnable = pd.concat([exact.loc[exact["_match_type"] == "learned", ["_lidx", "_ridx"]],
+                                   confident_rescue[["_lidx", "_ridx"]]], ignore_index=True)
+            self._update_alias_table(learnable, L, R, date_col=date_col, id_col=id_col,
+                                     left_name_col=left_name_col)
 
         # Attach data (suffixes → *_master / *_df)
         left_with_ptr = pd.merge(L.drop(columns=["_name"]), pairs, how="left", on="_lidx")
@@ -524,3 +599,29 @@ class SectionalCleaning:
 
         return self._post_processing(merged)
 
+
+
+def _rescue_edges_for_date(task, *, prefix_len, min_common_len, max_tail_pct, max_next_word_len, nospace):
+    """Rescue edges for one date: task is ([(lidx, name)], [(ridx, name)]). Module level so it pickles."""
+    left, right = task
+    out = {"B": [], "C": [], "D": [], "NS": []}
+    rules = dict(min_common_len=min_common_len, max_tail_pct=max_tail_pct, max_next_word_len=max_next_word_len)
+
+    # B / C / D share the same rule and score, B and C are just the pruned subsets of D
+    for li, ln in left:
+        for ri, rn in right:
+            if not SectionalCleaning._prefix_ok_adaptive(ln, rn, **rules): continue
+            edge = (li, ri, SectionalCleaning._score_tuple(min(len(ln), len(rn)), max(len(ln), len(rn))))
+            if ln[:prefix_len] == rn[:prefix_len]: out["B"].append(edge)
+            if ln[:2] == rn[:2]: out["C"].append(edge)
+            out["D"].append(edge)
+
+    # NS: space-stripped names, scored on the nospace lengths
+    if nospace:
+        right_ns = [(ri, SectionalCleaning._nospace(rn)) for ri, rn in right]
+        for li, ln in left:
+            ln_ns = SectionalCleaning._nospace(ln)
+            for ri, rn_ns in right_ns:
+                if SectionalCleaning._prefix_ok_adaptive(ln_ns, rn_ns, **rules):
+                    out["NS"].append((li, ri, SectionalCleaning._score_tuple(min(len(ln_ns), len(rn_ns)), max(len(ln_ns), len(rn_ns)))))
+    return out
@@ -12,6 +12,11 @@ load_dotenv()
 
 from static.telegram import send_telegram_message
 
+# today's meetings and races from the last full pull, {date: (meetings_df, races_df)}. Near-jump
+# refreshes filter their window from here instead of re-listing every meeting every few minutes.
+_day_schedule = {}
+
+
 class GetUpcomingData:
     def __init__(self):
         self.racing_type = 'RISE Harness'
@@ -32,6 +37,44 @@ class GetUpcomingData:
         }
 
     def get_upcoming_meetings(self):
+        upcoming_meetings_df = self.get_meetings()
+        if upcoming_meetings_df is None:
+            return None
+        races_df = self.get_races(upcoming_meetings_df)
+        _day_schedule.clear()
+        _day_schedule[self.today_date] = (upcoming_meetings_df, races_df)
+        return self.get_race_fields(races_df['raceCode'].unique(), upcoming_meetings_df)
+
+    def day_schedule(self):
+        """Today's (meetings, races), from the last full pull when there is one, else pulled and cached now."""
+        if self.today_date in _day_schedule:
+            return _day_schedule[self.today_date]
+        upcoming_meetings_df = self.get_meetings(alert=False)
+        if upcoming_meetings_df is None:
+            return None, None
+        races_df = self.get_races(upcoming_meetings_df, alert=False)
+        _day_schedule.clear()
+        _day_schedule[self.today_date] = (upcoming_meetings_df, races_df)
+        return upcoming_meetings_df, races_df
+
+    def races_starting_within(self, minutes_ahead=30, minutes_behind=5):
+        """(races, meetings) for the non-trial races jumping in the next minutes_ahead, (None, None) if there are none."""
+        upcoming_meetings_df, races_df = self.day_schedule()
+        if upcoming_meetings_df is None or races_df.empty or 'plannedStartTimestamp' not in races_df.columns:
+            return None, None
+        # trials have no markets, nothing changes near the jump that matters
+        upcoming_meetings_df = upcoming_meetings_df[upcoming_meetings_df['trials'] != True]
+        races_df = races_df[races_df['meetingCode'].isin(upcoming_meetings_df['meetingCode'])]
+        now = pd.Timestamp.now(tz='UTC')
+        starts = pd.to_datetime(races_df['plannedStartTimestamp'], utc=True, errors='coerce')
+        in_window = starts.between(now - pd.Timedelta(minutes=minutes_behind), now + pd.Timedelta(minutes=minutes_ahead))
+        window_races = races_df[in_window]
+        print(f'{window_races["raceCode"].nunique()} {self.racing_type} races jumping in the next {minutes_ahead} minutes')
+        if window_races.empty:
+            return None, None
+        return window_races, upcoming_meetings_df[upcoming_meetings_df['meetingCode'].isin(window_races['meetingCode'])]
+
+    def get_meetings(self, alert=True):
         print(f'Pulling upcoming {self.racing_type} meetings...')
 
         response = requests.get(self.BASE_URL, headers=self.headers, params=self.params)
@@ -44,10 +87,12 @@ class GetUpcomingData:
             # if its christmas or new years day then dont send a mesage
             if self.today.month == 12 and self.today.day == 25 or self.today.month == 1 and self.today.day == 1:
                 pass    
-            else:
+            elif alert:
                 send_telegram_message(f'Issue pulling {self.racing_type} upcoming meetings, nothing available')
             return None
+        return upcoming_meetings_df
 
+    def get_races(self, upcoming_meetings_df, alert=True):
         meeting_codes = upcoming_meetings_df['meetingCode'].unique()
         races_df = pd.DataFrame()
         for meeting_code in tqdm(meeting_codes, desc='Pulling upcoming races'):
@@ -59,12 +104,14 @@ class GetUpcomingData:
                 msg = f'HARNESS: {track_df["track"].values[0]} not found in upcoming data'
                 if track_df['trials'].values[0] == True:
                     msg += ' (trial)'
-                send_telegram_message(msg)
+                if alert:
+                    send_telegram_message(msg)
                 continue
 
             races_df = pd.concat([races_df, pd.DataFrame(races)])
+        return races_df
 
-        race_codes = races_df['raceCode'].unique()
+    def get_race_fields(self, race_codes, upcoming_meetings_df):
         race_and_fields_df = pd.DataFrame()
         for race_code in tqdm(race_codes, desc='Pulling race and fields data'):
             race_and_fields_url = self.BASE_RACE_AND_FIELDS_URL.format(race_code)
@@ -5,8 +5,9 @@ import os
 import pandas as pd
 from tqdm import tqdm
 import re
+import hashlib
 
-from pymongo import MongoClient, errors, UpdateOne
+from pymongo import MongoClient, errors, UpdateOne, InsertOne, ReplaceOne, DeleteOne
 from bson.objectid import ObjectId
 
 from dotenv import load_dotenv
@@ -203,6 +204,117 @@ def save_to_mongodb(dataframe,
 
     print("Data insertion complete.")
 
+
+def upcoming_row_keys(df, key_cols):
+    """(date, track, raceNumber, horseId) as comparable strings, the same for the new frame and stored docs."""
+    keys = pd.DataFrame(index=df.index)
+    for col in key_cols:
+        if col == 'date':
+            keys[col] = pd.to_datetime(df[col], utc=True, errors='coerce').dt.strftime('%Y-%m-%d')
+        elif col == 'raceNumber':
+            keys[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64').astype(str)
+        else:
+            keys[col] = df[col].astype(str).str.lower().str.strip()
+    return pd.MultiIndex.from_frame(keys)
+
+
+def content_hash(record, skip_cols=('_id', 'date_added', 'content_hash')):
+    content = {k: v for k, v in record.items() if k not in skip_cols}
+    return hashlib.md5(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def sync_upcoming_to_mongodb(dataframe,
+                             collection_name='harness_upcoming',
+                             key_cols=('date', 'track', 'raceNumber', 'horseId'),
+                             keep_cols=('betfair_market_id', 'betfair_horse_id', 'race_number', 'tab_horseNumber'),
+                             max_retries=5):
+    """
+    Write only what changed in the upcoming field since the last run, as one bulk write.
+
+    The stored docs for the snapshot's dates are compared to the new rows by key and content hash:
+    new runners are inserted, changed runners replaced, runners gone from a listed race and legacy
+    duplicates deleted. The Betwatch/Betfair derived keep_cols (market and runner ids, race_number,
+    tab_horseNumber) already stored are kept when this run didn't get them, so a run where a source
+    timed out or failed never blanks them, the same preference the old dedup pass had for betfair ids.
+    """
+    key_cols = list(key_cols)
+    collection = connect_to_mongodb(collection_name=collection_name)
+    if collection is None:
+        return None
+    collection.create_index([(col, 1) for col in key_cols])
+
+    df = dataframe.reset_index(drop=True)
+    new_keys = upcoming_row_keys(df, key_cols)
+    keep = ~new_keys.duplicated(keep='first')
+    df, new_keys = df[keep].reset_index(drop=True), new_keys[keep]
+
+    # Stored docs for the same race days, everything older is history and left alone
+    dates = pd.to_datetime(df['date'], utc=True, errors='coerce').dt.tz_convert(None).dt.normalize()
+    query = {'date': {'$gte': dates.min().to_pydatetime(), '$lt': (dates.max() + pd.Timedelta(days=1)).to_pydatetime()}}
+    projection = {col: 1 for col in key_cols + list(keep_cols) + ['content_hash', 'date_added', '_id']}
+    stored = pd.DataFrame(list(collection.find(query, projection)))
+    print(f'Upcoming sync: {len(df)} runners in the new field, {len(stored)} stored for {dates.dt.date.nunique()} days')
+
+    stored_by_key = {}
+    to_delete = []
+    if not stored.empty:
+        for col in key_cols + list(keep_cols) + ['content_hash', 'date_added']:
+            if col not in stored.columns:
+                stored[col] = None
+        # legacy duplicates: keep the doc with a betfair market id, then the most recent
+        stored['has_market'] = stored['betfair_market_id'].notna()
+        stored = stored.sort_values(['has_market', 'date_added'], ascending=False, na_position='last').reset_index(drop=True)
+        stored_keys = upcoming_row_keys(stored, key_cols)
+        dupes = stored_keys.duplicated(keep='first')
+        to_delete += stored.loc[dupes, '_id'].tolist()
+        stored, stored_keys = stored[~dupes].reset_index(drop=True), stored_keys[~dupes]
+        stored_by_key = dict(zip(stored_keys, stored.to_dict('records')))
+        # runners dropped from a race that is still listed (scratchings, re-draws). Races missing from the
+        # feed altogether have usually just been run, so those are kept for the historical comparisons.
+        still_listed = stored_keys.droplevel(-1).isin(new_keys.droplevel(-1))
+        to_delete += stored.loc[~stored_keys.isin(new_keys) & still_listed, '_id'].tolist()
+
+    now = datetime.datetime.now()
+    ops = []
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': len(to_delete)}
+    for key, record in zip(new_keys, df.to_dict(orient='records')):
+        old = stored_by_key.get(key)
+        if old is not None:
+            for col in keep_cols:
+                if col in record and pd.isna(record[col]) and pd.notna(old.get(col)):
+                    record[col] = old[col]
+        record['content_hash'] = content_hash(record)
+        if old is None:
+            record['date_added'] = now
+            ops.append(InsertOne(record))
+            counts['inserted'] += 1
+        elif record['content_hash'] != old.get('content_hash'):
+            record['date_added'] = now
+            ops.append(ReplaceOne({'_id': old['_id']}, record))
+            counts['updated'] += 1
+        else:
+            counts['unchanged'] += 1
+    ops += [DeleteOne({'_id': _id}) for _id in to_delete]
+
+    print(f'Upcoming sync: {counts}')
+    if not ops:
+        return counts
+
+    retries = 0
+    while retries < max_retries:
+        try:
+            collection.bulk_write(ops, ordered=False)
+            return counts
+        except errors.BulkWriteError as bwe:
+            print(f"Bulk write error: {bwe.details}")
+            return None
+        except errors.AutoReconnect as e:
+            retries += 1
+            wait_time = 2 ** retries
+            print(f'AutoReconnect error: {e}. Retrying in {wait_time} seconds...')
+            time.sleep(wait_time)
+    return None
+
 def pull_recent_data_from_mongodb(collection_name='harness_upcoming', added_days_ago=3, ran_days_ago=1):
     create_index_on_date(collection_name)
     collection = connect_to_mongodb(collection_name)
@@ -0,0 +1,234 @@
+import os
+import time
+import threading
+import pandas as pd
+import dotenv
+dotenv.load_dotenv()
+
+import betfairlightweight as bf
+from datetime import datetime, timedelta
+
+from static.runner_names import canonical_names, canonical_tracks
+
+
+class BetfairMappingService:
+    """
+    Betfair market catalogue -> (date, track, race_number, runners) mapping, cached on disk.
+
+    The session token is kept in a 0600 file outside the repo (BETFAIR_SESSION_FILE, default
+    ~/.cache/betfair_session) and kept alive between runs instead of a fresh
+    login_interactive() every hour. Market ids are listed page by page over start-time windows
+    (so busy days are no longer cut off at max_results) and only markets missing from the cache
+    get the full runner catalogue request.
+    """
+    def __init__(self, store_dir='betfair_mapping_store', look_back_hours=12, look_ahead_days=2, keep_days=7):
+        self.store_dir = store_dir
+        self.look_back_hours = look_back_hours      # earlier races today are still mapped from the cache
+        self.look_ahead_days = look_ahead_days
+        self.keep_days = keep_days                  # cached markets older than this are pruned
+        self.session_path = os.environ.get("BETFAIR_SESSION_FILE") or os.path.join(os.path.expanduser('~'), '.cache', 'betfair_session')
+        self.cache_cols = ['betfair_market_id', 'market_name', 'event_id', 'track', 'race_number',
+                           'market_start_time', 'runner_id', 'runner_name']
+        self.list_page_size = 1000      # id listing has zero projection weight, 1000 is the api cap
+        self.detail_page_size = 100     # runner catalogue requests, kept at the old max_results
+        self.client = None
+        self.race_code_filters = {
+            'all': dict(event_type_ids=["4339", "7"]),
+            'greyhounds': dict(event_type_ids=["4339"]),
+            'harness': dict(event_type_ids=["7"], race_types=["Harness"]),
+            'horses': dict(event_type_ids=["7"], race_types=["Flat", "Hurdle", "Chase", "Bumper", "NH Flat"]),
+        }
+        self.caches = {}
+        self.lock = threading.Lock()    # one get_mapping at a time on the shared client and caches
+        os.makedirs(store_dir, exist_ok=True)
+
+    # ---------- session ----------
+    def _load_session(self):
+        if os.path.exists(self.session_path):
+            with open(self.session_path) as f:
+                return f.read().strip() or None
+        return None
+
+    def _save_session(self, token):
+        try:
+            os.makedirs(os.path.dirname(self.session_path), mode=0o700, exist_ok=True)
+            # created owner read/write only, and tightened if an older file exists
+            fd = os.open(self.session_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.chmod(self.session_path, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(token)
+        except Exception as e:
+            print(f'Could not save betfair session: {e}')
+
+    def get_client(self):
+        """Logged in client, reusing the live or stored session token and only logging in when it's rejected."""
+        if self.client is not None and not self.client.session_expired:
+            try:
+                self.client.keep_alive()
+                return self.client
+            except Exception as e:
+                print(f'Betfair keep alive failed ({e}), logging in again')
+
+        client = bf.APIClient(os.environ.get("BETFAIR_USER"), os.environ.get("BETFAIR_PASS"), app_key=os.environ.get("BETFAIR_API_KEY"))
+        token = self._load_session()
+        if token:
+            client.set_session_token(token)
+            try:
+                client.keep_alive()
+                print('Reusing stored betfair session')
+                self.client = client
+                return client
+            except Exception as e:
+                print(f'Stored betfair session rejected ({e}), logging in')
+
+        client.login_interactive()
+        self._save_session(client.session_token)
+        self.client = client
+        return client
+
+    # ---------- cache ----------
+    def _cache_path(self, race_code):
+        return os.path.join(self.store_dir, f'betfair_markets_{race_code}.csv')
+
+    def load_cache(self, race_code):
+        if race_code in self.caches:
+            return self.caches[race_code]
+        path = self._cache_path(race_code)
+        cache = pd.DataFrame(columns=self.cache_cols)
+        if os.path.exists(path):
+            try:
+                cache = pd.read_csv(path, dtype={'betfair_market_id': str, 'event_id': str, 'track': str, 'runner_name': str},
+                                    parse_dates=['market_start_time'])
+            except Exception as e:
+                print(f'Could not read betfair market cache {path}: {e}')
+        self.caches[race_code] = cache
+        return cache
+
+    def save_cache(self, race_code, cache):
+        cutoff = datetime.utcnow() - timedelta(days=self.keep_days)
+        cache = cache[pd.to_datetime(cache['market_start_time']) >= cutoff].reset_index(drop=True)
+        self.caches[race_code] = cache
+        cache.to_csv(self._cache_path(race_code), index=False)
+        return cache
+
+    # ---------- catalogue ----------
+    @staticmethod
+    def _iso(ts):
+        return ts.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _market_filter(self, race_code, **kwargs):
+        if race_code not in self.race_code_filters:
+            raise ValueError(f'Invalid race code: {race_code}')
+        return bf.filters.market_filter(
+            market_countries=["AU"],  # filter countries
+            market_type_codes=["WIN"],  # filter on just WIN market types
+            **self.race_code_filters[race_code],
+            **kwargs,
+        )
+
+    @staticmethod
+    def _check_deadline(deadline, what):
+        # each betfair request has its own connect/read timeout, so checking between requests bounds the whole pull
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError(f'Betfair mapping timed out while {what}')
+
+    def list_market_ids(self, race_code, start, end, deadline=None):
+        """Every open market id starting in [start, end], paging forward from the last start time seen."""
+        client = self.get_client()
+        market_ids = {}
+        window_start = start
+        n_pages = 0
+        while True:
+            self._check_deadline(deadline, 'listing markets')
+            page = client.betting.list_market_catalogue(
+                filter=self._market_filter(race_code, market_start_time=bf.filters.time_range(from_=self._iso(window_start), to=self._iso(end))),
+                market_projection=["MARKET_START_TIME"],
+                sort='FIRST_TO_START',
+                max_results=self.list_page_size,
+            )
+            n_pages += 1
+            for market in page:
+                market_ids.setdefault(market.market_id, market.market_start_time)
+            if len(page) < self.list_page_size:
+                break
+            last_start = page[-1].market_start_time
+            if last_start > window_start:
+                window_start = last_start       # inclusive, repeats are dropped by the dict
+            else:
+                print(f'Over {self.list_page_size} betfair markets start at {last_start}, skipping ahead a second')
+                window_start = window_start + timedelta(seconds=1)
+        print(f'Listed {len(market_ids)} betfair {race_code} markets over {n_pages} pages')
+        return list(market_ids)
+
+    def fetch_markets(self, market_ids, deadline=None):
+        """Full runner catalogue for the given market ids, in chunks of detail_page_size."""
+        client = self.get_client()
+        markets = []
+        for i in range(0, len(market_ids), self.detail_page_size):
+            self._check_deadline(deadline, 'fetching runner catalogues')
+            chunk = market_ids[i:i + self.detail_page_size]
+            markets += client.betting.list_market_catalogue(
+                filter=bf.filters.market_filter(market_ids=chunk),
+                market_projection=["EVENT", "MARKET_START_TIME", "RUNNER_DESCRIPTION"],
+                max_results=len(chunk),
+            )
+        return markets
+
+    @staticmethod
+    def format_markets(markets):
+        """One row per runner in the cache layout."""
+        rows = []
+        for market in markets:
+            for runner in market.runners:
+                rows.append([market.market_id, market.market_name, market.event.id, market.event.venue,
+                             market.market_start_time, runner.selection_id, runner.runner_name])
+        df = pd.DataFrame(rows, columns=['betfair_market_id', 'market_name', 'event_id', 'track',
+                                         'market_start_time', 'runner_id', 'runner_name'])
+        df['race_number'] = pd.to_numeric(df['market_name'].str.extract(r'^R(\d{1,2})', expand=False), errors='coerce')
+        # '1. Horse Name' -> 'horse name'
+        df['runner_name'] = canonical_names(df['runner_name'].astype(str).str.split('. ', n=1, regex=False).str[-1])
+        df['track'] = canonical_tracks(df['track'].astype(str))
+        return df
+
+    def get_mapping(self, race_code='harness', timeout=None):
+        """
+        Runner level mapping for markets starting in the look back / look ahead window.
+        timeout (seconds) stops the pull between requests with a TimeoutError, nothing is left running.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self.lock:
+            return self._get_mapping(race_code, deadline)
+
+    def _get_mapping(self, race_code, deadline):
+        race_code = race_code or 'all'
+        now = datetime.utcnow()
+        start = now - timedelta(hours=self.look_back_hours)
+        end = now + timedelta(days=self.look_ahead_days)
+
+        cache = self.load_cache(race_code)
+        market_ids = self.list_market_ids(race_code, start, end, deadline)
+        seen = set(cache['betfair_market_id'].astype(str))
+        unseen = [market_id for market_id in market_ids if market_id not in seen]
+        print(f'Betfair mapping: {len(market_ids) - len(unseen)} markets cached, requesting {len(unseen)}')
+        if unseen:
+            new_rows = self.format_markets(self.fetch_markets(unseen, deadline))
+            cache = new_rows if cache.empty else pd.concat([cache, new_rows], ignore_index=True)
+            cache = self.save_cache(race_code, cache)
+
+        start_times = pd.to_datetime(cache['market_start_time'])
+        mapping = cache[(start_times >= start) & (start_times <= end)].copy()
+        if race_code == 'harness':
+            mapping = mapping[mapping['market_name'].str.lower().str.contains('trot|pace', na=False)]
+        mapping['market_start_time'] = pd.to_datetime(mapping['market_start_time'])
+        return mapping.sort_values('market_start_time').reset_index(drop=True)
+
+
+_shared_mapping = None
+
+
+def get_shared_betfair_mapping():
+    """One mapping service (and betfair session) per process, reused by the scheduled runs."""
+    global _shared_mapping
+    if _shared_mapping is None:
+        _shared_mapping = BetfairMappingService()
+    return _shared_mapping
@@ -1,7 +1,12 @@
 import asyncio
 import os
+import time
+import numpy as np
 import pandas as pd
 import atexit
+import threading
+from itertools import chain
+from operator import attrgetter
 
 from datetime import datetime
 from datetime import timedelta
@@ -11,6 +16,7 @@ import logging
 from datetime import datetime, timedelta
 
 import betwatch
+from static.runner_names import canonical_names, canonical_tracks
 from betwatch import *
 from betwatch.types import *
 
@@ -20,7 +26,7 @@ dotenv.load_dotenv()
 
 
 class BetwatchData:
-    def __init__(self):
+    def __init__(self, max_concurrency=5):
         try:
             self.api_key = os.environ.get("BETWATCH_API_KEY")
             print(f'Successfully logged in to Betwatch')
@@ -28,6 +34,10 @@ class BetwatchData:
             raise Exception("BETWATCH_API_KEY environment variable not set")
 
         self.bw = betwatch.connect_async(self.api_key)
+        # the async client lives on one loop, so it can be reused across pulls (see run())
+        self.loop = asyncio.new_event_loop()
+        self.loop_lock = threading.Lock()
+        self.max_concurrency = max_concurrency
         # setup logging
         logging.basicConfig(
                     level=logging.INFO,
@@ -37,24 +47,76 @@ class BetwatchData:
                 )
 
         self.races: list[Race] = []
+        self.race_ids = set()
+        # columnar tables from flatten_races()
+        self.runner_table = None
+        self.fluc_table = None
         # load races from pickle if exists
         self.data = {}
 
         # get some subset of races
         self.start_from_date = datetime.today()
         # days_ago = (datetime.today() - pd.to_datetime('2024-05-05')).days # amount of days to backtrack
-        self.projection = RaceProjection(
+        # Named projections, callers pick the smallest one that covers what they read
+        # sp_only: betfair SP/LTP + runner ids (settled price store, bsp backfills)
+        # upcoming_mapping: runners, betfair ids and links for mapping the upcoming field
+        # full_flucs: everything incl. TAB/Sportsbet fixed win flucs (price history pulls)
+        self.projection_profiles = {
+            'sp_only': RaceProjection(
+                markets=False,
+                flucs=False,
+                links=False,
+                betfair=True,
+            ),
+            'upcoming_mapping': RaceProjection(
+                markets=False,
+                flucs=False,
+                links=True,
+                betfair=True,
+            ),
+            'full_flucs': RaceProjection(
                 markets=True,
                 flucs=True,
                 links=True,
                 betfair=True,
                 bookmakers=[Bookmaker.TAB, Bookmaker.SPORTSBET],
-            )
-        
-    async def pull_betwatch_data(self, date, meeting_types=None):
-        existing_race_ids = [r.id for r in self.races]
-        existing_race_dates = [r.meeting.date for r in self.races if r.meeting and r.meeting.date]
+            ),
+        }
+        self.default_profile = 'full_flucs'
+        self.projection = self.projection_profiles[self.default_profile]
+        self.profile_stats = {}
+
+    def run(self, coro, timeout=None):
+        """
+        Run a pull on this client's own event loop, use instead of asyncio.run so the client is reusable.
+        timeout (seconds) is applied inside the loop, so a slow pull is cancelled (asyncio.TimeoutError) and
+        the loop is free again for the next caller. Callers on other threads wait their turn for the loop.
+        """
+        with self.loop_lock:
+            return self.loop.run_until_complete(asyncio.wait_for(coro, timeout))
+
+    def close(self):
+        try:
+            if hasattr(self.bw, '_BetwatchAsyncClient__exit'):
+                self.bw._BetwatchAsyncClient__exit()
+                # Unregister the atexit handler after manual exit
+                atexit.unregister(self.bw._BetwatchAsyncClient__exit)
+            else:
+                print("The __exit method does not exist.")
+        except Exception as e:
+            print(f'Error closing betwatch client {e}')
+
+    def reset_races(self):
+        self.races = []
+        self.race_ids = set()
+
+    def add_races(self, day_races):
+        for race in day_races:
+            if race.id not in self.race_ids:
+                self.races.append(race)
+                self.race_ids.add(race.id)
 
+    def get_race_filter(self, date, meeting_types=None, tracks=None):
         if meeting_types:
             bw_meet_types = []
             for code in meeting_types:
@@ -67,37 +129,94 @@ class BetwatchData:
         else:
             bw_meet_types = [MeetingType.THOROUGHBRED, MeetingType.GREYHOUND, MeetingType.HARNESS]
 
-        race_filter = RacesFilter(
+        return RacesFilter(
             date_from=date,
             date_to=date,
             types=bw_meet_types,
+            tracks=list(tracks) if tracks else None,     # None is the whole day
             # has_bookmakers=[Bookmaker.TAB]
         )
 
-        day_races = await self.bw.get_races(self.projection, race_filter)
-        
+    @staticmethod
+    def _payload_counts(day_races):
+        # runners and price records (betfair markets + bookmaker flucs) as a cheap proxy for response size
+        n_runners = n_records = 0
         for race in day_races:
-            if race.id not in existing_race_ids:
-                self.races.append(race)
-                existing_race_ids.append(race.id)
-        print(f"Got {len(day_races)} races for {pd.to_datetime(date).strftime('%Y-%m-%d')}")
-    
+            for runner in race.runners or []:
+                n_runners += 1
+                n_records += len(runner.betfair_markets or [])
+                for market in runner.bookmaker_markets or []:
+                    n_records += len(market._fixed_win.flucs or []) if market._fixed_win else 0
+        return n_runners, n_records
+
+    def _record_profile_stats(self, profile, seconds, n_runners, n_records, n_races):
+        stats = self.profile_stats.setdefault(profile, {'calls': 0, 'seconds': 0.0, 'races': 0, 'runners': 0, 'records': 0})
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+        stats['races'] += n_races
+        stats['runners'] += n_runners
+        stats['records'] += n_records
+
+    def profile_summary(self):
+        summary = pd.DataFrame.from_dict(self.profile_stats, orient='index')
+        if not summary.empty:
+            summary['avg_seconds'] = summary['seconds'] / summary['calls']
+            summary['avg_records'] = summary['records'] / summary['calls']
+        return summary
+
+    async def fetch_day_races(self, date, meeting_types=None, semaphore=None, profile=None, tracks=None):
+        profile = profile or self.default_profile
+        projection = self.projection_profiles[profile]
+        race_filter = self.get_race_filter(date, meeting_types, tracks)
+        if semaphore is None:
+            start = time.perf_counter()
+            day_races = await self.bw.get_races(projection, race_filter)
+            seconds = time.perf_counter() - start
+        else:
+            async with semaphore:
+                start = time.perf_counter()
+                day_races = await self.bw.get_races(projection, race_filter)
+                seconds = time.perf_counter() - start
+        n_runners, n_records = self._payload_counts(day_races)
+        self._record_profile_stats(profile, seconds, n_runners, n_records, len(day_races))
+        print(f"Got {len(day_races)} races for {pd.to_datetime(date).strftime('%Y-%m-%d')} "
+              f"[{profile}] in {seconds:.2f}s, {n_runners} runners, {n_records} price records")
+        if tracks:
+            # a track name that doesn't line up with Betwatch's would silently drop its meeting, pull the day instead
+            missing = set(canonical_tracks(tracks)) - set(canonical_tracks([race.meeting.track for race in day_races]))
+            if missing:
+                print(f'No Betwatch races for tracks {sorted(missing)}, pulling the whole day')
+                return await self.fetch_day_races(date, meeting_types, semaphore, profile)
+        return day_races
+
+    async def pull_betwatch_data(self, date, meeting_types=None, profile=None):
+        day_races = await self.fetch_day_races(date, meeting_types, profile=profile)
+        self.add_races(day_races)
         return day_races
-    
 
-    async def pull_specific_dates(self, dates: list[str], meeting_types=None, add_tab_sb_prices=False):
-        for date in dates:
-            await self.pull_betwatch_data(date, meeting_types)
+    async def pull_dates(self, dates, meeting_types=None, profile=None, tracks=None):
+        # all dates in flight at once (capped by the semaphore), added back in date order
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*[self.fetch_day_races(date, meeting_types, semaphore, profile, tracks) for date in dates])
+        for day_races in results:
+            self.add_races(day_races)
+        return self.races
+
+    async def pull_specific_dates(self, dates: list[str], meeting_types=None, add_tab_sb_prices=False, profile=None):
+        self.reset_races()
+        await self.pull_dates(dates, meeting_types, profile)
         return self.get_dataframe(add_tab_sb_prices=add_tab_sb_prices)
 
-    async def pull_sequential_dates(self, num_search_days, meeting_types='G', look_forwards=True, add_tab_sb_prices=False):
+    async def pull_sequential_dates(self, num_search_days, meeting_types='G', look_forwards=True, add_tab_sb_prices=False, profile=None,
+                                    tracks=None):
+        self.start_from_date = datetime.today()
         if look_forwards:
             dates = [self.start_from_date + timedelta(days=i) for i in range(num_search_days)] 
         else:
             dates = [self.start_from_date - timedelta(days=i) for i in range(num_search_days)]
         
-        for date in dates:
-            await self.pull_betwatch_data(date, meeting_types)
+        self.reset_races()
+        await self.pull_dates(dates, meeting_types, profile, tracks)
         
         df = self.get_dataframe(add_tab_sb_prices=add_tab_sb_prices)
         # df = pd.read_csv('betwatch_data.csv')
@@ -108,177 +227,171 @@ class BetwatchData:
         return df
 
     
+    @staticmethod
+    def _betfair_prices(runner):
+        # same sequential rounding as before, so a bad ltp/place price still keeps the bsp
+        bsp = None
+        ltp = None
+        place_price = None
+        try:
+            if runner.betfair_markets[0].market_name == 'win':
+                bsp = round(runner.betfair_markets[0].starting_price,2)
+                ltp = round(runner.betfair_markets[0].last_price_traded,2)
+                place_price = round(runner.betfair_markets[1].starting_price,2)
+
+            elif runner.betfair_markets[1].market_name == 'win':
+                bsp = round(runner.betfair_markets[1].starting_price,2)
+                ltp = round(runner.betfair_markets[1].last_price_traded,2)
+                place_price = round(runner.betfair_markets[0].starting_price,2)
+        except:
+            pass
+        return bsp, ltp, place_price
+
+    @staticmethod
+    def _runner_place(race_places, runner_number):
+        # race_places is a list of lists, eg [[6], [1], [8], [4]] meaning dog with runner_number 6 finished in 1st, 8th and 4th place
+        if race_places:
+            for place, place_list in enumerate(race_places):
+                if runner_number in place_list:
+                    return place + 1
+        return None
+
+    @staticmethod
+    def _round_price(price):
+        try:
+            return round(price, 2)
+        except:
+            return None
+
+    def _runner_row(self, race, runner):
+        scratched = runner.is_scratched()
+        place = None
+        prices = (None, None, None)
+        if not scratched and len(runner.betfair_markets) > 0:
+            place = self._runner_place(race.results, runner.number)
+            prices = self._betfair_prices(runner)
+        meeting = race.meeting
+        return (meeting.date, meeting.location, meeting.track, race.id, race.number, runner.name, runner.number,
+                runner.betfair_id, scratched, place, *prices)
+
+    def flatten_races(self, races=None, include_flucs=True):
+        """
+        Columnar flattening of the pulled races into two tables:
+        - runners: one row per runner (bsp, ltp, place bsp, result)
+        - flucs: long format bookmaker fixed win fluctuations (runner_idx, bookmaker, seq, price, timestamp), no cap
+        runner_idx is the row position in the runner table (race_id, runner_number etc. join from there).
+        include_flucs=False skips the fluc table (None).
+        """
+        races = self.races if races is None else races
+        races = [race for race in races if race.meeting.location not in ['GBR']]
+        pairs = [(race, runner) for race in races for runner in race.runners]
+        rows = [self._runner_row(race, runner) for race, runner in pairs]
+        columns = list(zip(*rows)) if rows else [()] * 13
+
+        runners = pd.DataFrame({
+            'date': columns[0],
+            'state': columns[1],
+            'track': columns[2],
+            'race_id': columns[3],
+            'race_number': columns[4],
+            'runner': columns[5],
+            'runner_number': columns[6],
+            'betfair_runner_id': columns[7],
+            'scratched': np.array(columns[8], dtype=bool),
+            'place': columns[9],
+            'bsp': np.array(columns[10], dtype=float),
+            'ltp': np.array(columns[11], dtype=float),
+            'bsp_place': np.array(columns[12], dtype=float),
+        })
+
+        self.runner_table = runners
+        self.fluc_table = self._flatten_flucs(pairs) if include_flucs else None
+        return runners, self.fluc_table
+
+    def _flatten_flucs(self, pairs):
+        # one entry per bookmaker market, then the flucs are expanded column-wise
+        books = [(i, market._bookmaker.lower(), market._fixed_win.flucs)
+                 for i, (_, runner) in enumerate(pairs)
+                 for market in (runner.bookmaker_markets or []) if market._fixed_win.flucs]
+        lengths = np.fromiter((len(book[2]) for book in books), dtype=np.int64, count=len(books))
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        raw_prices = list(chain.from_iterable(map(attrgetter('price'), book[2]) for book in books))
+        try:
+            prices = np.array(raw_prices, dtype=float)
+            # prices sit on a ladder, so round the distinct values (python round, same as before) and map back
+            uniques, inverse = np.unique(prices, return_inverse=True)
+            prices = np.array([round(float(price), 2) for price in uniques], dtype=float)[inverse]
+        except (TypeError, ValueError):
+            prices = np.array([self._round_price(price) for price in raw_prices], dtype=float)
+
+        return pd.DataFrame({
+            'runner_idx': np.repeat(np.array([book[0] for book in books], dtype=np.int64), lengths),
+            'bookmaker': pd.Categorical(np.repeat(np.array([book[1] for book in books], dtype=object), lengths)),
+            'seq': np.arange(len(prices), dtype=np.int64) - starts,
+            'price': prices,
+            'timestamp': np.array(list(chain.from_iterable(map(attrgetter('last_updated'), book[2]) for book in books)), dtype=object),
+        })
+
+    @staticmethod
+    def _wide_flucs(flucs, n_runners, n_flucs=6):
+        # first n flucs per bookmaker as tab_price0/tab_time0.. columns, later markets overwrite earlier ones
+        top = flucs[(flucs['seq'] < n_flucs) & flucs['price'].notna()]
+        top = top.drop_duplicates(['runner_idx', 'bookmaker', 'seq'], keep='last')
+        wide = {}
+        prefixes = {'tab': 'tab', 'sportsbet': 'sb'}
+        for bookmaker, prefix in prefixes.items():
+            book = top[top['bookmaker'] == bookmaker]
+            price = np.full((n_runners, n_flucs), np.nan)
+            time = np.full((n_runners, n_flucs), None, dtype=object)
+            price[book['runner_idx'].values, book['seq'].values] = book['price'].values
+            time[book['runner_idx'].values, book['seq'].values] = book['timestamp'].values
+            for i in range(n_flucs):
+                wide[f'{prefix}_price{i}'] = price[:, i]
+                wide[f'{prefix}_time{i}'] = time[:, i]
+        return pd.DataFrame(wide)
+
     def get_dataframe(self, add_tab_sb_prices=False):
-        races = []
-
-        for race in self.races:
-            race_number = race.number
-            race_name = race.meeting.track
-            race_date = race.meeting.date
-            race_state = race.meeting.location
-            race_places = race.results
-            if race_state in ['GBR']:
-                continue
-
-            for runner in race.runners:
-                bsp = None
-                ltp = None
-                place_price = None
-                runner_place = None
-                runner_number = runner.number
-                tab_price0 = None
-                tab_time0 = None
-                tab_price1 = None
-                tab_time1 = None
-                tab_price2 = None
-                tab_time2 = None
-                tab_price3 = None
-                tab_time3 = None
-                tab_price4 = None
-                tab_time4 = None
-                tab_price5 = None
-                tab_time5 = None
-                sb_price0 = None
-                sb_time0 = None
-                sb_price1 = None
-                sb_time1 = None
-                sb_price2 = None
-                sb_time2 = None
-                sb_price3 = None
-                sb_time3 = None
-                sb_price4 = None
-                sb_time4 = None
-                sb_price5 = None
-                sb_time5 = None
-
-
-                
-                if not runner.is_scratched():
-                    
-                    if len(runner.betfair_markets) > 0:
-                        # race_places is a list of lists, eg [[6], [1], [8], [4]] meaning dog with runner_number 6 finished in 1st, 8th and 4th place
-                        if race_places:
-                            for place_list in race_places:
-                                if runner_number in place_list:
-                                    runner_place = race_places.index(place_list) + 1
-                                    break
-
-                        try:
-                            if runner.betfair_markets[0].market_name == 'win':
-                                bsp = round(runner.betfair_markets[0].starting_price,2)
-                                ltp = round(runner.betfair_markets[0].last_price_traded,2)
-                                place_price = round(runner.betfair_markets[1].starting_price,2)
-
-                            elif runner.betfair_markets[1].market_name == 'win':
-                                bsp = round(runner.betfair_markets[1].starting_price,2)
-                                ltp = round(runner.betfair_markets[1].last_price_traded,2)
-                                place_price = round(runner.betfair_markets[0].starting_price,2)
-                        except:
-                            pass
-                # somethign about adding tab and sb prices
-                if add_tab_sb_prices:
-                    for market in runner.bookmaker_markets:
-                        if not market._fixed_win.flucs:
-                            continue
-                        if market._bookmaker.lower() == 'tab':
-                            try:
-                                tab_price0 = round(market._fixed_win.flucs[0].price,2)
-                                tab_time0 = market._fixed_win.flucs[0].last_updated
-                            except:
-                                pass
-                            try:
-                                tab_price1 = round(market._fixed_win.flucs[1].price,2)
-                                tab_time1 = market._fixed_win.flucs[1].last_updated
-                            except:
-                                pass
-                            try:
-                                tab_price2 = round(market._fixed_win.flucs[2].price,2)
-                                tab_time2 = market._fixed_win.flucs[2].last_updated
-                            except:
-                                pass
-                            try:
-                                tab_price3 = round(market._fixed_win.flucs[3].price,2)
-                                tab_time3 = market._fixed_win.flucs[3].last_updated
-                            except:
-                                pass
-                            try:
-                                tab_price4 = round(market._fixed_win.flucs[4].price,2)
-                                tab_time4 = market._fixed_win.flucs[4].last_updated
-                            except:
-                                pass
-                            try:
-                                tab_price5 = round(market._fixed_win.flucs[5].price,2)
-                                tab_time5 = market._fixed_win.flucs[5].last_updated
-                            except:
-                                pass
-                        if market._bookmaker.lower() == 'sportsbet':
-                            try:
-                                sb_price0 = round(market._fixed_win.flucs[0].price,2)
-                                sb_time0 = market._fixed_win.flucs[0].last_updated
-                            except:
-                                pass
-                            try:
-                                sb_price1 = round(market._fixed_win.flucs[1].price,2)
-                                sb_time1 = market._fixed_win.flucs[1].last_updated
-                            except:
-                                pass
-                            try:
-                                sb_price2 = round(market._fixed_win.flucs[2].price,2)
-                                sb_time2 = market._fixed_win.flucs[2].last_updated
-                            except:
-                                pass
-                            try:
-                                sb_price3 = round(market._fixed_win.flucs[3].price,2)
-                                sb_time3 = market._fixed_win.flucs[3].last_updated
-                            except:
-                                pass
-                            try:
-                                sb_price4 = round(market._fixed_win.flucs[4].price,2)
-                                sb_time4 = market._fixed_win.flucs[4].last_updated
-                            except:
-                                pass
-                            try:
-                                sb_price5 = round(market._fixed_win.flucs[5].price,2)
-                                sb_time5 = market._fixed_win.flucs[5].last_updated
-                            except:
-                                pass
-                    races.append([race_date, race_state, race_name, race_number,
-                                    runner.name, runner.number, runner.betfair_id, runner_place, bsp, ltp, place_price, 
-                                    tab_price0, tab_time0, tab_price1, tab_time1, tab_price2, tab_time2, tab_price3, tab_time3, tab_price4, tab_time4, tab_price5, tab_time5,
-                                    sb_price0, sb_time0, sb_price1, sb_time1, sb_price2, sb_time2, sb_price3, sb_time3, sb_price4, sb_time4, sb_price5, sb_time5])
-                else:
-                    races.append([race_date, race_state, race_name, race_number,
-                                    runner.name, runner.number, runner.betfair_id, bsp, ltp, place_price])
+        runners, flucs = self.flatten_races(include_flucs=add_tab_sb_prices)
+        base_cols = ['date', 'state', 'track', 'race_number', 'runner', 'runner_number', 'betfair_runner_id']
+        rename = {'runner': 'dogname', 'runner_number': 'dog_number', 'betfair_runner_id': 'betfair_dog_id'}
 
         if not add_tab_sb_prices:
-            df = pd.DataFrame(races, columns=['date', 'state', 'track', 'race_number', 'dogname', 'dog_number', 'betfair_dog_id', 'bsp', 'ltp', 'bsp_place'])
+            df = runners[base_cols + ['bsp', 'ltp', 'bsp_place']].rename(columns=rename)
         else:
-            df = pd.DataFrame(races, columns=['date', 'state', 'track', 'race_number', 'dogname', 'dog_number', 'betfair_dog_id', 'place', 'bsp', 'ltp', 'bsp_place', 
-                                              'tab_price0', 'tab_time0', 'tab_price1', 'tab_time1', 'tab_price2', 'tab_time2', 'tab_price3', 'tab_time3', 'tab_price4', 'tab_time4', 'tab_price5', 'tab_time5',
-                                              'sb_price0', 'sb_time0', 'sb_price1', 'sb_time1', 'sb_price2', 'sb_time2', 'sb_price3', 'sb_time3', 'sb_price4', 'sb_time4', 'sb_price5', 'sb_time5'])  
-        df['dogname'] = df['dogname'].apply(lambda x: x.lower().replace("'", '').replace(".", '').split('(')[0].strip())
-        df['track'] = df['track'].apply(lambda x: x.lower().split('(')[0].strip())
+            df = pd.concat([runners[base_cols + ['place', 'bsp', 'ltp', 'bsp_place']].rename(columns=rename),
+                            self._wide_flucs(flucs, len(runners))], axis=1)
+        df['dogname'] = canonical_names(df['dogname'])
+        df['track'] = canonical_tracks(df['track'])
         if not add_tab_sb_prices:
             df = df[df['bsp'].notna()]
 
         return df
                                  
 
+_shared_betwatch = None
+
+def get_shared_betwatch():
+    # One client per process, reused by merge_new_data_with_betfair, check_recent_mongo_for_bsp_updates and the upcoming run
+    global _shared_betwatch
+    if _shared_betwatch is None:
+        _shared_betwatch = BetwatchData()
+    return _shared_betwatch
+
+
 if __name__ == '__main__':
     # from betfair_data import pull_betfair_data
     
     num_search_days = (datetime.today() - pd.to_datetime('2022-11-07')).days
     # num_search_days = 3
     bw = BetwatchData()
-    df = asyncio.run(bw.pull_sequential_dates(num_search_days=num_search_days, meeting_types='R', look_forwards=False, add_tab_sb_prices=True))
+    df = bw.run(bw.pull_sequential_dates(num_search_days=num_search_days, meeting_types='R', look_forwards=False, 
+                                         add_tab_sb_prices=True, profile='full_flucs'))
     print(df.shape)
-    if hasattr(bw.bw, '_BetwatchAsyncClient__exit'):
-        bw.bw._BetwatchAsyncClient__exit()
-        # Unregister the atexit handler after manual exit
-        atexit.unregister(bw.bw._BetwatchAsyncClient__exit)
-    else:
-        print("The __exit method does not exist.")
+    print(bw.profile_summary())
+    bw.close()
     df.to_csv('betwatch_data_history_horses.csv', index=False)
+    # full price history, not just the first six flucs
+    bw.fluc_table.to_csv('betwatch_flucs_history_horses.csv', index=False)
     
         
 
@@ -0,0 +1,108 @@
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+
+
+class BetwatchPriceStore:
+    """
+    Local store of Betwatch runner prices, one csv per race date plus an index with a settled flag.
+
+    BSP/LTP stop changing once a day has settled, so settled days are read from disk and only
+    missing or unsettled dates go to the API.
+    """
+    def __init__(self, store_dir='betwatch_price_store', settle_days=2):
+        self.store_dir = store_dir
+        self.settle_days = settle_days      # days after the race date before prices are treated as final
+        self.index_path = os.path.join(store_dir, '_index.csv')
+        self.index_cols = ['date', 'settled', 'n_runners', 'fetched_at']
+        self.price_cols = ['date', 'track', 'race_number', 'runner', 'runner_number', 'betfair_runner_id',
+                           'bsp', 'preplay_last_price_taken', 'bsp_place']
+        os.makedirs(store_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            try:
+                index = pd.read_csv(self.index_path, dtype={'date': str})
+                return index.set_index('date')
+            except Exception as e:
+                print(f'Could not read betwatch store index {self.index_path}: {e}')
+        return pd.DataFrame(columns=self.index_cols).set_index('date')
+
+    def _save_index(self):
+        self.index.reset_index().to_csv(self.index_path, index=False)
+
+    def _day_path(self, date):
+        return os.path.join(self.store_dir, f'{date}.csv')
+
+    @staticmethod
+    def _date_str(date):
+        return pd.to_datetime(date).strftime('%Y-%m-%d')
+
+    def is_settled(self, date):
+        return date in self.index.index and bool(self.index.loc[date, 'settled'])
+
+    def dates_to_fetch(self, dates):
+        return [date for date in dates if not self.is_settled(date)]
+
+    @staticmethod
+    def flatten_races(races):
+        """Betfair win/place prices per runner, same rules as the old inline loop in merge_new_data_with_betfair."""
+        rows = []
+        for race in races:
+            for runner in race.runners:
+                if runner.is_scratched():
+                    continue
+                try:
+                    if runner.betfair_markets[0].market_name == 'win':
+                        win, place = runner.betfair_markets[0], runner.betfair_markets[1]
+                    elif runner.betfair_markets[1].market_name == 'win':
+                        win, place = runner.betfair_markets[1], runner.betfair_markets[0]
+                    else:
+                        print(f'WTF some issue with the betwatch markets not having a win? {[x.market_name for x in runner.betfair_markets]}')
+                        continue
+                    rows.append([race.meeting.date, race.meeting.track, race.number, runner.name, runner.number,
+                                 runner.betfair_id, round(win.starting_price, 2), round(win.last_price_traded, 2),
+                                 round(place.starting_price, 2)])
+                except Exception as e:
+                    pass
+        return rows
+
+    def save_races(self, races, fetched_dates):
+        """Write the fetched days to disk and flag the ones old enough (and non-empty) as settled."""
+        day_df = pd.DataFrame(self.flatten_races(races), columns=self.price_cols)
+        day_df['date'] = pd.to_datetime(day_df['date'], errors='coerce').dt.strftime('%Y-%m-%d')
+        settle_cutoff = (datetime.today() - timedelta(days=self.settle_days)).strftime('%Y-%m-%d')
+        fetched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        for date in fetched_dates:
+            day = day_df[day_df['date'] == date]
+            day.to_csv(self._day_path(date), index=False)
+            # an empty day could be an API hiccup, so keep re-checking it
+            settled = date <= settle_cutoff and len(day) > 0
+            self.index.loc[date, self.index_cols[1:]] = [settled, len(day), fetched_at]
+        self._save_index()
+
+    def load(self, dates):
+        frames = []
+        for date in dates:
+            path = self._day_path(date)
+            if os.path.exists(path):
+                # names like 'NA' must stay strings, only the price/id columns can be missing
+                frames.append(pd.read_csv(path, dtype={'date': str, 'track': str, 'runner': str}, keep_default_na=False,
+                                          na_values={col: [''] for col in self.price_cols[4:]}))
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=self.price_cols)
+        return pd.concat(frames, ignore_index=True)
+
+    def get_prices(self, bw, dates, meeting_types='H'):
+        """Prices for the dates, only pulling missing/unsettled days from Betwatch."""
+        dates = [self._date_str(date) for date in dates]
+        to_fetch = self.dates_to_fetch(dates)
+        print(f'Betwatch store: {len(dates) - len(to_fetch)} settled days from disk, fetching {len(to_fetch)}')
+        if to_fetch:
+            bw.reset_races()
+            bw.run(bw.pull_dates(to_fetch, meeting_types, profile='sp_only'))
+            self.save_races(bw.races, to_fetch)
+        return self.load(dates)
@@ -0,0 +1,161 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+
+_strip_chars = re.compile(r"['’.?]")
+_whitespace = re.compile(r'\s+')
+
+
+def _canonical_name(name, drop_country=True):
+    name = _strip_chars.sub('', str(name).lower())
+    if drop_country:
+        name = name.split('(')[0]       # 'Horse (NZ)' -> 'horse'
+    return _whitespace.sub(' ', name).strip()
+
+
+def canonical_names(names, drop_country=True):
+    """
+    One spelling per runner for every source (RISE, Betwatch, Betfair): lower case, no quotes, dots or '?',
+    country suffix cut at '(' and single spaces. Each distinct name is cleaned once, blank names become NaN.
+    """
+    names = pd.Series(names)
+    codes, uniques = pd.factorize(names)
+    cleaned = np.array([_canonical_name(name, drop_country) or np.nan for name in uniques] + [np.nan], dtype=object)
+    return pd.Series(cleaned[codes], index=names.index)
+
+
+def canonical_tracks(tracks):
+    """Lower case track with the '(state)' suffix and ' extra' meetings folded in."""
+    tracks = pd.Series(tracks)
+    codes, uniques = pd.factorize(tracks)
+    cleaned = np.array([str(track).lower().split('(')[0].replace(' extra', '').strip() for track in uniques] + [np.nan], dtype=object)
+    return pd.Series(cleaned[codes], index=tracks.index)
+
+
+class RunnerLinkage:
+    """
+    Persisted runner linkage for the betting merges: canonical name -> stable integer name_key, and
+    horseId <-> betfair_horse_id pairs seen on earlier matches.
+
+    Joins run on integer (meeting, name_key) keys, and a runner whose name doesn't line up (renames,
+    odd spellings) still matches through its linked betfair id. Every join logs its match rate per source.
+    """
+    def __init__(self, store_dir='runner_linkage'):
+        self.store_dir = store_dir
+        self.names_path = os.path.join(store_dir, 'name_keys.csv')
+        self.links_path = os.path.join(store_dir, 'links.csv')
+        self.rates_path = os.path.join(store_dir, 'match_rates.csv')
+        self.link_cols = ['horseId', 'betfair_horse_id', 'name_key', 'last_seen']
+        os.makedirs(store_dir, exist_ok=True)
+        self.names = self._read(self.names_path, ['name_key', 'canonical_name'], {'canonical_name': str})
+        self.name_keys_map = dict(zip(self.names['canonical_name'], self.names['name_key'].astype(int)))
+        self.links = self._read(self.links_path, self.link_cols, {'horseId': str})
+
+    @staticmethod
+    def _read(path, cols, dtype):
+        if os.path.exists(path):
+            try:
+                return pd.read_csv(path, dtype=dtype, keep_default_na=False, na_values={'betfair_horse_id': ['']})[cols]
+            except Exception as e:
+                print(f'Could not read runner linkage {path}: {e}')
+        return pd.DataFrame(columns=cols)
+
+    # ---------- keys ----------
+    def name_keys(self, names, canonical=False):
+        """Integer key per runner name, unseen names get the next free key (append-only, like the stewards vocab)."""
+        names = pd.Series(names).replace('', np.nan) if canonical else canonical_names(names)
+        new_names = [name for name in names.dropna().unique() if name not in self.name_keys_map]
+        if new_names:
+            start = len(self.name_keys_map)
+            new_rows = pd.DataFrame({'name_key': range(start, start + len(new_names)), 'canonical_name': new_names})
+            self.name_keys_map.update(zip(new_rows['canonical_name'], new_rows['name_key']))
+            self.names = new_rows if self.names.empty else pd.concat([self.names, new_rows], ignore_index=True)
+            self.names.to_csv(self.names_path, index=False)
+        return names.map(self.name_keys_map).fillna(-1).astype(np.int64).values
+
+    @staticmethod
+    def _meeting_keys(*frames):
+        """Shared integer codes for (date, canonical track) across the frames, one array per frame."""
+        meetings = [pd.Series(dates).astype(str).str[:10].values + '|' + canonical_tracks(tracks).astype(str).values
+                    for dates, tracks in frames]
+        codes, _ = pd.factorize(np.concatenate(meetings))
+        return np.split(codes, np.cumsum([len(m) for m in meetings])[:-1])
+
+    # ---------- links ----------
+    def update_links(self, df, horse_id_col='horseId', betfair_id_col='betfair_horse_id', name_col='horseName'):
+        """Record (horseId, betfair id) pairs from a merged frame, the latest pair per horseId wins."""
+        pairs = pd.DataFrame({
+            'horseId': df[horse_id_col].astype(str).values,
+            'betfair_horse_id': pd.to_numeric(df[betfair_id_col], errors='coerce').values,
+            'name_key': self.name_keys(df[name_col]),
+        })
+        pairs = pairs[pairs['betfair_horse_id'].notna() & ~pairs['horseId'].isin(['', 'nan', 'None'])]
+        if pairs.empty:
+            return 0
+        pairs['last_seen'] = datetime.now().strftime('%Y-%m-%d')
+        links = pd.concat([self.links, pairs], ignore_index=True) if not self.links.empty else pairs
+        self.links = links.drop_duplicates(subset=['horseId'], keep='last').reset_index(drop=True)
+        self.links.to_csv(self.links_path, index=False)
+        return len(pairs)
+
+    def betfair_ids_for(self, horse_ids):
+        link_map = dict(zip(self.links['horseId'].astype(str), pd.to_numeric(self.links['betfair_horse_id'], errors='coerce')))
+        return pd.Series(horse_ids).astype(str).map(link_map).values
+
+    # ---------- joins ----------
+    def match_runners(self, left, right, left_on=('date', 'track', 'horseName'), right_on=('date', 'track', 'runner'),
+                      left_horse_col='horseId', right_betfair_col=None, source='betwatch'):
+        """Row position in right for every left row (-1 when unmatched), by name first and linked betfair id second."""
+        left_meet, right_meet = self._meeting_keys((left[left_on[0]], left[left_on[1]]), (right[right_on[0]], right[right_on[1]]))
+
+        right_index = pd.MultiIndex.from_arrays([right_meet, self.name_keys(right[right_on[2]])])
+        left_names = self.name_keys(left[left_on[2]])
+        keep = ~right_index.duplicated(keep='first')
+        positions = np.append(np.flatnonzero(keep), -1)     # found == -1 lands on the trailing -1
+        found = right_index[keep].get_indexer(pd.MultiIndex.from_arrays([left_meet, left_names]))
+        matches = np.where(left_names >= 0, positions[found], -1)     # blank or missing names get -1 and never match
+        by_name = int((matches >= 0).sum())
+
+        by_link = 0
+        if right_betfair_col is not None and left_horse_col in left.columns and not self.links.empty:
+            right_bf = pd.to_numeric(right[right_betfair_col], errors='coerce').values
+            left_bf = self.betfair_ids_for(left[left_horse_col])
+            unmatched = (matches < 0) & ~np.isnan(left_bf.astype(float))
+            has_bf = ~np.isnan(right_bf.astype(float))
+            if unmatched.any() and has_bf.any():
+                bf_index = pd.MultiIndex.from_arrays([right_meet[has_bf], right_bf[has_bf].astype(np.int64)])
+                bf_keep = ~bf_index.duplicated(keep='first')
+                bf_positions = np.append(np.flatnonzero(has_bf)[bf_keep], -1)
+                bf_found = bf_index[bf_keep].get_indexer(pd.MultiIndex.from_arrays(
+                    [left_meet[unmatched], left_bf[unmatched].astype(np.int64)]))
+                linked = bf_positions[bf_found]
+                matches[unmatched] = linked
+                by_link = int((linked >= 0).sum())
+
+        self.record_match_rate(source, len(left), by_name, by_link)
+        return matches
+
+    def merge_runners(self, left, right, left_on=('date', 'track', 'horseName'), right_on=('date', 'track', 'runner'),
+                      cols=None, left_horse_col='horseId', right_betfair_col=None, source='betwatch'):
+        """Left join of the right columns onto left (one right row per left row at most), index of left kept."""
+        matches = self.match_runners(left, right, left_on, right_on, left_horse_col, right_betfair_col, source)
+        if cols is None:
+            cols = [col for col in right.columns if col not in right_on and col not in left.columns]
+        # -1 isn't in the RangeIndex, so unmatched rows come back as NaN
+        matched = right[cols].reset_index(drop=True).reindex(matches)
+        matched.index = left.index
+        out = left.copy()
+        out[cols] = matched
+        return out
+
+    def record_match_rate(self, source, n_rows, by_name, by_link):
+        matched = by_name + by_link
+        rate = matched / n_rows if n_rows else 0.0
+        print(f'Runner match [{source}]: {matched}/{n_rows} ({rate:.1%}), {by_name} by name, {by_link} by linked betfair id')
+        row = pd.DataFrame([[datetime.now().strftime('%Y-%m-%d %H:%M:%S'), source, n_rows, by_name, by_link, round(rate, 4)]],
+                           columns=['timestamp', 'source', 'rows', 'matched_name', 'matched_link', 'match_rate'])
+        row.to_csv(self.rates_path, mode='a', header=not os.path.exists(self.rates_path), index=False)
+        return rate
@@ -0,0 +1,54 @@
+import time
+import schedule
+import pandas as pd
+from datetime import datetime, timedelta
+
+
+def run_schedule_forever(max_sleep=600):
+    """run_pending loop that sleeps until the next job is due instead of spinning a core."""
+    while True:
+        schedule.run_pending()
+        idle = schedule.idle_seconds()
+        # idle is None with no jobs left, negative when a job is already overdue
+        sleep_for = max_sleep if idle is None else min(max(idle, 0), max_sleep)
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+
+def race_refresh_times(start_times, offsets_minutes=(30, 10), min_gap_minutes=5, now=None):
+    """
+    Local refresh times T-offset before each start (plannedStartTimestamp, UTC), today and still in the future.
+    Times closer than min_gap_minutes to the previous one are dropped so stacked meetings share a refresh.
+    """
+    now = now or datetime.now()
+    starts = pd.to_datetime(pd.Series(start_times), utc=True, errors='coerce').dropna()
+    if starts.empty:
+        return []
+    local_tz = datetime.now().astimezone().tzinfo
+    starts = starts.dt.tz_convert(local_tz).dt.tz_localize(None)
+
+    candidates = sorted({(start - timedelta(minutes=offset)).to_pydatetime().replace(second=0, microsecond=0)
+                         for start in starts for offset in offsets_minutes})
+    refresh_times = []
+    for t in candidates:
+        if t <= now or t.date() != now.date():
+            continue
+        if refresh_times and (t - refresh_times[-1]) < timedelta(minutes=min_gap_minutes):
+            continue
+        refresh_times.append(t)
+    return refresh_times
+
+
+def schedule_one_off_jobs(job, run_times, tag):
+    """Replace the jobs under tag with one run of job at each HH:MM today."""
+    schedule.clear(tag)
+
+    def run_once():
+        job()
+        return schedule.CancelJob
+
+    for t in run_times:
+        schedule.every().day.at(t.strftime('%H:%M')).do(run_once).tag(tag)
+    if run_times:
+        print(f'Scheduled {len(run_times)} {tag} runs: {", ".join(t.strftime("%H:%M") for t in run_times)}')
+    return len(run_times)
@@ -13,6 +13,7 @@ from static.telegram import send_telegram_message
 
 from database_management.mongodb import bulk_data_from_mongodb
 from static.static_data import StaticData
+from static.stewards_matcher import StewardsTermMatcher, StewardsFeatureVocab, StewardsTagger
 
 class DataFormatting:
     def __init__(self) -> None:
@@ -35,95 +36,59 @@ class DataFormatting:
         self.df_long_stew_word_counts = pd.read_csv('long_word_counts.csv')
         self.df_lookup = pd.read_csv('final_harness_master_stewards_lookup_table.csv')
         self.unclustered_features = pd.read_csv('unclustered_features.csv')
+        self.stew_vocab = StewardsFeatureVocab()
+        self.stew_tagger = None
+        self.stew_feature_cols = ['long_stew_clustered_features', 'long_stew_unclustered_features', 'long_stew_feature_ids']
         self.upcoming_id_cols = ['clubId', 'trackId', 'breederId', 'broodmareSireId', 'damId', 'driverId', 
                    'horseId', 'trainerId']
         self.historical_id_cols = ['clubId', 'trackId', 'breederId', 'broodmareSireId', 'damId', 'driverId', 
                    'horseId', 'ownerId', 'sireId', 'trainerId']
 
 
-    def extract_stew_data(self, df):
+    def get_stew_tagger(self):
+        # Lookup normalisation and automaton build happen once per instance, not per call
+        if self.stew_tagger is not None:
+            return self.stew_tagger
+
         self.df_lookup['MAJOR CATEGORY'] = self.df_lookup['MAJOR CATEGORY'].apply(lambda x: x.lower().strip().replace(' ', '_'))
         self.df_lookup['SUB-CATEGORY'] = self.df_lookup['SUB-CATEGORY'].apply(lambda x: x.lower().strip().replace(' ', '_'))
-        df['stewardsCommentsLong'] = df['stewardsCommentsLong'].str.replace("'", "").str.replace('.', '').str.lower()
-        
-        def fuzzy_match_all_terms(text, 
-                                terms=None, 
-                                threshold=100, 
-                                lookup_dict=None):
-            
-            if terms is None:
-                return False
-            
-            # text = str(text).lower()
-
-            matched_subcategories = {}
-            if lookup_dict is None:
-                # full_dict = {
-                #                 term: int(fuzz.partial_ratio(term.lower(), text) >= threshold)
-                #                 for term in terms
-                #             }
-                # matched_subcategories = {
-                #         key.replace(' ', '_'): value for key, value in full_dict.items() if value == 1
-                #     }
-                for term in terms:
-                    term_lower = str(term).lower()
-                    index = str(text).lower().find(term_lower)
-
-                    if index != -1:
-                        after_index = index + len(term_lower)
-                        if after_index == len(text) or text[after_index] == ',':
-                            matched_subcategories[term] = 1
-                matched_subcategories = {
-                        key.replace(',', '').replace(' ', '_'): value for key, value in matched_subcategories.items() if value == 1
-                    }
-            else:
-                # print(f'Text: {text}')
-                for term in terms:
-                    term_lower = str(term).lower()
-                    index = str(text).lower().find(term_lower)
-
-                    if index != -1:
-                        after_index = index + len(term_lower)
-                        if after_index == len(text) or text[after_index] == ',':
-                            matched_subcategories[lookup_dict[term].replace(' ', '_')] = 1
-            #     matched_subcategories = {
-            #     lookup_dict[term].replace(' ', '_'): 1
-            #     for term in terms
-            #     if fuzz.partial_ratio(term, text) >= threshold
-            # }
-            return matched_subcategories
 
         ### CLUSTERED FEATURES
-
+        # One automaton per term set, each comment is scanned once (comma/end-of-text boundary rule)
         term_to_subcategory_mapping = dict(zip(self.df_lookup['INDIVIDUAL COMMENT'].str.lower().replace(',', ''), 
                                                self.df_lookup['SUB-CATEGORY']))
         terms = list(term_to_subcategory_mapping.keys())
+        clustered_matcher = StewardsTermMatcher(terms, 
+                                                labels=[term_to_subcategory_mapping[term].replace(' ', '_') for term in terms])
+
+        # UNCLUSTERED FEATURES
+        unclustered_terms = self.unclustered_features['term'].tolist()
+        unclustered_matcher = StewardsTermMatcher(unclustered_terms, 
+                                                  labels=[str(term).replace(',', '').replace(' ', '_') for term in unclustered_terms])
 
-        df['clustered_features'] = df['stewardsCommentsLong'].apply(fuzzy_match_all_terms, 
-                                                                            terms=terms, 
-                                                                            threshold=100,
-                                                                            lookup_dict=term_to_subcategory_mapping)
+        # Stable integer ids per feature, stored alongside the strings
+        self.stew_vocab.add_features('clustered', clustered_matcher.labels)
+        self.stew_vocab.add_features('unclustered', unclustered_matcher.labels)
 
-        df.rename(columns={'clustered_features': 'long_stew_clustered_features'}, inplace=True)
-        
+        self.stew_tagger = StewardsTagger(clustered_matcher, unclustered_matcher, self.stew_vocab)
+        return self.stew_tagger
 
-        # UNCLUSTERED FEATURES
-        df['long_stew_unclustered_features'] = df['stewardsCommentsLong'].apply(fuzzy_match_all_terms, 
-                                                                                  terms=self.unclustered_features['term'].tolist(), 
-                                                                                  threshold=99)
+    def clean_stew_comments(self, comments):
+        return comments.map(lambda x: x.replace("'", "").replace('.', '').lower() if isinstance(x, str) else np.nan)
 
-        # POST PROCESSING FEATURES
-        df['long_stew_clustered_features'] = df['long_stew_clustered_features'].apply(self.safe_to_dict)
-        df['long_stew_unclustered_features'] = df['long_stew_unclustered_features'].apply(self.safe_to_dict)
-        
-        def post_process_stew(df_temp, col_name):
-            df_temp[col_name] = df_temp[col_name].map(
-                lambda d: '|'.join(d.keys())
-                )
-            return df_temp
-        
-        df = post_process_stew(df, 'long_stew_unclustered_features')
-        df = post_process_stew(df, 'long_stew_clustered_features')
+    def tag_stew_comments(self, comments):
+        # Comments repeat heavily, so each distinct comment is tagged once and mapped back
+        tagger = self.get_stew_tagger()
+        codes, uniques = pd.factorize(comments)
+        tagged = tagger.tag_many(uniques) + [tagger.tag(None)]   # code -1 (missing) -> last
+        return pd.DataFrame([tagged[code] for code in codes], index=comments.index, columns=self.stew_feature_cols)
+
+    def extract_stew_data(self, df):
+        df['stewardsCommentsLong'] = self.clean_stew_comments(df['stewardsCommentsLong'])
+
+        tagged = self.tag_stew_comments(df['stewardsCommentsLong'])
+        for col in self.stew_feature_cols:
+            df[col] = tagged[col]
 
         return df
     
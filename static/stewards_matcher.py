@@ -0,0 +1,246 @@
+import os
+import ast
+import numpy as np
+import pandas as pd
+from collections import deque
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+class StewardsTermMatcher:
+    """
+    Aho-Corasick automaton over the stewards terms, built once and scanned once per comment.
+
+    Same rule as the old per-term str.find loop: a term only counts if its FIRST occurrence in
+    the comment ends at a comma or at the end of the text. Matches come back as {label: 1} in
+    term-list order, so the '|' joined feature strings are unchanged.
+    """
+    def __init__(self, terms, labels=None):
+        terms = [str(term).lower() for term in terms]
+        self.labels = list(labels) if labels is not None else terms
+        self.n_terms = len(terms)
+
+        # trie: one dict of char -> state per node, patterns are the unique term strings
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._pattern_terms = []     # pattern id -> term positions (duplicate terms share a pattern)
+        self._empty_terms = []       # '' matches at index 0, kept for parity with str.find
+        pattern_ids = {}
+
+        for i, term in enumerate(terms):
+            if term == '':
+                self._empty_terms.append(i)
+                continue
+            if term in pattern_ids:
+                self._pattern_terms[pattern_ids[term]].append(i)
+                continue
+            pid = len(self._pattern_terms)
+            pattern_ids[term] = pid
+            self._pattern_terms.append([i])
+
+            state = 0
+            for ch in term:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+
+        # failure links, breadth first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def matched_terms(self, text):
+        """Sorted positions of the terms that hit on this comment."""
+        if not isinstance(text, str):
+            return []
+        text = text.lower()
+        n = len(text)
+        goto, fail, out = self._goto, self._fail, self._out
+
+        hits = []
+        seen = set()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                if pid in seen:
+                    continue
+                seen.add(pid)       # only the first occurrence is checked
+                if i + 1 == n or text[i + 1] == ',':
+                    hits.extend(self._pattern_terms[pid])
+
+        if self._empty_terms and (n == 0 or text[0] == ','):
+            hits.extend(self._empty_terms)
+        hits.sort()
+        return hits
+
+    def match(self, text):
+        matches = {}
+        for i in self.matched_terms(text):
+            matches[self.labels[i]] = 1
+        return matches
+
+
+class StewardsFeatureVocab:
+    """
+    Append-only vocabulary of stewards features -> stable integer ids, persisted to csv.
+
+    Ids are never renumbered, so the per-runner long_stew_feature_ids lists stay valid when the
+    lookup table grows. Helpers turn those lists into a CSR matrix, one-hot columns or row masks.
+    """
+    def __init__(self, vocab_path='stewards_feature_vocab.csv'):
+        self.vocab_path = vocab_path
+        self.vocab_cols = ['feature_id', 'kind', 'feature']
+        self.vocab = self._load_vocab()
+        self._ids = {(kind, feature): int(fid) for fid, kind, feature in self.vocab[self.vocab_cols].itertuples(index=False)}
+
+    def _load_vocab(self):
+        if self.vocab_path and os.path.exists(self.vocab_path):
+            try:
+                vocab = pd.read_csv(self.vocab_path, dtype={'feature_id': int, 'kind': str, 'feature': str}, keep_default_na=False)
+                return vocab[self.vocab_cols]
+            except Exception as e:
+                print(f'Could not read stewards vocab {self.vocab_path}: {e}')
+        return pd.DataFrame(columns=self.vocab_cols)
+
+    def _save_vocab(self):
+        if not self.vocab_path:
+            return
+        try:
+            self.vocab.to_csv(self.vocab_path, index=False)
+        except Exception as e:
+            print(f'Could not save stewards vocab {self.vocab_path}: {e}')
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add_features(self, kind, features):
+        """Give any unseen features the next free ids, in the order given."""
+        new_rows = []
+        for feature in features:
+            if (kind, feature) in self._ids:
+                continue
+            fid = len(self._ids)
+            self._ids[(kind, feature)] = fid
+            new_rows.append({'feature_id': fid, 'kind': kind, 'feature': feature})
+        if new_rows:
+            new_rows = pd.DataFrame(new_rows, columns=self.vocab_cols)
+            self.vocab = new_rows if self.vocab.empty else pd.concat([self.vocab, new_rows], ignore_index=True)
+            self._save_vocab()
+            print(f'Stewards vocab: added {len(new_rows)} {kind} features, {len(self._ids)} total')
+
+    def feature_id(self, kind, feature):
+        return self._ids.get((kind, feature))
+
+    def encode(self, clustered=None, unclustered=None):
+        """Sorted feature ids for one runner, from the matcher dicts (or iterables of feature names)."""
+        ids = [self._ids[('clustered', f)] for f in (clustered or ()) if ('clustered', f) in self._ids]
+        ids += [self._ids[('unclustered', f)] for f in (unclustered or ()) if ('unclustered', f) in self._ids]
+        return sorted(set(ids))
+
+    def ids_from_strings(self, clustered_col, unclustered_col):
+        """Feature id lists from the existing '|' joined long_stew_* columns, for already tagged history."""
+        def _split(val):
+            return val.split('|') if isinstance(val, str) and val else ()
+        return [self.encode(_split(c), _split(u)) for c, u in zip(clustered_col, unclustered_col)]
+
+    # ---------- vectorised helpers ----------
+    @staticmethod
+    def _parse_ids(val):
+        # Mongo gives lists back, csv round trips give "[1, 5]"
+        if isinstance(val, str):
+            try:
+                val = ast.literal_eval(val)
+            except Exception:
+                return ()
+        if val is None or (isinstance(val, float) and np.isnan(val)):
+            return ()
+        return val
+
+    def to_csr(self, id_col):
+        """(n_runners x n_features) CSR matrix of 0/1 from a column of feature id lists."""
+        if sparse is None:
+            raise ImportError('scipy is required for stewards feature matrices, please run: pip install scipy')
+        rows = [self._parse_ids(val) for val in id_col]
+        lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.fromiter((i for r in rows for i in r), dtype=np.int32, count=int(indptr[-1]))
+        data = np.ones(len(indices), dtype=np.uint8)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), len(self._ids)))
+
+    def _ids_for(self, features, kind=None):
+        """Per requested feature, its ids over the kinds it exists under (empty list when not in the vocab)."""
+        kinds = [kind] if kind else ['clustered', 'unclustered']
+        return [[self._ids[(k, feature)] for k in kinds if (k, feature) in self._ids] for feature in features]
+
+    def one_hot(self, df, features=None, kind=None, id_col='long_stew_feature_ids', prefix='stew_'):
+        """
+        One-hot columns (uint8) for the requested features, or the whole vocab, indexed like df.
+
+        Features that exist under both kinds get one column per kind, named stew_<kind>_<feature>.
+        """
+        matrix = self.to_csr(df[id_col])
+        if features is None:
+            vocab = self.vocab if kind is None else self.vocab[self.vocab['kind'] == kind]
+            pairs = list(zip(vocab['feature_id'].astype(int), vocab['kind'], vocab['feature']))
+        else:
+            pairs = [(self._ids[(k, f)], k, f) for f in features
+                     for k in ([kind] if kind else ['clustered', 'unclustered']) if (k, f) in self._ids]
+        ids = [fid for fid, _, _ in pairs]
+        counts = pd.Series([f for _, _, f in pairs], dtype=object).value_counts()
+        names = [f'{k}_{f}' if counts[f] > 1 else f for _, k, f in pairs]
+        dense = matrix[:, ids].toarray() if ids else np.zeros((len(df), 0), dtype=np.uint8)
+        return pd.DataFrame(dense, index=df.index, columns=[f'{prefix}{name}' for name in names])
+
+    def has_features(self, df, features, kind=None, how='any', id_col='long_stew_feature_ids'):
+        """
+        Boolean mask of runners with any (or all) of the features, e.g. df[vocab.has_features(df, ['galloped'])].
+
+        A feature counts as present under either kind (unless kind is given). With how='all' a
+        feature missing from the vocab matches no runner.
+        """
+        id_groups = self._ids_for(features, kind)
+        if how == 'all' and (not id_groups or not all(id_groups)):
+            return pd.Series(False, index=df.index)
+        id_groups = [ids for ids in id_groups if ids]
+        if not id_groups:
+            return pd.Series(False, index=df.index)
+        matrix = self.to_csr(df[id_col])
+        present = [matrix[:, ids].getnnz(axis=1) > 0 for ids in id_groups]
+        mask = np.logical_and.reduce(present) if how == 'all' else np.logical_or.reduce(present)
+        return pd.Series(mask, index=df.index)
+
+
+class StewardsTagger:
+    """Both term matchers plus the vocab, tags one cleaned comment into the long_stew_* values. Pickles for worker pools."""
+    def __init__(self, clustered_matcher, unclustered_matcher, vocab):
+        self.clustered_matcher = clustered_matcher
+        self.unclustered_matcher = unclustered_matcher
+        self.vocab = vocab
+
+    def tag(self, comment):
+        clustered = self.clustered_matcher.match(comment)
+        unclustered = self.unclustered_matcher.match(comment)
+        return '|'.join(clustered), '|'.join(unclustered), self.vocab.encode(clustered, unclustered)
+
+    def tag_many(self, comments):
+        return [self.tag(comment) for comment in comments]
@@ -11,6 +11,7 @@ Usage:
     Import functions from this module and register them in meta_processor.py
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Optional
 import logging
@@ -38,6 +39,27 @@ MASTER_COLS_TRIPLES = ['state', 'date', 'track',
                'first_50m', 'first_100m', 'first_200m']
 
 
+# Cleaners must give a row the same result whichever other files are cleaned with it (the
+# merge store cleans new files in small batches), so column fallbacks are resolved per row
+# and columns a file lacks are added as empty instead of being chosen by what the batch holds.
+
+def ensure_columns(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """Add any of cols missing from df as empty (NaN) text columns, like a column empty in every file"""
+    for col in cols:
+        if col not in df.columns:
+            df[col] = pd.Series(np.nan, index=df.index, dtype=object)
+    return df
+
+
+def first_present(df: pd.DataFrame, cols: List[str]) -> pd.Series:
+    """Row by row, the first non-null value over the given columns (those missing from df are skipped)"""
+    out = pd.Series(np.nan, index=df.index, dtype=object)
+    for col in cols:
+        if col in df.columns:
+            out = out.where(out.notna(), df[col])
+    return out
+
+
 def clean_nsw_pj(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean NSW PJ format data.
@@ -56,23 +78,10 @@ def clean_nsw_pj(df: pd.DataFrame) -> pd.DataFrame:
     df_nsw_pj = df.copy()
     df_nsw_pj.to_csv('df_nsw_pj.csv', index=False)
 
-    # Handle time_800m - prioritize in order of preference
-    if 'time_800m' not in df_nsw_pj.columns:
-        if 'last_800m' in df_nsw_pj.columns:
-            df_nsw_pj['time_800m'] = df_nsw_pj['last_800m']
-        elif 'third_quarter' in df_nsw_pj.columns:
-            df_nsw_pj['time_800m'] = df_nsw_pj['third_quarter']
-        else:
-            df_nsw_pj['time_800m'] = None
-
-    # Handle time_400m - prioritize in order of preference
-    if 'time_400m' not in df_nsw_pj.columns:
-        if 'last_400m' in df_nsw_pj.columns:
-            df_nsw_pj['time_400m'] = df_nsw_pj['last_400m']
-        elif 'fourth_quarter' in df_nsw_pj.columns:
-            df_nsw_pj['time_400m'] = df_nsw_pj['fourth_quarter']
-        else:
-            df_nsw_pj['time_400m'] = None
+    # Handle time_800m / time_400m - prioritize in order of preference, per row
+    df_nsw_pj['time_800m'] = first_present(df_nsw_pj, ['time_800m', 'last_800m', 'third_quarter'])
+    df_nsw_pj['time_400m'] = first_present(df_nsw_pj, ['time_400m', 'last_400m', 'fourth_quarter'])
+    df_nsw_pj = ensure_columns(df_nsw_pj, ['width_800m', 'width_400m'])
 
     df_nsw_pj['state_pj'] = 'NSW'
     def extract_width(width_str):
@@ -113,7 +122,7 @@ def clean_nsw_pj(df: pd.DataFrame) -> pd.DataFrame:
     if 'first_100m' not in df_nsw_pj.columns:
         df_nsw_pj['first_100m'] = None
 
-    df_nsw_pj_clean = df_nsw_pj[MASTER_COLS_PJ].copy()
+    df_nsw_pj_clean = ensure_columns(df_nsw_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_nsw_pj_clean.to_csv('df_nsw_pj_clean.csv', index=False)
     return df_nsw_pj_clean
 
@@ -121,6 +130,9 @@ def clean_nsw_pj(df: pd.DataFrame) -> pd.DataFrame:
 def clean_nsw_triples(df: pd.DataFrame) -> pd.DataFrame:
     """Clean NSW TripleS format data."""
     logger.info(f"Cleaning NSW TripleS data: {len(df)} rows")
+    if len(df) == 0:
+        return None
+
     df_nsw_triples = df.copy()
     df_nsw_triples.to_csv('df_nsw_triples.csv', index=False)
     df_nsw_triples['state'] = 'NSW'
@@ -164,7 +176,7 @@ def clean_nsw_triples(df: pd.DataFrame) -> pd.DataFrame:
     # Apply track extraction to fix corrupted track column
     df_nsw_triples['track'] = df_nsw_triples.apply(extract_track_from_nsw_filename, axis=1)
 
-    df_nsw_triples_clean = df_nsw_triples[MASTER_COLS_TRIPLES].copy()
+    df_nsw_triples_clean = ensure_columns(df_nsw_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_nsw_triples_clean.to_csv('df_nsw_triples_clean.csv', index=False)
     return df_nsw_triples_clean
 
@@ -177,28 +189,18 @@ def clean_vic_pj(df: pd.DataFrame) -> pd.DataFrame:
 
     df_vic_pj = df.copy()
     df_vic_pj.to_csv('df_vic_pj.csv', index=False)
-    vic_rename_cols = {
-        'third_quarter_seconds': 'third_quarter',
-        'fourth_quarter_seconds': 'fourth_quarter',
-    }
-
-    df_vic_pj.rename(columns=vic_rename_cols, inplace=True)
-
-    df_vic_pj['third_quarter'] = df_vic_pj['third_quarter'].apply(lambda x: str(x).replace('s', ''))
-    df_vic_pj['fourth_quarter'] = df_vic_pj['fourth_quarter'].apply(lambda x: str(x).replace('s', ''))
-
-    col_upates = {
-        'third_quarter': 'time_800m',
-        'fourth_quarter': 'time_400m',
-    }
+    # third_quarter(_seconds) -> time_800m, fourth_quarter(_seconds) -> time_400m, per row
+    df_vic_pj['time_800m'] = first_present(df_vic_pj, ['third_quarter_seconds', 'third_quarter', 'time_800m'])
+    df_vic_pj['time_400m'] = first_present(df_vic_pj, ['fourth_quarter_seconds', 'fourth_quarter', 'time_400m'])
 
-    df_vic_pj.rename(columns=col_upates, inplace=True)
+    df_vic_pj['time_800m'] = df_vic_pj['time_800m'].apply(lambda x: str(x).replace('s', ''))
+    df_vic_pj['time_400m'] = df_vic_pj['time_400m'].apply(lambda x: str(x).replace('s', ''))
 
     df_vic_pj['state_pj'] = 'VIC'
     if 'first_100m' not in df_vic_pj.columns:
         df_vic_pj['first_100m'] = None
 
-    df_vic_pj_clean = df_vic_pj[MASTER_COLS_PJ].copy()
+    df_vic_pj_clean = ensure_columns(df_vic_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_vic_pj_clean.to_csv('df_vic_pj_clean.csv', index=False)
     return df_vic_pj_clean
 
@@ -206,10 +208,13 @@ def clean_vic_pj(df: pd.DataFrame) -> pd.DataFrame:
 def clean_vic_triples(df: pd.DataFrame) -> pd.DataFrame:
     """Clean VIC TripleS format data."""
     logger.info(f"Cleaning VIC TripleS data: {len(df)} rows")
+    if len(df) == 0:
+        return None
+
     df_vic_triples = df.copy()
     df_vic_triples.to_csv('df_vic_triples.csv', index=False)
     df_vic_triples['state'] = 'VIC'
-    df_vic_triples_clean = df_vic_triples[MASTER_COLS_TRIPLES].copy()
+    df_vic_triples_clean = ensure_columns(df_vic_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_vic_triples_clean.to_csv('df_vic_triples_clean.csv', index=False)
     return df_vic_triples_clean
 
@@ -225,6 +230,7 @@ def clean_qld_pj(df: pd.DataFrame) -> pd.DataFrame:
     # df_qld_pj['time_800m'].fillna(df_qld_pj['third_quarter'], inplace=True)
     # df_qld_pj['time_400m'].fillna(df_qld_pj['fourth_quarter'], inplace=True)
 
+    df_qld_pj = ensure_columns(df_qld_pj, ['time_800m', 'time_400m'])
     df_qld_pj['time_800m'] = df_qld_pj['time_800m'].apply(lambda x: str(x).replace('s', ''))
     df_qld_pj['time_400m'] = df_qld_pj['time_400m'].apply(lambda x: str(x).replace('s', ''))
 
@@ -238,7 +244,7 @@ def clean_qld_pj(df: pd.DataFrame) -> pd.DataFrame:
     if 'first_100m' not in df_qld_pj.columns:
         df_qld_pj['first_100m'] = None
         
-    df_qld_pj_clean = df_qld_pj[MASTER_COLS_PJ].copy()
+    df_qld_pj_clean = ensure_columns(df_qld_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_qld_pj_clean.to_csv('df_qld_pj_clean.csv', index=False)
     return df_qld_pj_clean
 
@@ -254,16 +260,13 @@ def clean_qld_triples(df: pd.DataFrame) -> pd.DataFrame:
     df_qld_triples['state'] = 'QLD'
 
     # Handle duplicate track columns properly
-    # QLD has both 'venue' (corrupted) and 'track' (correct) columns
-    if 'venue' in df_qld_triples.columns and 'track' in df_qld_triples.columns:
-        # Drop the corrupted 'venue' column and keep the correct 'track' column
+    # QLD has both 'venue' (corrupted) and 'track' (correct) columns, so venue is only
+    # used for rows without a track (files that only have venue)
+    df_qld_triples['track'] = first_present(df_qld_triples, ['track', 'venue'])
+    if 'venue' in df_qld_triples.columns:
         df_qld_triples = df_qld_triples.drop(columns=['venue'])
-    elif 'venue' in df_qld_triples.columns and 'track' not in df_qld_triples.columns:
-        # If only venue exists, rename it (though this shouldn't happen based on current data)
-        update_cols_qld = {'venue': 'track'}
-        df_qld_triples.rename(columns=update_cols_qld, inplace=True)
 
-    df_qld_triples_clean = df_qld_triples[MASTER_COLS_TRIPLES].copy()
+    df_qld_triples_clean = ensure_columns(df_qld_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_qld_triples_clean.to_csv('df_qld_triples_clean.csv', index=False)
     return df_qld_triples_clean
 
@@ -276,6 +279,7 @@ def clean_sa_pj(df: pd.DataFrame) -> pd.DataFrame:
 
     df_sa_pj = df.copy()
     df_sa_pj.to_csv('df_sa_pj.csv', index=False)
+    df_sa_pj = ensure_columns(df_sa_pj, ['width_800m_position', 'width_400m_position', 'third_quarter', 'fourth_quarter'])
     df_sa_pj['width_800m'] = df_sa_pj['width_800m_position']
     df_sa_pj['width_400m'] = df_sa_pj['width_400m_position']
 
@@ -290,7 +294,7 @@ def clean_sa_pj(df: pd.DataFrame) -> pd.DataFrame:
     if 'first_100m' not in df_sa_pj.columns:
         df_sa_pj['first_100m'] = None
         
-    df_sa_pj_clean = df_sa_pj[MASTER_COLS_PJ].copy()
+    df_sa_pj_clean = ensure_columns(df_sa_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_sa_pj_clean.to_csv('df_sa_pj_clean.csv', index=False)
     return df_sa_pj_clean
 
@@ -304,15 +308,12 @@ def clean_tas_pj(df: pd.DataFrame) -> pd.DataFrame:
     df_tas_pj = df.copy()
     df_tas_pj.to_csv('df_tas_pj.csv', index=False)
 
-    # Handle potential duplicate track columns in TAS data
-    if 'venue' in df_tas_pj.columns and 'track' in df_tas_pj.columns:
-        # If both exist, drop venue and keep track
+    # Handle potential duplicate track columns in TAS data, track first and venue for rows without one
+    df_tas_pj['track'] = first_present(df_tas_pj, ['track', 'venue'])
+    if 'venue' in df_tas_pj.columns:
         df_tas_pj = df_tas_pj.drop(columns=['venue'])
-    elif 'venue' in df_tas_pj.columns:
-        # If only venue exists, rename it to track
-        tassy_col_mapping = {'venue': 'track'}
-        df_tas_pj.rename(columns=tassy_col_mapping, inplace=True)
 
+    df_tas_pj = ensure_columns(df_tas_pj, ['time_800m', 'time_400m'])
     df_tas_pj['time_800m'] = df_tas_pj['time_800m'].apply(lambda x: str(x).replace('s', ''))
     df_tas_pj['time_400m'] = df_tas_pj['time_400m'].apply(lambda x: str(x).replace('s', ''))
     
@@ -322,7 +323,7 @@ def clean_tas_pj(df: pd.DataFrame) -> pd.DataFrame:
         df_tas_pj['first_100m'] = None
     df_tas_pj['first_100m'] = df_tas_pj['first_100m'].apply(lambda x: str(x).replace('s', ''))
 
-    df_tas_pj_clean = df_tas_pj[MASTER_COLS_PJ].copy()
+    df_tas_pj_clean = ensure_columns(df_tas_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_tas_pj_clean.to_csv('df_tas_pj_clean.csv', index=False)
     return df_tas_pj_clean
 
@@ -354,7 +355,7 @@ def clean_wa_pj(df: pd.DataFrame) -> pd.DataFrame:
     if 'first_100m' not in df_wa_pj.columns:
         df_wa_pj['first_100m'] = None
 
-    df_wa_pj_clean = df_wa_pj[MASTER_COLS_PJ].copy()
+    df_wa_pj_clean = ensure_columns(df_wa_pj, MASTER_COLS_PJ)[MASTER_COLS_PJ].copy()
     df_wa_pj_clean.to_csv('df_wa_pj_clean.csv', index=False)
     return df_wa_pj_clean
 
@@ -368,7 +369,7 @@ def clean_sa_triples(df: pd.DataFrame) -> pd.DataFrame:
     df_sa_triples = df.copy()
     df_sa_triples.to_csv('df_sa_triples.csv', index=False)
     df_sa_triples['state'] = 'SA'
-    df_sa_triples_clean = df_sa_triples[MASTER_COLS_TRIPLES].copy()
+    df_sa_triples_clean = ensure_columns(df_sa_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_sa_triples_clean.to_csv('df_sa_triples_clean.csv', index=False)
     return df_sa_triples_clean
 
@@ -382,11 +383,9 @@ def clean_tas_triples(df: pd.DataFrame) -> pd.DataFrame:
     df_tas_triples = df.copy()
     df_tas_triples.to_csv('df_tas_triples.csv', index=False)
     df_tas_triples['state'] = 'TAS'
-    tas_col_mapping = {
-        'venue': 'track'
-    }
-    df_tas_triples.rename(columns=tas_col_mapping, inplace=True)
-    df_tas_triples_clean = df_tas_triples[MASTER_COLS_TRIPLES].copy()
+    # venue is the track column of TAS TripleS files
+    df_tas_triples['track'] = first_present(df_tas_triples, ['venue', 'track'])
+    df_tas_triples_clean = ensure_columns(df_tas_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_tas_triples_clean.to_csv('df_tas_triples_clean.csv', index=False)
     return df_tas_triples_clean
 
@@ -400,7 +399,7 @@ def clean_wa_triples(df: pd.DataFrame) -> pd.DataFrame:
     df_wa_triples = df.copy()
     df_wa_triples.to_csv('df_wa_triples.csv', index=False)
     df_wa_triples['state'] = 'WA'
-    df_wa_triples_clean = df_wa_triples[MASTER_COLS_TRIPLES].copy()
+    df_wa_triples_clean = ensure_columns(df_wa_triples, MASTER_COLS_TRIPLES)[MASTER_COLS_TRIPLES].copy()
     df_wa_triples_clean.to_csv('df_wa_triples_clean.csv', index=False)
     return df_wa_triples_clean
 
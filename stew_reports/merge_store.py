@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Incremental store behind MetaProcessor.merge_all_formats.
+
+The store keeps:
+- a manifest of every merged source CSV (path, state, format, mtime, size, sha256, rows, dates)
+- the format-merged rows of each source CSV in a Parquet dataset partitioned by
+  state/format/year-month (sectionals/state=qld/format=pj/month=2024-05/<source>.parquet)
+- the master-merged PJ + TripleS rows partitioned by state/year-month, one file per race date
+  (final/state=qld/month=2024-05/2024-05-18.parquet)
+
+Every file is written with the explicit schema of its dataset, so reads need no type inference.
+Reads prune partitions by path and push the date filter down to the Parquet row groups.
+
+A run only loads new or changed CSVs, replaces their rows and re-runs the master merge for
+the race dates they touch (master_merge_pjs_and_triples joins on date, so other dates are
+unaffected). A change to format_cleaners.py changes the store version and the next run
+rebuilds the store from scratch.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = ds = pq = None
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the store changes; combined with the format_cleaners.py hash
+STORE_LAYOUT_VERSION = 2
+
+# Partition for rows whose date could not be parsed (they still join each other in the master merge)
+UNDATED = 'undated'
+
+# State partition of final rows without a state, read along with any requested states
+UNKNOWN_STATE = 'unknown'
+
+# ------------------------------------------------------------------
+# Schemas ('string' or 'float' per column, in file order)
+# ------------------------------------------------------------------
+
+PJ_SCHEMA = {
+    'state_pj': 'string', 'date': 'string', 'track': 'string',
+    'race_number': 'float', 'tab_number': 'float', 'horse_name': 'string',
+    'time_800m': 'float', 'width_800m': 'float',
+    'time_400m': 'float', 'width_400m': 'float',
+    'first_100m': 'float',
+}
+
+TRIPLES_SCHEMA = {
+    'state': 'string', 'date': 'string', 'track': 'string',
+    'race_number': 'float', 'tab_number': 'float', 'horse_name': 'string',
+    'lead_time_value': 'float', 'quarter_1_time': 'float', 'quarter_2_time': 'float',
+    'quarter_3_time': 'float', 'quarter_4_time': 'float',
+    'distance_travelled': 'string', 'top_speed': 'float',
+    'first_50m': 'float', 'first_100m': 'float', 'first_200m': 'float',
+    'time_400m': 'float', 'time_800m': 'float', 'time_1200m': 'float', 'time_1600m': 'float',
+}
+
+FINAL_SCHEMA = {
+    'state': 'string', 'date': 'string', 'track': 'string',
+    'race_number': 'float', 'tab_number': 'float', 'horse_name': 'string',
+    'lead_time_value': 'float', 'distance_travelled': 'float', 'top_speed': 'float',
+    'first_50m': 'float', 'first_100m': 'float', 'first_200m': 'float',
+    'time_400m': 'float', 'time_800m': 'float', 'time_1200m': 'float', 'time_1600m': 'float',
+    'width_800m_pj': 'float', 'width_400m_pj': 'float',
+}
+
+FORMAT_SCHEMAS = {'pj': PJ_SCHEMA, 'triples': TRIPLES_SCHEMA}
+
+
+def conform(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Columns of the schema, in order and typed: floats via to_numeric (unparseable values
+    become NaN), strings as str with None for missing values. Missing columns are all null.
+    """
+    out = {}
+    for col, kind in schema.items():
+        values = df[col] if col in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+        if kind == 'float':
+            out[col] = pd.to_numeric(values, errors='coerce').astype('float64')
+        else:
+            out[col] = values.astype(object).where(values.notna(), None).map(lambda x: x if x is None else str(x))
+    return pd.DataFrame(out, index=df.index)
+
+
+def arrow_schema(schema: Dict[str, str]):
+    return pa.schema([(col, pa.float64() if kind == 'float' else pa.string()) for col, kind in schema.items()])
+
+
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def date_key(value) -> str:
+    """Partition name of a merged row's date"""
+    return UNDATED if pd.isna(value) else str(value)
+
+
+def month_key(date: str) -> str:
+    """year-month partition of a date key"""
+    return UNDATED if date == UNDATED else date[:7]
+
+
+def store_version(cleaners_file: Path) -> str:
+    """Store layout version plus the hash of the cleaning code that produced the rows"""
+    return f"{STORE_LAYOUT_VERSION}-{file_sha256(cleaners_file)[:16]}"
+
+
+def date_filter(dates: Iterable[str]):
+    """Row filter on the date column, pushed down to the Parquet row group statistics"""
+    dates = set(dates)
+    dated = sorted(d for d in dates if d != UNDATED)
+    # isin([]) is rejected by arrow (no value type), so each part is only built when it has something to match
+    exprs = ([ds.field('date').isin(dated)] if dated else []) + ([ds.field('date').is_null()] if UNDATED in dates else [])
+    if not exprs:
+        return ds.scalar(False)
+    return exprs[0] | exprs[1] if len(exprs) == 2 else exprs[0]
+
+
+class MergeStore:
+    """Manifest, per-source format rows and per-date final rows on disk"""
+
+    def __init__(self, store_dir: Path, version: str):
+        """
+        Args:
+            store_dir: Directory of the store (merged/store)
+            version: Version of the cleaning code, a different value invalidates the store
+        """
+        if not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow not installed. Please run: pip install pyarrow")
+        self.store_dir = Path(store_dir)
+        self.version = version
+        self.manifest_path = self.store_dir / 'merge_manifest.csv'
+        self.info_path = self.store_dir / 'store_info.json'
+        self.sectionals_dir = self.store_dir / 'sectionals'
+        self.final_dir = self.store_dir / 'final'
+        self.manifest_cols = ['path', 'state', 'format', 'mtime', 'size', 'sha256', 'rows', 'dates', 'merged_at']
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.info = self._load_info()
+
+    # ------------------------------------------------------------------
+    # Store metadata
+    # ------------------------------------------------------------------
+
+    def _load_info(self) -> Dict:
+        if not self.info_path.exists():
+            return {'version': self.version}
+        with open(self.info_path) as f:
+            return json.load(f)
+
+    def _save_info(self):
+        with open(self.info_path, 'w') as f:
+            json.dump(self.info, f, indent=2)
+
+    def is_current(self) -> bool:
+        return self.info.get('version') == self.version
+
+    def clear(self):
+        """Drop every stored row and the manifest"""
+        for child in self.store_dir.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+        self.info = {'version': self.version}
+        self._save_info()
+        logger.info(f"Cleared merge store {self.store_dir}")
+
+    def pending_dates(self) -> set:
+        """Dates whose final rows are stale because the last final merge failed"""
+        return set(self.info.get('pending_dates', []))
+
+    def set_pending_dates(self, dates: set):
+        self.info['pending_dates'] = sorted(dates)
+        self._save_info()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def load_manifest(self) -> pd.DataFrame:
+        if not self.manifest_path.exists():
+            return pd.DataFrame(columns=self.manifest_cols).set_index('path')
+        manifest = pd.read_csv(self.manifest_path, dtype={'path': str, 'sha256': str, 'dates': str})
+        manifest['dates'] = manifest['dates'].fillna('')
+        return manifest.set_index('path')
+
+    def save_manifest(self, manifest: pd.DataFrame):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        manifest.reset_index()[self.manifest_cols].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def classify_sources(self, sources: List[Tuple[str, str, Path]], states: List[str],
+                         manifest: pd.DataFrame) -> Tuple[List[Dict], List[str], int]:
+        """
+        Compare the current source CSVs of the given states with the manifest
+
+        A file whose size and mtime match its manifest entry is not read. Otherwise it is
+        hashed and only counts as changed if the content differs (a touched file just gets
+        its mtime updated in the manifest).
+
+        Args:
+            sources: (state, format, path) of every CSV that would be merged today
+            states: States being merged; manifest entries of other states are left alone
+            manifest: Current manifest, updated in place for touched but unchanged files
+
+        Returns:
+            (new or changed sources with their stats, removed manifest paths, unchanged count)
+        """
+        changed, unchanged, seen = [], 0, set()
+        for state, format_type, path in sources:
+            key = str(path)
+            seen.add(key)
+            stat = path.stat()
+            if key in manifest.index:
+                entry = manifest.loc[key]
+                if int(entry['size']) == stat.st_size and float(entry['mtime']) == stat.st_mtime:
+                    unchanged += 1
+                    continue
+                sha256 = file_sha256(path)
+                if sha256 == entry['sha256'] and entry['format'] == format_type:
+                    manifest.loc[key, ['mtime', 'size']] = [stat.st_mtime, stat.st_size]
+                    unchanged += 1
+                    continue
+            else:
+                sha256 = file_sha256(path)
+            changed.append({'path': key, 'state': state, 'format': format_type,
+                            'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': sha256})
+
+        removed = [key for key in manifest.index
+                   if manifest.loc[key, 'state'] in states and key not in seen]
+        return changed, removed, unchanged
+
+    @staticmethod
+    def manifest_dates(manifest: pd.DataFrame, paths: List[str]) -> set:
+        dates = set()
+        for key in paths:
+            if key in manifest.index and manifest.loc[key, 'dates']:
+                dates.update(manifest.loc[key, 'dates'].split(';'))
+        return dates
+
+    # ------------------------------------------------------------------
+    # Format-merged rows per source (sectionals dataset)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _source_name(key: str) -> str:
+        # the same file name can exist in the processed and legacy data directories
+        return f"{Path(key).stem}_{hashlib.sha1(key.encode()).hexdigest()[:12]}.parquet"
+
+    def put_source(self, state: str, format_type: str, key: str, rows: pd.DataFrame):
+        """Replace the rows of a source CSV, one file per year-month partition they fall in"""
+        self.drop_source(state, format_type, key)
+        rows = conform(rows, FORMAT_SCHEMAS[format_type])
+        for month, month_rows in rows.groupby(rows['date'].map(date_key).map(month_key), sort=False):
+            path = self.sectionals_dir / f"state={state}" / f"format={format_type}" / f"month={month}" / self._source_name(key)
+            _write_parquet(path, month_rows.sort_values('date'), FORMAT_SCHEMAS[format_type])
+
+    def drop_source(self, state: str, format_type: str, key: str):
+        for path in self.sectionals_dir.glob(f"state={state}/format={format_type}/month=*/{self._source_name(key)}"):
+            path.unlink()
+
+    def read_sectionals(self, format_type: str, states: Optional[List[str]] = None,
+                        dates: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Format-merged rows of one format, optionally only some states and race dates
+
+        Args:
+            format_type: 'pj' or 'triples'
+            states: State codes to read (partition pruning, default: all)
+            dates: Date keys to read (month pruning plus a pushed-down date filter, default: all)
+        """
+        dates = set(dates) if dates is not None else None
+        files = self._partition_files(self.sectionals_dir, states, dates, f"format={format_type}/")
+        return _read_parquet(files, FORMAT_SCHEMAS[format_type], date_filter(dates) if dates is not None else None)
+
+    # ------------------------------------------------------------------
+    # Master-merged rows per date (final dataset)
+    # ------------------------------------------------------------------
+
+    def put_final(self, date: str, rows: pd.DataFrame):
+        """Replace the master-merged rows of one race date"""
+        self.drop_final(date)
+        rows = conform(rows, FINAL_SCHEMA)
+        state_keys = rows['state'].fillna(UNKNOWN_STATE).str.lower()
+        for state, state_rows in rows.groupby(state_keys, sort=False):
+            path = self.final_dir / f"state={state}" / f"month={month_key(date)}" / f"{date}.parquet"
+            _write_parquet(path, state_rows, FINAL_SCHEMA)
+
+    def drop_final(self, date: str):
+        for path in self.final_dir.glob(f"state=*/month={month_key(date)}/{date}.parquet"):
+            path.unlink()
+
+    def has_final(self) -> bool:
+        return self.final_dir.exists() and any(self.final_dir.glob('state=*/month=*/*.parquet'))
+
+    def load_final(self, states: Optional[List[str]] = None, dates: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Master-merged rows sorted by date, optionally only some states and race dates
+
+        Rows the master merge left without a state are always returned, as the single
+        final_merged_data.csv this store replaces returned every row whatever states were asked for.
+
+        Args:
+            states: State codes to read (partition pruning, default: all)
+            dates: Date keys to read (month pruning plus a pushed-down date filter, default: all)
+        """
+        dates = set(dates) if dates is not None else None
+        if states:
+            states = list(states) + [UNKNOWN_STATE]
+        files = self._partition_files(self.final_dir, states, dates)
+        df = _read_parquet(files, FINAL_SCHEMA, date_filter(dates) if dates is not None else None)
+        return df.sort_values('date', kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _partition_files(root: Path, states: Optional[List[str]], dates: Optional[set], middle: str = '') -> List[Path]:
+        """Parquet files of the state and month partitions that can hold the requested rows"""
+        state_globs = [f"state={s.lower()}" for s in states] if states else ['state=*']
+        month_globs = sorted({f"month={month_key(d)}" for d in dates}) if dates is not None else ['month=*']
+        files = []
+        for state_glob in state_globs:
+            for month_glob in month_globs:
+                files.extend(sorted(root.glob(f"{state_glob}/{middle}{month_glob}/*.parquet")))
+        return files
+
+
+def _write_parquet(path: Path, df: pd.DataFrame, schema: Dict[str, str]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    pq.write_table(pa.Table.from_pandas(df, schema=arrow_schema(schema), preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_parquet(files: List[Path], schema: Dict[str, str], row_filter=None) -> pd.DataFrame:
+    if not files:
+        return conform(pd.DataFrame(), schema)
+    dataset = ds.dataset([str(f) for f in files], schema=arrow_schema(schema), format='parquet')
+    return dataset.to_table(filter=row_filter).to_pandas()
@@ -65,6 +65,7 @@ try:
         merge_all_triples_states,
         master_merge_pjs_and_triples
     )
+    from merge_store import MergeStore, PARQUET_AVAILABLE, FINAL_SCHEMA, conform, date_key, store_version
     CLEANERS_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Could not import format_cleaners: {e}")
@@ -237,13 +238,14 @@ class MetaProcessor:
         self.logger.info(f"Scraping completed for {state}: {aggregate_results['total_found']} files found across {len(aggregate_results['dates_processed'])} dates")
         return aggregate_results
     
-    def process_state_pdfs(self, state: str, session_files: List[str] = None) -> Dict:
+    def process_state_pdfs(self, state: str, session_files: List[str] = None, workers: int = 1) -> Dict:
         """
         Process PDFs for a specific state using the enhanced StateProcessor
 
         Args:
             state: State code
             session_files: Optional list of specific files to process (from current scraping session)
+            workers: Number of PDF extraction processes (default: 1, serial)
 
         Returns:
             Dictionary with processing results including format breakdown
@@ -331,7 +333,8 @@ class MetaProcessor:
                 state=state,
                 input_dir=str(actual_processing_dir),  # Use the actual (possibly temp) directory
                 output_dir=str(state_processed_dir),
-                logger=self.logger
+                logger=self.logger,
+                workers=workers
             )
 
             # Clean up temp directory if we created one
@@ -383,15 +386,137 @@ class MetaProcessor:
 
         return results
 
-    def merge_all_formats(self, states: List[str], chunk_size: int = None) -> Dict:
+    def _merge_source_files(self, state: str, format_type: str) -> List[Path]:
         """
-        New merging workflow:
-        1. Load raw CSVs for each state/format
-        2. Pass state CSVs to merge_all_pj_states and merge_all_triples_states
-        3. Pass the two merged dataframes to master_merge_pjs_and_triples
+        Processed CSVs that make up a state's data in one format
+
+        Args:
+            state: State code
+            format_type: 'pj' or 'triples'
+
+        Returns:
+            CSV paths, empty if the state has no processed directory
+        """
+        state_processed_dir = self.processed_dir / state
+        if not state_processed_dir.exists():
+            return []
+
+        # Standard location for most states (recent processing)
+        csv_files = []
+        format_dir = state_processed_dir / format_type
+        if format_dir.exists():
+            csv_files.extend(list(format_dir.glob("*.csv")))
+
+        # Special handling for states with historical data issues
+        if state == 'sa' and not csv_files:
+            # Only use alternative location if no recent data
+            alt_dir = self.data_dir / 'processed' / state / format_type
+            if alt_dir.exists():
+                csv_files.extend(list(alt_dir.glob("*.csv")))
+
+        if state == 'wa' and format_type == 'pj' and not csv_files:
+            # Only check WA root directory if no pj folder data
+            wa_files = list(state_processed_dir.glob("*.csv"))
+            csv_files.extend([f for f in wa_files if 'WA_' in f.name])
+
+        return sorted(csv_files)
+
+    def _read_merge_source(self, csv_file: Path) -> pd.DataFrame:
+        """Read one processed CSV for merging"""
+        try:
+            df = pd.read_csv(csv_file, low_memory=False)
+        except Exception:
+            # Fallback to python engine for problematic files
+            df = pd.read_csv(csv_file, engine='python')
+        df['source_file'] = csv_file.name
+        return df
+
+    def _merge_store(self) -> MergeStore:
+        return MergeStore(self.merged_dir / "store", store_version(Path(__file__).parent / "format_cleaners.py"))
+
+    def _merge_format_batch(self, format_type: str, sources: List[Dict]) -> Dict[str, pd.DataFrame]:
+        """
+        Read a batch of source CSVs and run them through the format-level merge
+
+        Every row gets a unique index so the merged rows can be split back by source file.
+        The cleaners in format_cleaners.py resolve column fallbacks per row and add the columns
+        a file lacks as empty, so a file's rows don't depend on which files share its batch.
+        Rows differ from a full-history merge only in column dtypes: a column that is empty in
+        the batch is kept as text (see below) and conform() casts it when the store is written.
+
+        Args:
+            format_type: 'pj' or 'triples'
+            sources: Manifest entries (path, state) of the files to merge
+
+        Returns:
+            Format-merged rows per source path (files without surviving rows map to empty frames)
+        """
+        state_dfs, row_sources, next_row = {}, [], 0
+        interval = getattr(self, 'progress_interval', 10)
+        label = 'PJ' if format_type == 'pj' else 'TripleS'
+
+        for i, source in enumerate(sources, 1):
+            csv_file = Path(source['path'])
+            if i % interval == 0 or i == len(sources):
+                self.logger.info(f"  Loading {label} file {i}/{len(sources)}: {csv_file.name}")
+
+            # Memory check during processing
+            if hasattr(self, 'memory_limit') and i % (interval * 2) == 0:
+                current_memory = psutil.virtual_memory().percent
+                if current_memory > self.memory_limit:
+                    self.logger.warning(f"Memory usage {current_memory:.1f}% exceeds limit {self.memory_limit}%")
+                    self.logger.info("Forcing garbage collection...")
+                    gc.collect()
+
+            df = self._read_merge_source(csv_file)
+            df.index = pd.RangeIndex(next_row, next_row + len(df))
+            next_row += len(df)
+            row_sources.extend([source['path']] * len(df))
+            state_dfs.setdefault(source['state'], []).append(df)
+
+        frames = {}
+        for state, dfs in state_dfs.items():
+            df = pd.concat(dfs, copy=False)
+            # Columns that are empty in this batch but filled elsewhere in the history stay text
+            empty_cols = [col for col in df.columns if df[col].isna().all()]
+            frames[state] = df.astype({col: object for col in empty_cols}) if empty_cols else df
+
+        merged = {source['path']: pd.DataFrame() for source in sources}
+        if not next_row:
+            return merged
+
+        if format_type == 'pj':
+            merged_df = merge_all_pj_states(*[frames.get(s, pd.DataFrame()) for s in ['vic', 'qld', 'sa', 'tas', 'nsw', 'wa']])
+        else:
+            merged_df = merge_all_triples_states(*[frames.get(s, pd.DataFrame()) for s in ['nsw', 'vic', 'qld', 'sa', 'tas', 'wa']])
+
+        row_sources = pd.Series(row_sources)
+        for path, rows in merged_df.groupby(row_sources.loc[merged_df.index].values, sort=False):
+            merged[path] = rows.reset_index(drop=True)
+        return merged
+
+    def merge_all_formats(self, states: List[str], chunk_size: int = None, rebuild: bool = False) -> Dict:
+        """
+        Incremental merging workflow:
+        1. Compare the processed CSVs of each state/format with the merge manifest
+        2. Pass only new or changed CSVs to merge_all_pj_states and merge_all_triples_states
+           and replace their rows in the merge store (rows of removed CSVs are dropped)
+        3. Re-run master_merge_pjs_and_triples for the race dates those files touch
+
+        The manifest (merged/store/merge_manifest.csv) records path, mtime, size, sha256, row
+        count and race dates of every merged CSV, so a daily run scales with the new files
+        rather than the full history. Format-level and final rows are kept in Parquet datasets
+        partitioned by state/format/year-month (see merge_store.py). Editing format_cleaners.py
+        rebuilds the store.
+
+        final_merged_data.csv and all_states_{pj,triples}_merged.csv are no longer written
+        on every run, call export_merged_csvs() (--export-merged-csv) for tools that still read
+        them. consolidate_data only falls back to them while the store has no final rows.
 
         Args:
             states: List of state codes
+            chunk_size: Merge new/changed files in batches of this many files (default: all at once)
+            rebuild: Drop the store and merge every CSV again
 
         Returns:
             Dictionary with merging results
@@ -402,238 +527,163 @@ class MetaProcessor:
             self.logger.error("Format cleaners not available. Please ensure format_cleaners.py is properly imported.")
             return {'success': False, 'error': 'Format cleaners not available'}
 
+        if not PARQUET_AVAILABLE:
+            self.logger.error("pyarrow not available. Please run: pip install pyarrow")
+            return {'success': False, 'error': 'pyarrow not available'}
+
         results = {
             'success': True,
             'loaded_states': {},
+            'files': {'new': 0, 'changed': 0, 'removed': 0, 'unchanged': 0},
             'format_merged': {'pj': False, 'triples': False},
             'final_merged': False,
+            'dates_merged': 0,
             'errors': []
         }
 
-        # Step 1: Load all state/format CSVs into dictionaries
-        state_pj_dfs = {}
-        state_triples_dfs = {}
+        store = self._merge_store()
+        if rebuild or not store.is_current():
+            self.logger.info("Rebuilding merge store" if rebuild else "Format cleaners changed since the last merge, rebuilding merge store")
+            store.clear()
+        manifest = store.load_manifest()
 
+        # Step 1: Find new, changed and removed CSVs
+        sources = []
         for state in states:
-            state_processed_dir = self.processed_dir / state
-            if not state_processed_dir.exists():
+            if not (self.processed_dir / state).exists():
                 self.logger.warning(f"No processed directory for {state}")
                 continue
-
             results['loaded_states'][state] = {'pj': 0, 'triples': 0}
+            for format_type in ['pj', 'triples']:
+                sources.extend((state, format_type, csv_file) for csv_file in self._merge_source_files(state, format_type))
+
+        changed, removed, unchanged = store.classify_sources(sources, states, manifest)
+        results['files']['new'] = sum(1 for source in changed if source['path'] not in manifest.index)
+        results['files']['changed'] = len(changed) - results['files']['new']
+        results['files']['removed'] = len(removed)
+        results['files']['unchanged'] = unchanged
+        self.logger.info(f"Merge manifest: {results['files']['new']} new, {results['files']['changed']} changed, "
+                         f"{len(removed)} removed, {unchanged} unchanged files")
+
+        # Dates whose final rows must be rebuilt: those of the old rows of changed and removed
+        # files, the dates of their new rows (added below) and any left over by a failed run
+        affected_dates = store.manifest_dates(manifest, [source['path'] for source in changed] + removed)
+        affected_dates.update(store.pending_dates())
+
+        for path in removed:
+            store.drop_source(manifest.loc[path, 'state'], manifest.loc[path, 'format'], path)
+        manifest = manifest.drop(index=removed)
+
+        # Step 2: Format-level merge of the new and changed files only
+        for format_type in ['pj', 'triples']:
+            format_sources = [source for source in changed if source['format'] == format_type]
+            if not format_sources:
+                continue
+            label = 'PJ' if format_type == 'pj' else 'TripleS'
+            batch_size = chunk_size or len(format_sources)
 
-            # Load PJ format CSVs - state-specific directory handling
-            csv_files = []
-
-            # Standard location for most states (recent processing)
-            pj_dir = state_processed_dir / 'pj'
-            if pj_dir.exists():
-                csv_files.extend(list(pj_dir.glob("*.csv")))
-
-            # Special handling for states with historical data issues
-            if state == 'sa' and not csv_files:
-                # Only use alternative location if no recent data
-                alt_pj_dir = self.data_dir / 'processed' / state / 'pj'
-                if alt_pj_dir.exists():
-                    csv_files.extend(list(alt_pj_dir.glob("*.csv")))
-
-            if state == 'wa' and not csv_files:
-                # Only check WA root directory if no pj folder data
-                if state_processed_dir.exists():
-                    wa_files = list(state_processed_dir.glob("*.csv"))
-                    csv_files.extend([f for f in wa_files if 'WA_' in f.name])
-
-            if csv_files:
-                    state_pj_list = []
-                    total_files = len(csv_files)
-                    self.logger.info(f"Loading {total_files} PJ files for {state.upper()}")
-
-                    for i, csv_file in enumerate(csv_files, 1):
-                        try:
-                            # Progress logging for large datasets
-                            interval = getattr(self, 'progress_interval', 10)
-                            if i % interval == 0 or i == total_files:
-                                self.logger.info(f"  Loading {state} PJ file {i}/{total_files}: {csv_file.name}")
-
-                            # Memory check during processing
-                            if hasattr(self, 'memory_limit') and i % (interval * 2) == 0:
-                                current_memory = psutil.virtual_memory().percent
-                                if current_memory > self.memory_limit:
-                                    self.logger.warning(f"Memory usage {current_memory:.1f}% exceeds limit {self.memory_limit}%")
-                                    self.logger.info("Forcing garbage collection...")
-                                    gc.collect()
-
-                            # Optimized CSV reading with low memory usage
-                            try:
-                                df = pd.read_csv(csv_file, low_memory=False)
-                            except Exception:
-                                # Fallback to python engine for problematic files
-                                df = pd.read_csv(csv_file, engine='python', low_memory=False)
-
-                            # Only add essential columns to reduce memory
-                            df['source_file'] = csv_file.name
-                            state_pj_list.append(df)
-                        except Exception as e:
-                            self.logger.error(f"Error reading {csv_file}: {e}")
-
-                    if state_pj_list:
-                        # Efficient concatenation with memory optimization
-                        self.logger.info(f"Concatenating {len(state_pj_list)} dataframes for {state} PJ data...")
-                        state_pj_dfs[state] = pd.concat(state_pj_list, ignore_index=True, copy=False)
-
-                        # Clear the list to free memory
-                        del state_pj_list
-
-                        results['loaded_states'][state]['pj'] = len(state_pj_dfs[state])
-                        self.logger.info(f"✓ Loaded {state} PJ data: {len(state_pj_dfs[state])} rows from {total_files} files")
-
-            # Load TripleS format CSVs - state-specific directory handling (same as PJ)
-            csv_files = []
-
-            # Standard location for most states (recent processing)
-            triples_dir = state_processed_dir / 'triples'
-            if triples_dir.exists():
-                csv_files.extend(list(triples_dir.glob("*.csv")))
-
-            # Special handling for states with historical data issues
-            if state == 'sa' and not csv_files:
-                # Only use alternative location if no recent data
-                alt_triples_dir = self.data_dir / 'processed' / state / 'triples'
-                if alt_triples_dir.exists():
-                    csv_files.extend(list(alt_triples_dir.glob("*.csv")))
-
-            if csv_files:
-                    state_triples_list = []
-                    total_files = len(csv_files)
-                    self.logger.info(f"Loading {total_files} TripleS files for {state.upper()}")
-
-                    for i, csv_file in enumerate(csv_files, 1):
-                        try:
-                            # Progress logging for large datasets
-                            interval = getattr(self, 'progress_interval', 10)
-                            if i % interval == 0 or i == total_files:
-                                self.logger.info(f"  Loading {state} TripleS file {i}/{total_files}: {csv_file.name}")
-
-                            # Optimized CSV reading
-                            try:
-                                df = pd.read_csv(csv_file, low_memory=False)
-                            except Exception:
-                                df = pd.read_csv(csv_file, engine='python', low_memory=False)
-
-                            df['source_file'] = csv_file.name
-                            state_triples_list.append(df)
-                        except Exception as e:
-                            self.logger.error(f"Error reading {csv_file}: {e}")
-
-                    if state_triples_list:
-                        # Efficient concatenation with memory optimization
-                        self.logger.info(f"Concatenating {len(state_triples_list)} dataframes for {state} TripleS data...")
-                        state_triples_dfs[state] = pd.concat(state_triples_list, ignore_index=True, copy=False)
-
-                        # Clear the list to free memory
-                        del state_triples_list
-
-                        results['loaded_states'][state]['triples'] = len(state_triples_dfs[state])
-                        self.logger.info(f"✓ Loaded {state} TripleS data: {len(state_triples_dfs[state])} rows from {total_files} files")
-
-        # Step 2: Call merge_all_pj_states with state dataframes
-        merged_pj_df = pd.DataFrame()
-        if state_pj_dfs:
-            try:
-                self.logger.info(f"Merging PJ data from {len(state_pj_dfs)} states")
-
-                # Prepare arguments in the order expected by merge_all_pj_states
-                df_vic_pj = state_pj_dfs.get('vic', pd.DataFrame())
-                df_qld_pj = state_pj_dfs.get('qld', pd.DataFrame())
-                df_sa_pj = state_pj_dfs.get('sa', pd.DataFrame())
-                df_tas_pj = state_pj_dfs.get('tas', pd.DataFrame())
-                df_nsw_pj = state_pj_dfs.get('nsw', pd.DataFrame())
-                df_wa_pj = state_pj_dfs.get('wa', pd.DataFrame())
-
-                # Memory monitoring
-                memory_before = psutil.virtual_memory().percent
-                self.logger.info(f"About to call merge_all_pj_states with: VIC={len(df_vic_pj)}, QLD={len(df_qld_pj)}, SA={len(df_sa_pj)}, TAS={len(df_tas_pj)}, NSW={len(df_nsw_pj)}, WA={len(df_wa_pj)}")
-                self.logger.info(f"Memory usage before merge: {memory_before:.1f}%")
-
-                # Force garbage collection before intensive operation
-                gc.collect()
-
-                start_time = datetime.now()
-                merged_pj_df = merge_all_pj_states(df_vic_pj, df_qld_pj, df_sa_pj, df_tas_pj, df_nsw_pj, df_wa_pj)
-                end_time = datetime.now()
-
-                memory_after = psutil.virtual_memory().percent
-                duration = end_time - start_time
-                self.logger.info(f"✓ merge_all_pj_states completed in {duration} - Memory: {memory_after:.1f}%")
-
-                # Clean up individual state dataframes to free memory
-                del df_vic_pj, df_qld_pj, df_sa_pj, df_tas_pj, df_nsw_pj, df_wa_pj
-                gc.collect()
-
-                # Save merged PJ data
-                pj_output = self.merged_dir / "all_states_pj_merged.csv"
-                merged_pj_df.to_csv(pj_output, index=False)
-                self.logger.info(f"Saved merged PJ data: {len(merged_pj_df)} rows")
-                results['format_merged']['pj'] = True
-            except Exception as e:
-                self.logger.error(f"Error merging PJ states: {e}")
-                results['errors'].append(str(e))
-
-        # Step 3: Call merge_all_triples_states with state dataframes
-        merged_triples_df = pd.DataFrame()
-        if state_triples_dfs:
-            try:
-                self.logger.info(f"Merging TripleS data from {len(state_triples_dfs)} states")
-
-                # Prepare arguments in the order expected by merge_all_triples_states
-                df_nsw_triples = state_triples_dfs.get('nsw', pd.DataFrame())
-                df_vic_triples = state_triples_dfs.get('vic', pd.DataFrame())
-                df_qld_triples = state_triples_dfs.get('qld', pd.DataFrame())
-                df_sa_triples = state_triples_dfs.get('sa', pd.DataFrame())
-                df_tas_triples = state_triples_dfs.get('tas', pd.DataFrame())
-                df_wa_triples = state_triples_dfs.get('wa', pd.DataFrame())
-
-                merged_triples_df = merge_all_triples_states(df_nsw_triples, df_vic_triples, df_qld_triples, df_sa_triples, df_tas_triples, df_wa_triples)
-
-                # Save merged TripleS data
-                triples_output = self.merged_dir / "all_states_triples_merged.csv"
-                merged_triples_df.to_csv(triples_output, index=False)
-                self.logger.info(f"Saved merged TripleS data: {len(merged_triples_df)} rows")
-                results['format_merged']['triples'] = True
-            except Exception as e:
-                self.logger.error(f"Error merging TripleS states: {e}")
-                results['errors'].append(str(e))
+            for start in range(0, len(format_sources), batch_size):
+                batch = format_sources[start:start + batch_size]
+                try:
+                    self.logger.info(f"Merging {len(batch)} {label} files")
+                    gc.collect()
+                    start_time = datetime.now()
+                    merged = self._merge_format_batch(format_type, batch)
+                    self.logger.info(f"✓ {label} batch merged in {datetime.now() - start_time} - Memory: {psutil.virtual_memory().percent:.1f}%")
+                except Exception as e:
+                    # left out of the manifest, so the next run retries these files
+                    self.logger.error(f"Error merging {label} states: {e}")
+                    results['errors'].append(str(e))
+                    continue
 
-        # Step 4: Final merge of both formats using master_merge_pjs_and_triples
-        if (not merged_pj_df.empty or not merged_triples_df.empty):
+                for source in batch:
+                    path, rows = source['path'], merged[source['path']]
+                    if path in manifest.index:
+                        store.drop_source(manifest.loc[path, 'state'], manifest.loc[path, 'format'], path)
+                    store.put_source(source['state'], format_type, path, rows)
+
+                    dates = sorted(set(rows['date'].map(date_key))) if not rows.empty else []
+                    affected_dates.update(dates)
+                    manifest.loc[path] = {**{k: source[k] for k in ['state', 'format', 'mtime', 'size', 'sha256']},
+                                          'rows': len(rows), 'dates': ';'.join(dates),
+                                          'merged_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+                    results['loaded_states'][source['state']][format_type] += len(rows)
+                results['format_merged'][format_type] = True
+
+        store.save_manifest(manifest)
+        store.set_pending_dates(affected_dates)
+
+        # Step 3: Final merge of both formats for the affected dates only
+        if affected_dates:
             try:
-                self.logger.info("Performing final merge of PJ and TripleS formats")
-                final_df = master_merge_pjs_and_triples(merged_pj_df, merged_triples_df)
-
-                # Save final merged data
-                final_output = self.merged_dir / "final_merged_data.csv"
-                final_df.to_csv(final_output, index=False)
-                self.logger.info(f"Saved final merged data: {len(final_df)} rows")
+                self.logger.info(f"Performing final merge of PJ and TripleS formats for {len(affected_dates)} dates")
+                merged_pj_df = store.read_sectionals('pj', dates=affected_dates)
+                merged_triples_df = store.read_sectionals('triples', dates=affected_dates)
+
+                written = set()
+                if not merged_pj_df.empty or not merged_triples_df.empty:
+                    final_df = master_merge_pjs_and_triples(merged_pj_df, merged_triples_df)
+                    for date, rows in final_df.groupby(final_df['date'].map(date_key), sort=False):
+                        store.put_final(date, rows.reset_index(drop=True))
+                        written.add(date)
+                    self.logger.info(f"Saved final merged data: {len(final_df)} rows over {len(written)} dates")
+                for date in affected_dates - written:
+                    store.drop_final(date)
+                store.set_pending_dates(set())
                 results['final_merged'] = True
+                results['dates_merged'] = len(affected_dates)
             except Exception as e:
                 self.logger.error(f"Error in final merge: {e}")
                 results['errors'].append(str(e))
+        else:
+            self.logger.info("No new or changed files, merged data is up to date")
 
         return results
 
-    def clean_and_merge_state_data(self, state: str) -> Dict:
+    def export_merged_csvs(self, states: Optional[List[str]] = None) -> Dict[str, Path]:
+        """
+        Write the merge store out as the CSVs the full merge used to write
+
+        Args:
+            states: Only export rows of these states (default: all states)
+
+        Returns:
+            Dictionary of the written files (pj, triples, final)
+        """
+        store = self._merge_store()
+        if not store.is_current():
+            self.logger.warning("Merge store is out of date, run merge_all_formats before exporting")
+            return {}
+
+        written = {}
+        exports = [('pj', "all_states_pj_merged.csv", lambda: store.read_sectionals('pj', states=states)),
+                   ('triples', "all_states_triples_merged.csv", lambda: store.read_sectionals('triples', states=states)),
+                   ('final', "final_merged_data.csv", lambda: store.load_final(states))]
+        for name, filename, load in exports:
+            df = load()
+            output_file = self.merged_dir / filename
+            df.to_csv(output_file, index=False)
+            written[name] = output_file
+            self.logger.info(f"Exported {len(df)} rows to {output_file}")
+        return written
+
+    def clean_and_merge_state_data(self, state: str, dates: Optional[List[str]] = None) -> Dict:
         """
         Clean format-specific data and merge for a single state
 
+        The cleaned rows come from the sectional Parquet dataset that merge_all_formats keeps
+        up to date, read with the state partition and date filter pushed down, rather than
+        from re-parsing the processed CSVs.
+
         Args:
             state: State code
+            dates: Only these race dates in YYYY-MM-DD format (default: all)
 
         Returns:
             Dictionary with cleaning and merging results
         """
         self.logger.info(f"Starting cleaning and merging for {state.upper()}")
 
-        state_processed_dir = self.processed_dir / state
         state_cleaned_dir = self.cleaned_dir / state
         state_cleaned_dir.mkdir(exist_ok=True)
 
@@ -644,97 +694,110 @@ class MetaProcessor:
             'errors': []
         }
 
-        # Process each format
+        if not self.cleaners_available or not PARQUET_AVAILABLE:
+            self.logger.error("Format cleaners or pyarrow not available, cannot read the sectional dataset")
+            results['success'] = False
+            return results
+
+        store = self._merge_store()
+        format_dfs = {}
         for format_type in ['pj', 'triples']:
-            format_dir = state_processed_dir / format_type
-            if not format_dir.exists():
-                self.logger.warning(f"No {format_type} directory for {state}")
+            try:
+                format_dfs[format_type] = store.read_sectionals(format_type, states=[state], dates=dates)
+            except Exception as e:
+                self.logger.error(f"Error reading {state} {format_type} sectionals: {e}")
+                results['errors'].append(str(e))
                 continue
 
-            csv_files = list(format_dir.glob("*.csv"))
-            if not csv_files:
-                self.logger.info(f"No {format_type} CSV files for {state}")
+            format_df = format_dfs[format_type]
+            if format_df.empty:
+                self.logger.info(f"No {format_type} rows for {state}")
                 continue
+            results['cleaned'][format_type] = len(format_df)
 
-            # Consolidate format-specific files
-            format_dfs = []
-            for csv_file in csv_files:
-                try:
-                    df = pd.read_csv(csv_file)
-                    df['source_file'] = csv_file.name
-                    df['format'] = format_type
-                    format_dfs.append(df)
-                except Exception as e:
-                    self.logger.error(f"Error reading {csv_file}: {e}")
-                    results['errors'].append(str(e))
+            # Save cleaned format-specific data
+            output_file = state_cleaned_dir / f"{state}_{format_type}_cleaned.csv"
+            format_df.to_csv(output_file, index=False)
+            self.logger.info(f"Saved {len(format_df)} rows to {output_file}")
 
-            if format_dfs:
-                # Combine all files for this format
-                format_df = pd.concat(format_dfs, ignore_index=True)
-
-                # Apply format-specific cleaning if available
-                cleaner = self.format_cleaners.get(state, {}).get(format_type)
-                if cleaner and callable(cleaner):
-                    try:
-                        self.logger.info(f"Applying {state} {format_type} cleaner")
-                        format_df = cleaner(format_df)
-                        results['cleaned'][format_type] = len(format_df)
-                    except Exception as e:
-                        self.logger.error(f"Error applying {state} {format_type} cleaner: {e}")
-                        results['errors'].append(str(e))
-                else:
-                    self.logger.info(f"No cleaner defined for {state} {format_type}, using raw data")
-                    results['cleaned'][format_type] = len(format_df)
-
-                # Save cleaned format-specific data
-                output_file = state_cleaned_dir / f"{state}_{format_type}_cleaned.csv"
-                format_df.to_csv(output_file, index=False)
-                self.logger.info(f"Saved {len(format_df)} rows to {output_file}")
-
-        # Merge formats for this state if merger is available
-        merger = self.state_mergers.get(state)
-        if merger and callable(merger):
+        # Merge formats for this state
+        if len(format_dfs) == 2 and (not format_dfs['pj'].empty or not format_dfs['triples'].empty):
             try:
-                pj_file = state_cleaned_dir / f"{state}_pj_cleaned.csv"
-                triples_file = state_cleaned_dir / f"{state}_triples_cleaned.csv"
-
-                pj_df = pd.read_csv(pj_file) if pj_file.exists() else pd.DataFrame()
-                triples_df = pd.read_csv(triples_file) if triples_file.exists() else pd.DataFrame()
-
-                if not pj_df.empty or not triples_df.empty:
-                    self.logger.info(f"Applying {state} merger")
-                    merged_df = merger(pj_df, triples_df)
-
-                    # Save merged state data
-                    merged_file = self.merged_dir / f"{state}_merged.csv"
-                    merged_df.to_csv(merged_file, index=False)
-                    self.logger.info(f"Saved merged {state} data: {len(merged_df)} rows")
-                    results['merged'] = True
+                self.logger.info(f"Merging {state} PJ and TripleS data")
+                merged_df = master_merge_pjs_and_triples(format_dfs['pj'], format_dfs['triples'])
+
+                # Save merged state data
+                merged_file = self.merged_dir / f"{state}_merged.csv"
+                merged_df.to_csv(merged_file, index=False)
+                self.logger.info(f"Saved merged {state} data: {len(merged_df)} rows")
+                results['merged'] = True
             except Exception as e:
                 self.logger.error(f"Error merging {state} data: {e}")
                 results['errors'].append(str(e))
-        else:
-            self.logger.info(f"No merger defined for {state}, keeping formats separate")
 
         return results
 
-    def consolidate_data(self, states: List[str]) -> pd.DataFrame:
+    @staticmethod
+    def _requested_dates(dates: Optional[List[str]] = None, days_back: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Race dates a run asked for in YYYY-MM-DD format, None when it asked for neither dates nor days_back
+
+        An explicitly empty dates list (no new race days) stays empty, only None means every date.
+
+        Args:
+            dates: Dates as strings, datetimes or a numpy array of either
+            days_back: Number of days to go back from today
+        """
+        if dates is not None:
+            return sorted({pd.Timestamp(date).strftime('%Y-%m-%d') for date in dates})
+        if days_back:
+            return [(datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days_back)]
+        return None
+
+    @staticmethod
+    def _select_rows(df: pd.DataFrame, states: List[str], dates: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows of the given states and (YYYY-MM-DD) dates in a merged DataFrame"""
+        state_col = 'state' if 'state' in df.columns else 'state_pj' if 'state_pj' in df.columns else None
+        if state_col and states:
+            # rows without a state are kept, the unfiltered CSVs used to return them too
+            df = df[df[state_col].isna() | df[state_col].astype(str).str.lower().isin([state.lower() for state in states])]
+        if dates is not None and 'date' in df.columns:
+            df = df[df['date'].astype(str).isin(dates)]
+        return df.reset_index(drop=True)
+
+    def consolidate_data(self, states: List[str], dates: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Consolidate all merged or cleaned data into a single DataFrame
 
         Args:
             states: List of state codes to consolidate
+            dates: Only return rows of these race dates in YYYY-MM-DD format (None: all dates, []: no rows)
 
         Returns:
             Consolidated DataFrame
         """
-        self.logger.info(f"Consolidating data for states: {states}")
+        self.logger.info(f"Consolidating data for states: {states}" + (f", {len(dates)} dates" if dates is not None else ""))
+        if dates is not None and len(dates) == 0:
+            self.logger.info("No race dates requested, nothing to consolidate")
+            return conform(pd.DataFrame(), FINAL_SCHEMA) if self.cleaners_available else pd.DataFrame()
+
+        # First check the incremental merge store (highest priority), only the
+        # requested state and month partitions are read
+        if self.cleaners_available and PARQUET_AVAILABLE:
+            store = self._merge_store()
+            if store.is_current() and store.has_final():
+                try:
+                    df = store.load_final(states, dates)
+                    self.logger.info(f"Loaded final merged data from merge store: {len(df)} rows")
+                    return df
+                except Exception as e:
+                    self.logger.error(f"Error reading merge store: {e}")
 
-        # First check for final merged file (highest priority)
+        # Then the final merged file written by earlier versions
         final_merged_file = self.merged_dir / "final_merged_data.csv"
         if final_merged_file.exists():
             try:
-                df = pd.read_csv(final_merged_file)
+                df = self._select_rows(pd.read_csv(final_merged_file), states, dates)
                 self.logger.info(f"Loaded final merged data: {len(df)} rows")
                 return df
             except Exception as e:
@@ -745,7 +808,7 @@ class MetaProcessor:
         pj_merged_file = self.merged_dir / "all_states_pj_merged.csv"
         if pj_merged_file.exists():
             try:
-                df = pd.read_csv(pj_merged_file)
+                df = self._select_rows(pd.read_csv(pj_merged_file), states, dates)
                 format_dfs.append(df)
                 self.logger.info(f"Loaded merged PJ data: {len(df)} rows")
             except Exception as e:
@@ -754,7 +817,7 @@ class MetaProcessor:
         triples_merged_file = self.merged_dir / "all_states_triples_merged.csv"
         if triples_merged_file.exists():
             try:
-                df = pd.read_csv(triples_merged_file)
+                df = self._select_rows(pd.read_csv(triples_merged_file), states, dates)
                 format_dfs.append(df)
                 self.logger.info(f"Loaded merged TripleS data: {len(df)} rows")
             except Exception as e:
@@ -765,7 +828,7 @@ class MetaProcessor:
             self.logger.info(f"Consolidated format-level merged data: {len(consolidated_df)} rows")
             return consolidated_df
 
-        # Fallback to state-level data (legacy approach)
+        # Fallback to state-level data (legacy approach, raw dates are not normalised so no date filter)
         all_dfs = []
 
         for state in states:
@@ -832,22 +895,28 @@ class MetaProcessor:
     def run(self, states: List[str], dates: Optional[List[str]] = None,
             days_back: Optional[int] = None, skip_scraping: bool = False,
             skip_processing: bool = False, skip_cleaning: bool = False,
-            memory_limit: float = 80.0, progress_interval: int = 10) -> pd.DataFrame:
+            memory_limit: float = 80.0, progress_interval: int = 10, workers: int = 1,
+            rebuild_merge: bool = False, export_merged_csv: bool = False) -> pd.DataFrame:
         """
         Run the complete workflow
 
         Args:
             states: List of state codes or ['all'] for all states
-            dates: List of dates in YYYY-MM-DD format
-            days_back: Number of days to go back from today
+            dates: List of dates in YYYY-MM-DD format, also limits the returned rows to these race dates
+            days_back: Number of days to go back from today, also limits the returned rows to those days
             skip_scraping: Skip the scraping step (use existing files)
             skip_processing: Skip the processing step (use existing CSVs)
             skip_cleaning: Skip the cleaning and merging step (use existing cleaned/merged data)
             memory_limit: Stop processing if memory usage exceeds this percentage (default: 80.0)
             progress_interval: Log progress every N files (default: 10)
+            workers: Number of processes extracting PDFs within each state (default: 1, serial)
+            rebuild_merge: Merge every processed CSV again instead of only new or changed ones
+            export_merged_csv: Also write the merged data out as final_merged_data.csv and
+                all_states_{pj,triples}_merged.csv after merging
 
         Returns:
-            Consolidated DataFrame with all extracted data
+            Consolidated DataFrame with the extracted data of the requested states and dates
+            (all dates when neither dates nor days_back is given)
         """
         # Handle 'all' states
         if 'all' in states:
@@ -894,7 +963,7 @@ class MetaProcessor:
                     current_session_files = [f.get('filename') for f in scrape_results[state].get('files', [])]
                     self.logger.info(f"Processing {len(current_session_files)} files from current scraping session")
 
-                process_results[state] = self.process_state_pdfs(state, session_files=current_session_files)
+                process_results[state] = self.process_state_pdfs(state, session_files=current_session_files, workers=workers)
 
             # Save processing summary
             summary_file = self.base_dir / "logs" / f"process_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -907,7 +976,7 @@ class MetaProcessor:
             self.logger.info(f"\n{'='*50}")
             self.logger.info("CLEANING AND MERGING ALL FORMATS")
             self.logger.info(f"{'='*50}")
-            merge_results = self.merge_all_formats(states)
+            merge_results = self.merge_all_formats(states, rebuild=rebuild_merge)
 
             # Save merge summary
             summary_file = self.base_dir / "logs" / f"merge_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -915,11 +984,14 @@ class MetaProcessor:
                 json.dump(merge_results, f, indent=2, default=str)
             self.logger.info(f"Merge summary saved to {summary_file}")
 
+            if export_merged_csv and merge_results.get('success'):
+                self.export_merged_csvs()
+
         # Step 4: Consolidate data
         self.logger.info(f"\n{'='*50}")
         self.logger.info("CONSOLIDATING DATA")
         self.logger.info(f"{'='*50}")
-        consolidated_df = self.consolidate_data(states)
+        consolidated_df = self.consolidate_data(states, self._requested_dates(dates, days_back))
         
         # Save consolidated data
         # if not consolidated_df.empty:
@@ -947,6 +1019,12 @@ Examples:
 
   # Process existing PDFs without scraping
   python meta_processor.py --states all --skip-scraping
+
+  # Backfill with PDF extraction spread over 4 processes
+  python meta_processor.py --states all --days-back 30 --workers 4
+
+  # Merge every processed CSV again, e.g. after restoring processed/ from a backup
+  python meta_processor.py --states all --skip-scraping --skip-processing --rebuild-merge
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -981,6 +1059,15 @@ Examples:
 
     parser.add_argument('--progress-interval', type=int, default=10,
                        help='Log progress every N files (default: 10)')
+
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes used to extract PDFs, e.g. for backfills (default: 1)')
+
+    parser.add_argument('--rebuild-merge', action='store_true',
+                       help='Rebuild the merge store from all processed CSVs (default: only merge new/changed files)')
+
+    parser.add_argument('--export-merged-csv', action='store_true',
+                       help='Also write final_merged_data.csv and all_states_*_merged.csv after merging')
     
     args = parser.parse_args()
 
@@ -1013,7 +1100,10 @@ Examples:
         days_back=args.days_back,
         skip_scraping=args.skip_scraping,
         skip_processing=args.skip_processing,
-        skip_cleaning=args.skip_cleaning
+        skip_cleaning=args.skip_cleaning,
+        workers=args.workers,
+        rebuild_merge=args.rebuild_merge,
+        export_merged_csv=args.export_merged_csv
     )
     
     # Print summary
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF backends on a corpus of sectional PDFs and pick the default per (state, format).
+
+Every PDF is extracted once with the reference backend (pdfplumber) and once with each other
+installed backend set as the default, through the same detect-then-reopen path production uses.
+A backend becomes the default for a (state, format) only if it parsed exactly the same runners
+as the reference on every file of that group and was faster on average.
+The picks are written to backend_defaults.json, which PDFExtractor reads at start up.
+
+Usage:
+    python benchmark_backends.py --states vic nsw --min-files 5
+"""
+
+import io
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import contextlib
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+
+sys.path.append(str(Path(__file__).parent))
+from pdf_extractor import PDFExtractor
+from pdf_backends import REFERENCE_BACKEND, available_backends, defaults_key, save_backend_defaults
+
+DEFAULT_BASE_DIR = Path(__file__).parent.parent
+
+
+def find_corpus(states: List[str], base_dir: Path = DEFAULT_BASE_DIR) -> List[Tuple[str, str]]:
+    """(state, pdf path) for the PDFs already scraped, processed originals included"""
+    corpus = []
+    for state in states:
+        files = set()
+        for pattern in [f"processing/{state}/*.pdf", f"processed/{state}/**/*.pdf", f"data/raw/{state}/*.pdf"]:
+            files.update(glob.glob(os.path.join(str(base_dir), pattern), recursive=True))
+        corpus += [(state, pdf_file) for pdf_file in sorted(files)]
+    return corpus
+
+
+def runner_signature(result: Dict) -> str:
+    """Comparable form of the parsed runners"""
+    return json.dumps(result.get('runners', []), sort_keys=True, default=str)
+
+
+def timed_extract(extractor: PDFExtractor, pdf_file: str) -> Tuple[Dict, float]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = extractor.extract_pdf_data(pdf_file)
+    return result, time.perf_counter() - start
+
+
+class UniformDefaults(dict):
+    """backend_defaults that names the same backend for every (state, format)"""
+
+    def __init__(self, backend: str):
+        super().__init__()
+        self.backend = backend
+
+    def get(self, key, default=None):
+        return self.backend
+
+
+def benchmark_files(corpus: List[Tuple[str, str]], backends: List[str]) -> pd.DataFrame:
+    """
+    One row per (file, backend) with time, runners and whether they match the reference
+
+    Each backend is timed the way production would run it as the default: PDFExtractor() detects
+    on the reference backend and reopens the file with the candidate, so the reopen is included.
+    """
+    extractors = {name: PDFExtractor(backend_defaults=UniformDefaults(name)) for name in [REFERENCE_BACKEND] + backends}
+    rows = []
+    for i, (state, pdf_file) in enumerate(corpus, 1):
+        reference, ref_seconds = timed_extract(extractors[REFERENCE_BACKEND], pdf_file)
+        pdf_format = reference.get('format', 'unknown')
+        ref_signature = runner_signature(reference)
+        rows.append([pdf_file, state, pdf_format, REFERENCE_BACKEND, ref_seconds, len(reference.get('runners', [])), True, None])
+
+        for name in backends:
+            try:
+                result, seconds = timed_extract(extractors[name], pdf_file)
+                rows.append([pdf_file, state, pdf_format, name, seconds, len(result.get('runners', [])),
+                             runner_signature(result) == ref_signature, result.get('error')])
+            except Exception as e:
+                rows.append([pdf_file, state, pdf_format, name, None, 0, False, str(e)])
+
+        print(f"[{i:3d}/{len(corpus)}] {os.path.basename(pdf_file)} ({state}/{pdf_format}) reference {ref_seconds:.2f}s")
+
+    return pd.DataFrame(rows, columns=['file', 'state', 'format', 'backend', 'seconds', 'runners', 'matches_reference', 'error'])
+
+
+def pick_defaults(results: pd.DataFrame, min_files: int = 3) -> Tuple[Dict[str, str], List[Dict]]:
+    """Fastest backend per (state, format) that matched the reference on every file of the group"""
+    defaults, summary = {}, []
+    # files the reference parsed no runners from prove nothing either way
+    parsed = results.loc[(results['backend'] == REFERENCE_BACKEND) & (results['runners'] > 0), 'file']
+    results = results[results['file'].isin(parsed)]
+    for (state, pdf_format), group in results.groupby(['state', 'format']):
+        if pdf_format == 'unknown':
+            continue
+        by_backend = group.groupby('backend').agg(files=('file', 'nunique'), mean_seconds=('seconds', 'mean'),
+                                                  matched=('matches_reference', 'all'))
+        ref_seconds = by_backend.loc[REFERENCE_BACKEND, 'mean_seconds']
+        candidates = by_backend[(by_backend.index != REFERENCE_BACKEND) & by_backend['matched']
+                                & (by_backend['files'] >= min_files) & (by_backend['mean_seconds'] < ref_seconds)]
+        chosen = candidates['mean_seconds'].idxmin() if not candidates.empty else REFERENCE_BACKEND
+        defaults[defaults_key(state, pdf_format)] = chosen
+
+        for backend, stats in by_backend.iterrows():
+            summary.append({
+                'state': state, 'format': pdf_format, 'backend': backend, 'files': int(stats['files']),
+                'mean_seconds': round(float(stats['mean_seconds']), 4), 'matches_reference': bool(stats['matched']),
+                'speedup': round(float(ref_seconds / stats['mean_seconds']), 2) if stats['mean_seconds'] else None,
+                'chosen': backend == chosen,
+            })
+    return defaults, summary
+
+
+def benchmark_backends(states: List[str], base_dir: Path = DEFAULT_BASE_DIR, backends: Optional[List[str]] = None,
+                       min_files: int = 3, sample: Optional[int] = None, save: bool = True) -> Dict[str, str]:
+    """
+    Run the benchmark and (optionally) save the chosen defaults
+
+    Args:
+        states: State codes whose PDFs make up the corpus
+        base_dir: stew_reports directory holding processing/ and processed/
+        backends: Backends to compare with the reference (default: every installed one)
+        min_files: Files a (state, format) needs before a non-reference backend can be chosen
+        sample: Only use the first N PDFs per state (optional)
+        save: Write backend_defaults.json and the per-file results CSV
+    """
+    backends = [name for name in (backends or available_backends()) if name != REFERENCE_BACKEND]
+    if not backends:
+        print(f"No other PDF backends installed, {REFERENCE_BACKEND} stays the default")
+        return {}
+
+    corpus = find_corpus(states, Path(base_dir))
+    if sample:
+        corpus = [item for state in states for item in [c for c in corpus if c[0] == state][:sample]]
+    if not corpus:
+        print(f"No PDFs found for {states} under {base_dir}")
+        return {}
+
+    print(f"Benchmarking {[REFERENCE_BACKEND] + backends} on {len(corpus)} PDFs")
+    results = benchmark_files(corpus, backends)
+    defaults, summary = pick_defaults(results, min_files)
+
+    print("\n" + "=" * 80)
+    print("PDF BACKEND BENCHMARK")
+    print("=" * 80)
+    for row in summary:
+        marker = ' <- default' if row['chosen'] else ''
+        print(f"  {row['state']}/{row['format']:<16} {row['backend']:<10} {row['files']:4d} files  "
+              f"{row['mean_seconds']:.3f}s  x{row['speedup']}  match={row['matches_reference']}{marker}")
+
+    if save:
+        save_backend_defaults(defaults, summary)
+        results_file = Path(base_dir) / "logs" / f"backend_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        results_file.parent.mkdir(exist_ok=True)
+        results.to_csv(results_file, index=False)
+        print(f"\nDefaults saved, per-file results in {results_file}")
+    return defaults
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF backends and pick the default per state/format')
+    parser.add_argument('--states', nargs='+', default=['nsw', 'vic', 'qld', 'sa', 'tas'],
+                        help='States whose PDFs make up the corpus')
+    parser.add_argument('--base-dir', default=str(DEFAULT_BASE_DIR), help='stew_reports directory')
+    parser.add_argument('--backends', nargs='+', help='Backends to compare (default: all installed)')
+    parser.add_argument('--min-files', type=int, default=3,
+                        help='Files a state/format needs before its default can change (default: 3)')
+    parser.add_argument('--sample', type=int, help='Only use the first N PDFs per state')
+    parser.add_argument('--dry-run', action='store_true', help='Report without saving the defaults')
+    args = parser.parse_args()
+
+    benchmark_backends(args.states, Path(args.base_dir), args.backends, args.min_files, args.sample, save=not args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
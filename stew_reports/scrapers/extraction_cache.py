@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for extracted sectional PDFs.
+
+Entries are keyed by (sha256 of the file bytes, extractor version, state) and hold the
+extract_pdf_data result, so an unchanged PDF is never parsed twice whatever it is called.
+Bump a state's entry in EXTRACTOR_VERSIONS after fixing its parser to reprocess only that state.
+"""
+
+import os
+import pickle
+import hashlib
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+# Bump a state's version when its extraction logic changes; older entries are then ignored
+EXTRACTOR_VERSIONS = {
+    'nsw': 1,
+    'vic': 1,
+    'qld': 1,
+    'sa': 1,
+    'tas': 1,
+    'wa': 1,
+}
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'extraction_cache'
+
+
+class ExtractionCache:
+    """Extracted runner records on disk, one pickle per (state, version, sha256)"""
+
+    def __init__(self, cache_dir: Optional[str] = None, versions: Optional[Dict[str, int]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.versions = versions or EXTRACTOR_VERSIONS
+        # Append-only, so several processes (or module copies) can share it safely
+        self.index_path = self.cache_dir / '_index.csv'
+        self.index_cols = ['state', 'version', 'sha256', 'filename', 'format', 'runners', 'cached_at']
+        self._index = None
+        self._index_mtime = None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        """sha256 of the file bytes"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def version(self, state: str) -> int:
+        return self.versions.get(state.lower(), 1)
+
+    def _entry_path(self, state: str, sha256: str) -> Path:
+        return self.cache_dir / state.lower() / f"v{self.version(state)}" / f"{sha256}.pkl"
+
+    def contains(self, state: str, sha256: str) -> bool:
+        return self._entry_path(state, sha256).exists()
+
+    def get(self, state: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """Cached extract_pdf_data result for this content under the state's current version"""
+        path = self._entry_path(state, sha256)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            # drop the unreadable entry so the next run extracts the file again
+            print(f"Could not read extraction cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, state: str, sha256: str, filename: str, extracted_data: Dict[str, Any]) -> bool:
+        """Store a successful extraction (results without runners are left to be retried)"""
+        if not extracted_data or not extracted_data.get('runners'):
+            return False
+        path = self._entry_path(state, sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(extracted_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        row = pd.DataFrame([[state.lower(), self.version(state), sha256, filename,
+                             extracted_data.get('format', 'unknown'), len(extracted_data['runners']),
+                             datetime.now().strftime('%Y-%m-%d %H:%M:%S')]], columns=self.index_cols)
+        row.to_csv(self.index_path, mode='a', header=not self.index_path.exists(), index=False)
+        return True
+
+    def _load_index(self) -> pd.DataFrame:
+        if not self.index_path.exists():
+            return pd.DataFrame(columns=self.index_cols)
+        mtime = self.index_path.stat().st_mtime
+        if self._index is None or mtime != self._index_mtime:
+            try:
+                self._index = pd.read_csv(self.index_path, dtype={'sha256': str, 'filename': str})
+            except Exception as e:
+                print(f"Could not read extraction cache index {self.index_path}: {e}")
+                return pd.DataFrame(columns=self.index_cols)
+            self._index_mtime = mtime
+        return self._index
+
+    def has_filename(self, state: str, filename: str) -> bool:
+        """True if a file of this name was extracted for the state under its current version"""
+        index = self._load_index()
+        if index.empty:
+            return False
+        current = index[(index['state'] == state.lower()) & (index['version'] == self.version(state))
+                        & (index['filename'] == filename)]
+        return any(self._entry_path(state, sha256).exists() for sha256 in current['sha256'])
+
+    def filenames(self, state: str, sha256: str) -> List[str]:
+        """Filenames this content was extracted under for the state's current version"""
+        index = self._load_index()
+        if index.empty:
+            return []
+        current = index[(index['state'] == state.lower()) & (index['version'] == self.version(state))
+                        & (index['sha256'] == sha256)]
+        return current['filename'].dropna().unique().tolist()
+
+
+_shared_cache = None
+
+
+def get_shared_extraction_cache() -> ExtractionCache:
+    """One cache per process, shared by the batch processors and scrapers"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ExtractionCache()
+    return _shared_cache
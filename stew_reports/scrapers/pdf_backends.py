@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+PDF backends for the sectional extractor.
+
+A backend opens a file into a document whose pages offer extract_text(), extract_words()
+(pdfplumber-style dicts with x0/x1/top/bottom/text) and extract_tables(). pdfplumber is the
+reference implementation. The pdfium backend reads text through PDFium, which is much faster,
+and passes table requests to pdfplumber for that page only.
+
+Which backend handles a (state, format) is decided by benchmark_backends.py and stored in
+backend_defaults.json; anything not listed there uses the reference.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+
+import pdfplumber
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+
+REFERENCE_BACKEND = 'pdfplumber'
+DEFAULTS_PATH = Path(__file__).parent / 'backend_defaults.json'
+
+
+class PdfPlumberBackend:
+    """Reference backend, pdfplumber documents already have the page interface"""
+    name = 'pdfplumber'
+    available = True
+
+    def open(self, file_path: str):
+        return pdfplumber.open(file_path)
+
+
+class PdfiumPage:
+    """One page of a PdfiumDocument"""
+
+    def __init__(self, document: 'PdfiumDocument', index: int):
+        self._document = document
+        self.index = index
+        self.page_number = index + 1
+        self._textpage = None
+
+    def _text_page(self):
+        if self._textpage is None:
+            self._textpage = self._document.pdf[self.index].get_textpage()
+        return self._textpage
+
+    def extract_text(self, **kwargs) -> str:
+        """PDFium page text, pdfplumber options (layout, x_tolerance, ...) are handed to pdfplumber for this page"""
+        if kwargs:
+            return self._document.plumber_page(self.index).extract_text(**kwargs)
+        text = self._text_page().get_text_range()
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def extract_words(self) -> List[Dict[str, Any]]:
+        """Whitespace separated words with top-left origin coordinates, like pdfplumber"""
+        textpage = self._text_page()
+        height = self._document.pdf[self.index].get_height()
+        n_chars = textpage.count_chars()
+        text = textpage.get_text_range()
+        words, current = [], None
+        for i in range(n_chars):
+            char = text[i] if len(text) == n_chars else textpage.get_text_range(i, 1)
+            if not char or char.isspace():
+                if current:
+                    words.append(current)
+                current = None
+                continue
+            left, bottom, right, top = textpage.get_charbox(i)
+            if current is None:
+                current = {'text': char, 'x0': left, 'x1': right, 'top': height - top, 'bottom': height - bottom}
+            else:
+                current['text'] += char
+                current['x0'] = min(current['x0'], left)
+                current['x1'] = max(current['x1'], right)
+                current['top'] = min(current['top'], height - top)
+                current['bottom'] = max(current['bottom'], height - bottom)
+        if current:
+            words.append(current)
+        return words
+
+    def extract_tables(self, table_settings=None):
+        page = self._document.plumber_page(self.index)
+        return page.extract_tables(table_settings) if table_settings else page.extract_tables()
+
+    def close(self):
+        if self._textpage is not None:
+            self._textpage.close()
+            self._textpage = None
+
+
+class PdfiumDocument:
+    """PDFium text with pdfplumber opened lazily for the pages that need tables"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.pdf = pdfium.PdfDocument(file_path)
+        self.pages = [PdfiumPage(self, i) for i in range(len(self.pdf))]
+        self._plumber = None
+
+    def plumber_page(self, index: int):
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(self.file_path)
+        return self._plumber.pages[index]
+
+    def close(self):
+        for page in self.pages:
+            page.close()
+        self.pdf.close()
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class PdfiumBackend:
+    name = 'pdfium'
+    available = PDFIUM_AVAILABLE
+
+    def open(self, file_path: str):
+        if not PDFIUM_AVAILABLE:
+            raise ImportError("pypdfium2 not installed. Please run: pip install pypdfium2")
+        return PdfiumDocument(file_path)
+
+
+BACKENDS = {
+    'pdfplumber': PdfPlumberBackend(),
+    'pdfium': PdfiumBackend(),
+}
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.available]
+
+
+def get_backend(name: str = None):
+    """Backend by name, the reference for None or a backend that isn't installed"""
+    backend = BACKENDS.get(name or REFERENCE_BACKEND)
+    if backend is None:
+        raise ValueError(f"Unknown PDF backend: {name} (choose from {list(BACKENDS)})")
+    if not backend.available:
+        print(f"PDF backend {name} not available, using {REFERENCE_BACKEND}")
+        return BACKENDS[REFERENCE_BACKEND]
+    return backend
+
+
+def defaults_key(state: str, pdf_format: str) -> str:
+    return f"{state}/{pdf_format}"
+
+
+def load_backend_defaults(path: Path = DEFAULTS_PATH) -> Dict[str, str]:
+    """{'state/format': backend} picked by the last benchmark, empty if it has never run"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f).get('defaults', {})
+    except Exception as e:
+        print(f"Could not read PDF backend defaults {path}: {e}")
+        return {}
+
+
+def save_backend_defaults(defaults: Dict[str, str], summary: List[Dict[str, Any]] = None, path: Path = DEFAULTS_PATH):
+    with open(path, 'w') as f:
+        json.dump({'defaults': defaults, 'benchmark': summary or []}, f, indent=2, default=str)
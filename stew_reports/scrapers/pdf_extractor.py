@@ -9,25 +9,110 @@ Supports multiple PDF formats:
 Author: Claude Code
 """
 
-import re
+import os
 import csv
 import sys
+import importlib.util
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 
+sys.path.append(str(Path(__file__).parent))
+# the cache must be a single module (scrapers.extraction_cache) whichever way this file is loaded,
+# otherwise state_processor and the extractor would each hold their own shared cache
+if __package__:
+    from .extraction_cache import get_shared_extraction_cache
+else:
+    sys.path.append(str(Path(__file__).parent.parent))
+    from scrapers.extraction_cache import get_shared_extraction_cache
 
-try:
-    import pdfplumber
-except ImportError:
+
+# pdf_backends needs pdfplumber (the reference backend), fail with an install hint instead of a traceback
+if importlib.util.find_spec('pdfplumber') is None:
     print("Error: pdfplumber not installed. Please run: pip install pdfplumber")
     sys.exit(1)
 
+from pdf_backends import REFERENCE_BACKEND, get_backend, defaults_key, load_backend_defaults
+from pdf_patterns import (
+    TRIPLES_INDICATORS, PJ_INDICATORS, DETAILED_TRIPLES_INDICATORS, VIC_PJ_INDICATORS, STATE_INDICATORS,
+    TRIPLES_FALLBACK_PATTERNS, PJ_FALLBACK_PATTERNS, find_indicators, count_indicators,
+    Common, TripleS, VicTripleS, NswTripleS, QldTripleS, TripleSDetailed, PJ, QldPJ, VicPJ, TasPJ, SaPJ, NswPJ,
+)
+
+class LazyPage:
+    """Backend page whose text, words and tables are extracted on first use and then reused"""
+
+    def __init__(self, page):
+        self._page = page
+        self._text = {}
+        self._words = None
+        self._tables = {}
+
+    def extract_text(self, **kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._text:
+            self._text[key] = self._page.extract_text(**kwargs)
+        return self._text[key]
+
+    def extract_words(self):
+        if self._words is None:
+            self._words = self._page.extract_words()
+        return [dict(word) for word in self._words]
+
+    def extract_tables(self, table_settings=None):
+        key = repr(table_settings)
+        if key not in self._tables:
+            self._tables[key] = self._page.extract_tables(table_settings) if table_settings else self._page.extract_tables()
+        # callers clean rows in place, so hand out copies
+        return [[list(row) for row in table] for table in self._tables[key]]
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+
+class LazyPDF:
+    """PDF document wrapper with memoised per-page text, used for detection and by the extractors"""
+
+    def __init__(self, pdf):
+        self._pdf = pdf
+        self.pages = [LazyPage(page) for page in pdf.pages]
+        self._full_text = None
+
+    def text(self, max_pages: int = None) -> str:
+        """Page texts joined as before (non-empty pages, each followed by a newline)"""
+        if max_pages is None and self._full_text is not None:
+            return self._full_text
+        pages = self.pages if max_pages is None else self.pages[:max_pages]
+        text = "".join(page_text + "\n" for page_text in (page.extract_text() for page in pages) if page_text)
+        if max_pages is None:
+            self._full_text = text
+        return text
+
+    def __getattr__(self, name):
+        return getattr(self._pdf, name)
+
+
 class PDFExtractor:
     """Extract sectional times data from harness racing PDF files"""
+
+    # Format, state and metadata are read from this many leading pages
+    detection_pages = 1
     
-    def __init__(self):
+    def __init__(self, backend: str = None, backend_defaults: Dict[str, str] = None):
+        """
+        Args:
+            backend: Force one PDF backend for every file (optional, default picks per state/format
+                from the benchmark in backend_defaults.json and falls back to pdfplumber)
+            backend_defaults: {'state/format': backend} to use instead of backend_defaults.json (optional)
+        """
         self.supported_formats = ['triples', 'pj']
+        self.backend = backend
+        self.backend_defaults = load_backend_defaults() if backend_defaults is None else backend_defaults
+
+    def backend_for(self, state: str, pdf_format: str):
+        """PDF backend to parse a (state, format) with"""
+        return get_backend(self.backend or self.backend_defaults.get(defaults_key(state, pdf_format), REFERENCE_BACKEND))
         
     def detect_format(self, text: str) -> str:
         """
@@ -42,76 +127,11 @@ class PDFExtractor:
         # Convert to lowercase for case-insensitive matching
         text_lower = text.lower()
         
-        # TripleS format indicators - more comprehensive
-        triples_indicators = [
-            'triples',
-            'triplesdata',
-            'data processed by triples',
-            'fastest section',
-            'top speed',
-            'distance travelled',
-            'gross time',
-            'mile rate',
-            'horse/driver',
-            'first 50m',
-            'first 100m',
-            'first 200m',
-            'first half',
-            'middle half',
-            'last half',
-            'lead time',
-            '1st quarter',
-            '2nd quarter', 
-            '3rd quarter',
-            '4th quarter',
-            # VIC-specific TripleS indicators
-            'gross time:',
-            'milerate:',
-            'mile rate:',
-            'leadtime:',
-            'lead time:',
-            'first qtr:',
-            'second qtr:',
-            'third qtr:',
-            'fourth qtr:',
-            'position and metres gained from 800m',
-            'finish position and metres gained'
-        ]
-        
-        # PJ format indicators - more comprehensive  
-        pj_indicators = [
-            'p j data',
-            'pj data',
-            'sectionals powered by',
-            'tasracing',
-            # SA-specific PJ indicators
-            'nohorse plc mar',  # Very specific SA PJ header pattern
-            'globe derby park',  # SA venue indicator
-            '800 posi 400 posi', # SA column header pattern
-            # Other PJ indicators
-            'plc margin time',
-            '800time(w)',
-            '400time(w)',
-            'first100m',
-            'no horse',
-            'data table: 800 / 400'
-        ]
-        
-        triples_count = sum(1 for indicator in triples_indicators if indicator in text_lower)
-        pj_count = sum(1 for indicator in pj_indicators if indicator in text_lower)
-        
-        # Check for detailed TripleS format (like Redcliffe sub-type)
-        # Make indicators more specific to avoid false positives with VIC files
-        detailed_triples_indicators = [
-            'driver section 50m 100m 200m mile travelled',  # Very specific to detailed format
-            'fastest section',  # Specific detailed field
-            'first 50m',       # Specific detailed field
-            'first 100m',      # Specific detailed field
-            'first 200m',      # Specific detailed field
-            'distance travelled', # Specific detailed field
-        ]
-        
-        detailed_count = sum(1 for indicator in detailed_triples_indicators if indicator in text_lower)
+        # One pass over the indicator tables for all three counts
+        found = find_indicators(text_lower)
+        triples_count = count_indicators(found, TRIPLES_INDICATORS)
+        pj_count = count_indicators(found, PJ_INDICATORS)
+        detailed_count = count_indicators(found, DETAILED_TRIPLES_INDICATORS)
         
         print(f"Format detection - TripleS indicators: {triples_count}, PJ indicators: {pj_count}, Detailed TripleS: {detailed_count}")
         
@@ -130,55 +150,8 @@ class PDFExtractor:
             return 'triples'
         else:
             # Fallback pattern matching for specific formats
-            
-            # TripleS format specific patterns
-            triples_patterns = [
-                r'horse/\s*driver',
-                r'km/h.*fastest.*section',
-                r'speed.*section.*first.*50m.*100m.*200m',
-                r'r\s*t\s*a\s*a\s*n\s*b\s*k',  # The column headers pattern
-                r'lead\s*time.*quarter.*quarter.*quarter.*quarter',
-                r'\[(\d+)\].*\[(\d+)\].*\[(\d+)\]',  # Position indicators
-                r'first\s*half.*middle\s*half.*last\s*half',
-                r'margin.*travelled',
-                r'fastest\s*section',
-                r'first\s*50m',
-                r'first\s*100m',
-                r'first\s*200m',
-                r'middle\s*half',
-                r'last\s*half',
-                r'distance\s*travelled',
-                r'gross\s*time.*mile\s*rate.*travelled',
-                r'\d{2}\.\d{2}\s+0:\d{2}\.\d{2}',  # Speed + time pattern
-                r'lead\s*q[1-4]',
-                r'q[1-4]\s*q[1-4]'
-            ]
-            
-            # PJ format specific patterns  
-            pj_patterns = [
-                r'plc.*margin.*time.*800time',
-                r'finish position and metres gained',
-                r'gross time:.*mile.*rate:',
-                r'horse.*plc.*margin.*time.*800time.*400time',
-                r'metres gained from 800m',
-                r'\(\d+\).*\(\d+\)',  # Win indicators pattern
-                r'first\s*qtr:.*second\s*qtr:.*third\s*qtr:.*fourth\s*qtr:',
-                r'nohorse.*plc.*mar.*800.*posi.*400.*posi',
-                r'data\s*table:\s*800\s*/\s*400',
-                r'milerate:\s*\d+:\d+\.\d+',
-                r'leadtime:\s*\d+\.\d+s',
-                r'race\s+\d+\s+distance\s+\d+m',
-                r'sunday.*\d+\s+\w+\s+\d{4}',
-                r'saturday.*\d+\s+\w+\s+\d{4}',
-                r'monday.*\d+\s+\w+\s+\d{4}',
-                r'tuesday.*\d+\s+\w+\s+\d{4}',
-                r'wednesday.*\d+\s+\w+\s+\d{4}',
-                r'thursday.*\d+\s+\w+\s+\d{4}',
-                r'friday.*\d+\s+\w+\s+\d{4}'
-            ]
-            
-            triples_pattern_count = sum(1 for pattern in triples_patterns if re.search(pattern, text_lower))
-            pj_pattern_count = sum(1 for pattern in pj_patterns if re.search(pattern, text_lower))
+            triples_pattern_count = sum(1 for pattern in TRIPLES_FALLBACK_PATTERNS if pattern.search(text_lower))
+            pj_pattern_count = sum(1 for pattern in PJ_FALLBACK_PATTERNS if pattern.search(text_lower))
             
             print(f"Fallback patterns - TripleS: {triples_pattern_count}, PJ: {pj_pattern_count}")
             
@@ -208,17 +181,17 @@ class PDFExtractor:
         # Extract venue and date patterns
         if format_type == 'triples':
             # TripleS format: "Cranbourne VIC - C-CLASS" or "Redcliffe QLD"
-            venue_match = re.search(r'(\w+(?:\s+\w+)*)\s+(VIC|QLD|NSW|SA|TAS|WA|NT|ACT)\s*-?\s*[A-Z-]*', text, re.IGNORECASE)
+            venue_match = Common.VENUE_STATE.search(text)
             if venue_match:
                 metadata['venue'] = f"{venue_match.group(1)} {venue_match.group(2)}"
             
             # Date: "16 April 2023"
-            date_match = re.search(r'(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})', text, re.IGNORECASE)
+            date_match = Common.DATE.search(text)
             if date_match:
                 metadata['date'] = date_match.group(1)
                 
             # Race info: "Race 1: BLUE HILLS RISE PACE - 2080m"
-            race_match = re.search(r'Race\s+(\d+):\s*([^-\n]+?)\s*-\s*(\d+)m', text, re.IGNORECASE)
+            race_match = Common.RACE.search(text)
             if race_match:
                 metadata['race_number'] = int(race_match.group(1))
                 metadata['race_name'] = race_match.group(2).strip()
@@ -226,7 +199,7 @@ class PDFExtractor:
                 
         elif format_type == 'pj':
             # PJ format: "Carrick Race 1 Distance 1670m Saturday, 13 February 2021"
-            pj_header_match = re.search(r'(\w+(?:\s+\w+)*)\s+Race\s+(\d+)\s+Distance\s+(\d+)m\s+(\w+,\s*\d{1,2}\s+\w+\s+\d{4})', text, re.IGNORECASE)
+            pj_header_match = Common.PJ_HEADER.search(text)
             if pj_header_match:
                 metadata['venue'] = pj_header_match.group(1)
                 metadata['race_number'] = int(pj_header_match.group(2))
@@ -235,17 +208,17 @@ class PDFExtractor:
             else:
                 # TAS 2020 format: Extract venue and date specifically for this format
                 # Try "Sectional information Hobart" pattern first (cleanest)
-                sectional_match = re.search(r'Sectional information\s+([A-Za-z]+)', text, re.IGNORECASE)
+                sectional_match = Common.SECTIONAL_VENUE.search(text)
                 if sectional_match:
                     metadata['venue'] = sectional_match.group(1)
                 
                 # Extract date from "Hobart Sunday, 2 August 2020" or standalone date lines  
-                date_match = re.search(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})', text, re.IGNORECASE)
+                date_match = Common.WEEKDAY_DATE.search(text)
                 if date_match:
                     metadata['date'] = f"{date_match.group(1)}, {date_match.group(2)}"
                 
                 # Extract race numbers and distance from 2020 format: "Race No. 1 Distance 2090m"
-                race_2020_match = re.search(r'Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m', text, re.IGNORECASE)
+                race_2020_match = Common.RACE_2020.search(text)
                 if race_2020_match:
                     metadata['race_number'] = int(race_2020_match.group(1))
                     metadata['distance'] = int(race_2020_match.group(2))
@@ -292,7 +265,6 @@ class PDFExtractor:
     
     def _extract_triples_qld_from_table(self, pdf_obj) -> List[Dict[str, Any]]:
         """Extract QLD TripleS data using table extraction - improved from VIC template"""
-        import re
         runners = []
         
         # Extract tables from all pages - QLD TripleS PDFs contain multiple races
@@ -407,8 +379,8 @@ class PDFExtractor:
                     quarter_data = runner_data[f'quarter_{quarter_num}']
                     if quarter_data:
                         # Extract time and position
-                        time_match = re.search(r'(\d:\d{2}\.\d{2})', quarter_data)
-                        pos_match = re.search(r'\[(\d+)\]', quarter_data)
+                        time_match = QldTripleS.TIME.search(quarter_data)
+                        pos_match = QldTripleS.POSITION.search(quarter_data)
                         
                         runner_data[f'quarter_{quarter_num}_time'] = time_match.group(1) if time_match else None
                         runner_data[f'quarter_{quarter_num}_position'] = int(pos_match.group(1)) if pos_match else None
@@ -416,15 +388,15 @@ class PDFExtractor:
                 # Extract margin and final time from gross_time_margin
                 if runner_data['gross_time_margin']:
                     # Look for margin pattern like "+28m" or "0m"
-                    margin_match = re.search(r'(\+?\d+\.?\d*m|0m)', runner_data['gross_time_margin'])
-                    time_match = re.search(r'(\d:\d{2}\.\d{2})', runner_data['gross_time_margin'])
+                    margin_match = QldTripleS.MARGIN.search(runner_data['gross_time_margin'])
+                    time_match = QldTripleS.TIME.search(runner_data['gross_time_margin'])
                     
                     runner_data['margin'] = margin_match.group(1) if margin_match else None
                     runner_data['final_time'] = time_match.group(1) if time_match else None
                 
                 # Extract lead time and position
                 if runner_data['lead_time']:
-                    lead_match = re.match(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]', runner_data['lead_time'])
+                    lead_match = QldTripleS.TIME_POSITION.match(runner_data['lead_time'])
                     if lead_match:
                         runner_data['lead_time_value'] = lead_match.group(1)
                         runner_data['lead_position'] = int(lead_match.group(2))
@@ -479,7 +451,7 @@ class PDFExtractor:
         lines = page_text.split('\n')
         for idx, line in enumerate(lines[:20]):  # Check first 20 lines for more info
             # Look for race pattern: "Race 1: WOLF SIGNS 4YO & OLDER 1 WIN PACE - 1780m"
-            race_match = re.search(r'Race\s+(\d+):\s*([^-\n]+?)\s*-\s*(\d+)m', line, re.IGNORECASE)
+            race_match = TripleS.RACE.search(line)
             if race_match:
                 race_info['race_number'] = int(race_match.group(1))
                 race_info['race_name'] = race_match.group(2).strip()
@@ -495,7 +467,7 @@ class PDFExtractor:
                         race_info['track'] = track_parts
                 # VIC format: "Geelong Race 1 Distance 2100m" or "Ballarat Race 1"
                 elif 'Race' in line:
-                    track_match = re.match(r'^([A-Za-z\s]+?)\s+Race', line)
+                    track_match = TripleS.TRACK.match(line)
                     if track_match:
                         potential_track = track_match.group(1).strip()
                         # Filter out common header words
@@ -503,21 +475,21 @@ class PDFExtractor:
                         if not any(word.lower() in potential_track.lower() for word in excluded_words):
                             race_info['track'] = potential_track
                 # Alternative VIC format: "Cranbourne VIC - C-CLASS" or just track name
-                elif re.match(r'^[A-Za-z\s]+(?:\s+VIC)?(?:\s*-|$)', line):
+                elif TripleS.TRACK_LINE.match(line):
                     # Extract just the track name part
-                    track_clean = re.sub(r'\s+VIC\s*-.*$', '', line.strip(), flags=re.IGNORECASE)
-                    track_clean = re.sub(r'\s*-.*$', '', track_clean)
+                    track_clean = TripleS.VIC_SUFFIX.sub('', line.strip())
+                    track_clean = TripleS.DASH_SUFFIX.sub('', track_clean)
                     if track_clean and len(track_clean) > 2 and track_clean.replace(' ', '').isalpha():
                         race_info['track'] = track_clean
 
             # Extract date patterns
             # NSW format: "23 May 2024 - 6:22PM"
-            date_match1 = re.search(r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})', line, re.IGNORECASE)
+            date_match1 = TripleS.DAY_MONTH_YEAR.search(line)
             if date_match1:
                 race_info['date'] = date_match1.group(1)
 
             # VIC format: "Thursday, 14 March 2024"
-            date_match2 = re.search(r'(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s*(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})', line, re.IGNORECASE)
+            date_match2 = TripleS.WEEKDAY_DATE.search(line)
             if date_match2:
                 race_info['date'] = date_match2.group(1)
 
@@ -537,7 +509,7 @@ class PDFExtractor:
                 continue
             
             # Look for a line that starts with rank and tab number
-            rank_match = re.match(r'^(\d+)\s+(\d+)\s+', line)
+            rank_match = QldTripleS.RANK.match(line)
             if rank_match:
                 rank = int(rank_match.group(1))
                 tab_number = int(rank_match.group(2))
@@ -550,7 +522,7 @@ class PDFExtractor:
                     prev_line = lines[j].strip()
                     
                     # Look for horse name pattern - all caps name with timing data
-                    horse_match = re.match(r'^([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d{1,2}\.\d{2})', prev_line)
+                    horse_match = QldTripleS.HORSE.match(prev_line)
                     if horse_match:
                         potential_name = horse_match.group(1).strip()
                         # Filter out headers and non-horse words
@@ -564,7 +536,7 @@ class PDFExtractor:
                     next_line = lines[j].strip()
                     
                     # Look for driver name - properly capitalized, not all caps
-                    driver_match = re.match(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', next_line)
+                    driver_match = QldTripleS.DRIVER.match(next_line)
                     if driver_match:
                         potential_driver = driver_match.group(1).strip()
                         # Make sure it's not a horse name or position indicator
@@ -650,21 +622,21 @@ class PDFExtractor:
                                 # Look for lead time with position
                                 for part in data_parts[4:]:
                                     if '[' in part and ']' in part:
-                                        lead_match = re.match(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]', part)
+                                        lead_match = QldTripleS.TIME_POSITION.match(part)
                                         if lead_match:
                                             timing_data['lead_time'] = lead_match.group(1)
                                             timing_data['lead_position'] = int(lead_match.group(2))
                                 
                                 # Final time is usually the last time-formatted entry
                                 for part in reversed(data_parts):
-                                    if re.match(r'\d:\d{2}\.\d{2}', part):
+                                    if QldTripleS.RACE_TIME.match(part):
                                         timing_data['final_time'] = part
                                         break
                     except (ValueError, IndexError):
                         pass
             
             # Look for rank/timing line with quarters and margins
-            rank_match = re.match(r'^(\d+)\s+(\d+)\s+', line)
+            rank_match = QldTripleS.RANK.match(line)
             if rank_match:
                 parts = line.split()
                 
@@ -672,12 +644,12 @@ class PDFExtractor:
                 for part in parts:
                     if 'm' in part and ('+' in part or part == '0m'):
                         timing_data['margin'] = part
-                    elif re.match(r'\d:\d{2}\.\d{2}', part):
+                    elif QldTripleS.RACE_TIME.match(part):
                         if not timing_data['final_time']:  # Don't overwrite if already found
                             timing_data['final_time'] = part
                 
                 # Look for quarter times in parentheses
-                quarter_times = re.findall(r'\((\d:\d{2}\.\d{2})\)', line)
+                quarter_times = QldTripleS.QUARTER_TIMES.findall(line)
                 if len(quarter_times) >= 4:
                     timing_data['quarter_1_time'] = quarter_times[0]
                     timing_data['quarter_2_time'] = quarter_times[1]
@@ -685,7 +657,7 @@ class PDFExtractor:
                     timing_data['quarter_4_time'] = quarter_times[3]
             
             # Look for quarter positions line
-            quarter_pos_matches = re.findall(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]', line)
+            quarter_pos_matches = QldTripleS.TIME_POSITION.findall(line)
             if len(quarter_pos_matches) >= 4:
                 timing_data['quarter_1_time'] = quarter_pos_matches[0][0]
                 timing_data['quarter_1_position'] = int(quarter_pos_matches[0][1])
@@ -697,8 +669,8 @@ class PDFExtractor:
                 timing_data['quarter_4_position'] = int(quarter_pos_matches[3][1])
             
             # Look for distance data (driver line)
-            if re.search(r'\d+m.*\d+m.*\d+m', line):
-                distances = re.findall(r'(\d+)m', line)
+            if QldTripleS.DISTANCE_LINE.search(line):
+                distances = QldTripleS.DISTANCES.findall(line)
                 if len(distances) >= 9:  # Should have 9+ distance measurements
                     timing_data['distance_travelled'] = f"{distances[-1]}m"  # Last one is usually total
         
@@ -792,8 +764,8 @@ class PDFExtractor:
                     quarter_data = runner_data[f'quarter_{quarter_num}']
                     if quarter_data:
                         # Extract time and position
-                        time_match = re.search(r'(\d:\d{2}\.\d{2})', quarter_data)
-                        pos_match = re.search(r'\[(\d+)\]', quarter_data)
+                        time_match = VicTripleS.TIME.search(quarter_data)
+                        pos_match = VicTripleS.POSITION.search(quarter_data)
                         
                         runner_data[f'quarter_{quarter_num}_time'] = time_match.group(1) if time_match else None
                         runner_data[f'quarter_{quarter_num}_position'] = int(pos_match.group(1)) if pos_match else None
@@ -801,15 +773,15 @@ class PDFExtractor:
                 # Extract margin and final time from gross_time_margin
                 if runner_data['gross_time_margin']:
                     # Look for margin pattern like "+28m" or "0m"
-                    margin_match = re.search(r'(\+?\d+\.?\d*m|0m)', runner_data['gross_time_margin'])
-                    time_match = re.search(r'(\d:\d{2}\.\d{2})', runner_data['gross_time_margin'])
+                    margin_match = VicTripleS.MARGIN.search(runner_data['gross_time_margin'])
+                    time_match = VicTripleS.TIME.search(runner_data['gross_time_margin'])
                     
                     runner_data['margin'] = margin_match.group(1) if margin_match else None
                     runner_data['final_time'] = time_match.group(1) if time_match else None
                 
                 # Extract lead time and position
                 if runner_data['lead_time']:
-                    lead_match = re.match(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]', runner_data['lead_time'])
+                    lead_match = VicTripleS.TIME_POSITION.match(runner_data['lead_time'])
                     if lead_match:
                         runner_data['lead_time_value'] = lead_match.group(1)
                         runner_data['lead_position'] = int(lead_match.group(2))
@@ -823,7 +795,7 @@ class PDFExtractor:
                         if next_row and len(next_row) > 2 and next_row[2]:
                             potential_driver = next_row[2].strip()
                             # Check if it looks like a driver name (proper case, not all caps)
-                            if (re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$', potential_driver) and
+                            if (VicTripleS.DRIVER.match(potential_driver) and
                                 potential_driver != runner_data['horse_name'] and
                                 'Lead' not in potential_driver and
                                 'VIC' not in potential_driver):
@@ -849,7 +821,7 @@ class PDFExtractor:
                 continue
                 
             # VIC TripleS: Similar to QLD but with VIC-specific variations
-            rank_match = re.match(r'^(\d+)\s+(\d+)', line)
+            rank_match = VicTripleS.RANK.match(line)
             if rank_match:
                 rank = int(rank_match.group(1))
                 tab_number = int(rank_match.group(2))
@@ -873,7 +845,7 @@ class PDFExtractor:
                     
                     # VIC horse name pattern
                     if not runner_data['horse_name']:
-                        horse_match = re.search(r'\b([A-Z][A-Z\s&\-\']{3,30})\b', check_line)
+                        horse_match = VicTripleS.HORSE.search(check_line)
                         if horse_match:
                             potential_name = horse_match.group(1).strip()
                             # Filter out VIC specific non-horse words
@@ -882,19 +854,19 @@ class PDFExtractor:
                                 runner_data['horse_name'] = potential_name
                     
                     # VIC timing patterns (similar to QLD)
-                    speed_match = re.search(r'(\d{2}\.\d{2})\s+0:(\d{2}\.\d{2})', check_line)
+                    speed_match = VicTripleS.SPEED.search(check_line)
                     if speed_match:
                         runner_data['top_speed'] = float(speed_match.group(1))
                         runner_data['fastest_section'] = f"0:{speed_match.group(2)}"
                     
-                    quarter_matches = re.findall(r'(\d:\d{2}\.\d{2})\s+\[(\d+)\]', check_line)
+                    quarter_matches = VicTripleS.QUARTERS.findall(check_line)
                     for time_str, pos_str in quarter_matches:
                         runner_data['quarters'].append({
                             'time': time_str,
                             'position': int(pos_str)
                         })
                     
-                    time_margin_match = re.search(r'(\d:\d{2}\.\d{2})\s*(\+?\d+\.?\d*m|0m)', check_line)
+                    time_margin_match = VicTripleS.TIME_MARGIN.search(check_line)
                     if time_margin_match:
                         runner_data['final_time'] = time_margin_match.group(1)
                         runner_data['margin'] = time_margin_match.group(2)
@@ -914,7 +886,7 @@ class PDFExtractor:
             if not line:
                 continue
                 
-            rank_match = re.match(r'^(\d+)\s+(\d+)', line)
+            rank_match = TripleS.RANK.match(line)
             if rank_match:
                 rank = int(rank_match.group(1))
                 tab_number = int(rank_match.group(2))
@@ -937,26 +909,26 @@ class PDFExtractor:
                     check_line = lines[j].strip()
                     
                     if not runner_data['horse_name']:
-                        horse_match = re.search(r'\b([A-Z][A-Z\s&\-\']{3,30})\b', check_line)
+                        horse_match = TripleS.HORSE.search(check_line)
                         if horse_match:
                             potential_name = horse_match.group(1).strip()
                             excluded = {'THE', 'AND', 'OR', 'OF', 'IN', 'ON', 'AT', 'TO', 'FOR', 'WITH', 'BY', 'C-CLASS', 'PACE', 'TROT'}
                             if potential_name not in excluded and len(potential_name.split()) <= 5:
                                 runner_data['horse_name'] = potential_name
                     
-                    speed_match = re.search(r'(\d{2}\.\d{2})\s+0:(\d{2}\.\d{2})', check_line)
+                    speed_match = TripleS.SPEED.search(check_line)
                     if speed_match:
                         runner_data['top_speed'] = float(speed_match.group(1))
                         runner_data['fastest_section'] = f"0:{speed_match.group(2)}"
                     
-                    quarter_matches = re.findall(r'(\d:\d{2}\.\d{2})\s+\[(\d+)\]', check_line)
+                    quarter_matches = TripleS.QUARTERS.findall(check_line)
                     for time_str, pos_str in quarter_matches:
                         runner_data['quarters'].append({
                             'time': time_str,
                             'position': int(pos_str)
                         })
                     
-                    time_margin_match = re.search(r'(\d:\d{2}\.\d{2})\s*(\+?\d+\.?\d*m|0m)', check_line)
+                    time_margin_match = TripleS.TIME_MARGIN.search(check_line)
                     if time_margin_match:
                         runner_data['final_time'] = time_margin_match.group(1)
                         runner_data['margin'] = time_margin_match.group(2)
@@ -1054,8 +1026,8 @@ class PDFExtractor:
                     quarter_data = runner_data[f'quarter_{quarter_num}']
                     if quarter_data:
                         # Extract time and position
-                        time_match = re.search(r'(\d:\d{2}\.\d{2})', quarter_data)
-                        pos_match = re.search(r'\[(\d+)\]', quarter_data)
+                        time_match = NswTripleS.TIME.search(quarter_data)
+                        pos_match = NswTripleS.POSITION.search(quarter_data)
                         
                         runner_data[f'quarter_{quarter_num}_time'] = time_match.group(1) if time_match else None
                         runner_data[f'quarter_{quarter_num}_position'] = int(pos_match.group(1)) if pos_match else None
@@ -1063,15 +1035,15 @@ class PDFExtractor:
                 # Extract margin and final time from gross_time_margin
                 if runner_data['gross_time_margin']:
                     # Look for margin pattern like "+28m" or "0m"
-                    margin_match = re.search(r'(\+?\d+\.?\d*m|0m)', runner_data['gross_time_margin'])
-                    time_match = re.search(r'(\d:\d{2}\.\d{2})', runner_data['gross_time_margin'])
+                    margin_match = NswTripleS.MARGIN.search(runner_data['gross_time_margin'])
+                    time_match = NswTripleS.TIME.search(runner_data['gross_time_margin'])
                     
                     runner_data['margin'] = margin_match.group(1) if margin_match else None
                     runner_data['final_time'] = time_match.group(1) if time_match else None
                 
                 # Extract lead time and position
                 if runner_data['lead_time']:
-                    lead_match = re.match(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]', runner_data['lead_time'])
+                    lead_match = NswTripleS.TIME_POSITION.match(runner_data['lead_time'])
                     if lead_match:
                         runner_data['lead_time_value'] = lead_match.group(1)
                         runner_data['lead_position'] = int(lead_match.group(2))
@@ -1085,7 +1057,7 @@ class PDFExtractor:
                         if next_row and len(next_row) > 2 and next_row[2]:
                             potential_driver = next_row[2].strip()
                             # Check if it looks like a driver name (proper case, not all caps) - VIC pattern
-                            if (re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$', potential_driver) and
+                            if (NswTripleS.DRIVER.match(potential_driver) and
                                 potential_driver != runner_data['horse_name'] and
                                 'Lead' not in potential_driver and
                                 'NSW' not in potential_driver and
@@ -1114,7 +1086,7 @@ class PDFExtractor:
                 continue
                 
             # NSW TripleS: Using VIC pattern matching logic
-            rank_match = re.match(r'^(\d+)\s+(\d+)', line)
+            rank_match = NswTripleS.RANK.match(line)
             if rank_match:
                 rank = int(rank_match.group(1))
                 tab_number = int(rank_match.group(2))
@@ -1138,7 +1110,7 @@ class PDFExtractor:
                     
                     # NSW horse name pattern
                     if not runner_data['horse_name']:
-                        horse_match = re.search(r'\b([A-Z][A-Z\s&\-\']{3,30})\b', check_line)
+                        horse_match = NswTripleS.HORSE.search(check_line)
                         if horse_match:
                             potential_name = horse_match.group(1).strip()
                             # Filter out NSW specific non-horse words
@@ -1148,19 +1120,19 @@ class PDFExtractor:
                                 runner_data['horse_name'] = potential_name
                     
                     # NSW timing patterns (using VIC logic)
-                    speed_match = re.search(r'(\d{2}\.\d{2})\s+0:(\d{2}\.\d{2})', check_line)
+                    speed_match = NswTripleS.SPEED.search(check_line)
                     if speed_match:
                         runner_data['top_speed'] = float(speed_match.group(1))
                         runner_data['fastest_section'] = f"0:{speed_match.group(2)}"
                     
-                    quarter_matches = re.findall(r'(\d:\d{2}\.\d{2})\s+\[(\d+)\]', check_line)
+                    quarter_matches = NswTripleS.QUARTERS.findall(check_line)
                     for time_str, pos_str in quarter_matches:
                         runner_data['quarters'].append({
                             'time': time_str,
                             'position': int(pos_str)
                         })
                     
-                    time_margin_match = re.search(r'(\d:\d{2}\.\d{2})\s*(\+?\d+\.?\d*m|0m)', check_line)
+                    time_margin_match = NswTripleS.TIME_MARGIN.search(check_line)
                     if time_margin_match:
                         runner_data['final_time'] = time_margin_match.group(1)
                         runner_data['margin'] = time_margin_match.group(2)
@@ -1221,13 +1193,13 @@ class PDFExtractor:
             line = line.strip()
             
             # Extract race number and distance: "Race 1: 2023 TROT RODS FINAL NIGHT HEAT 11 - 947m"
-            race_match = re.search(r'Race\s+(\d+).*?(\d+)m\s*$', line)
+            race_match = TripleSDetailed.RACE.search(line)
             if race_match:
                 race_info['race_number'] = int(race_match.group(1))
                 race_info['distance'] = f"{race_match.group(2)}m"
                 
             # Extract date: "24 May 2023 - 4:53PM"  
-            date_match = re.search(r'(\d{1,2}\s+\w+\s+\d{4})', line)
+            date_match = TripleSDetailed.DATE.search(line)
             if date_match:
                 race_info['date'] = date_match.group(1)
                 
@@ -1278,7 +1250,7 @@ class PDFExtractor:
                 
                 # Extract actual time and margin from gross_time_margin field
                 if runner['gross_time_margin']:
-                    time_match = re.search(r'(\d:\d{2}\.\d{2})', runner['gross_time_margin'])
+                    time_match = TripleSDetailed.TIME.search(runner['gross_time_margin'])
                     if time_match:
                         runner['final_time'] = time_match.group(1)
                         
@@ -1302,7 +1274,7 @@ class PDFExtractor:
         if not field:
             return None
         # Extract numeric value, removing extra formatting
-        clean = re.sub(r'[^\d\.]', '', field.strip())
+        clean = Common.NON_NUMERIC.sub('', field.strip())
         return clean if clean else None
     
     def _clean_time_field(self, field: str) -> str:
@@ -1310,11 +1282,11 @@ class PDFExtractor:
         if not field:
             return None
         # Look for time patterns like "0:09.52" or "1:06.56"  
-        time_match = re.search(r'(\d:\d{2}\.\d{2})', field)
+        time_match = Common.TIME.search(field)
         if time_match:
             return time_match.group(1)
         # Also handle seconds format like "28.70s"
-        seconds_match = re.search(r'(\d{2}\.\d{2})s', field) 
+        seconds_match = Common.SECONDS.search(field) 
         if seconds_match:
             return f"{seconds_match.group(1)}s"
         return field.strip() if field.strip() else None
@@ -1327,7 +1299,7 @@ class PDFExtractor:
         field = field.strip()
         
         # Pattern: "12.0m (1)" -> margin = "12.0m", width = "1"
-        match = re.match(r'^([\d\.]+m)\s*\((\d+)\)$', field)
+        match = Common.MARGIN_WIDTH.match(field)
         if match:
             margin = match.group(1)
             width = match.group(2)
@@ -1483,7 +1455,7 @@ class PDFExtractor:
             line = line.strip()
 
             # Extract from header line: "Albion Park Race 1 Distance 1660m Friday, 13 December 2019"
-            header_match = re.match(r'^(.+?)\s+Race\s+(\d+)\s+Distance\s+(\d+)m\s+(.+)$', line)
+            header_match = PJ.HEADER.match(line)
             if header_match and not race_info['track']:
                 race_info['track'] = header_match.group(1).strip()
                 race_info['race_number'] = int(header_match.group(2))
@@ -1493,7 +1465,7 @@ class PDFExtractor:
             # Enhanced VIC format detection in early lines
             if idx <= 3 and not race_info['track']:
                 # VIC format: "Geelong Race 1" or "Ballarat Race 2 Distance 2100m"
-                vic_race_match = re.match(r'^([A-Za-z\s]+?)\s+Race\s+(\d+)', line)
+                vic_race_match = PJ.VIC_RACE.match(line)
                 if vic_race_match:
                     potential_track = vic_race_match.group(1).strip()
                     # Filter out common non-track words
@@ -1503,25 +1475,25 @@ class PDFExtractor:
                         race_info['race_number'] = int(vic_race_match.group(2))
 
                         # Look for distance in same line or next line
-                        distance_match = re.search(r'Distance\s+(\d+)m', line)
+                        distance_match = PJ.DISTANCE.search(line)
                         if distance_match:
                             race_info['distance'] = f"{distance_match.group(1)}m"
 
                 # Alternative VIC patterns: just track name on first line
-                elif idx == 0 and re.match(r'^[A-Za-z\s]+$', line) and len(line.strip()) > 2:
+                elif idx == 0 and PJ.TRACK_LINE.match(line) and len(line.strip()) > 2:
                     # Check if it looks like a track name (alphabetic, reasonable length)
                     if line.replace(' ', '').isalpha() and 3 <= len(line.strip()) <= 25:
                         race_info['track'] = line
             
             # Alternative format: "Race No. 1 Distance 2090m 2:40.70 7.10s 29.80s 29.20s" (TAS 2020 format)
-            alt_header_match = re.match(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m(?:\s+.*)?', line)
+            alt_header_match = PJ.ALT_HEADER.match(line)
             if alt_header_match and not race_info['race_number']:
                 race_info['race_number'] = int(alt_header_match.group(1))
                 race_info['distance'] = f"{alt_header_match.group(2)}m"
             
             # TAS 2020 format with timing data: "Race No. 1 Distance 1680m 2:05.50 7.20s 29.70s 30.40s"
             # Note: The timing values in the header are race summary data, not individually labeled
-            tas_2020_timing_match = re.match(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            tas_2020_timing_match = PJ.TAS_2020_TIMING.match(line)
             if tas_2020_timing_match:
                 race_info['race_number'] = int(tas_2020_timing_match.group(1))
                 race_info['distance'] = f"{tas_2020_timing_match.group(2)}m"
@@ -1550,13 +1522,13 @@ class PDFExtractor:
                     pass  # Keep mile_rate as None if calculation fails
             
             # TAS 2020 format venue extraction: "Sectional information Hobart" or "Hobart Sunday, 2 August 2020"
-            venue_match = re.match(r'^Sectional information\s+(.+)$', line)
+            venue_match = PJ.VENUE.match(line)
             if venue_match and not race_info['track']:
                 race_info['track'] = venue_match.group(1).strip()
             
             # TAS format with detailed race timing info - process this first to capture all timing data
             # "Gross Time:2:41.60 MileRate:2:04.40 LeadTime: 39.30s First Qtr: 31.90s Second Qtr: 31.50s Third Qtr:29.00s Fourth Qtr: 29.90s"
-            tas_detailed_match = re.search(r'Gross\s+Time:([\d:.]+).*?MileRate:([\d:.]+).*?LeadTime:\s*([\d.]+)s.*?First\s+Qtr:\s*([\d.]+)s.*?Second\s+Qtr:\s*([\d.]+)s.*?Third\s+Qtr:([\d.]+)s.*?Fourth\s+Qtr:\s*([\d.]+)s', line)
+            tas_detailed_match = PJ.TAS_DETAILED.search(line)
             if tas_detailed_match:
                 race_info['gross_time'] = tas_detailed_match.group(1)
                 race_info['mile_rate'] = tas_detailed_match.group(2)
@@ -1568,38 +1540,38 @@ class PDFExtractor:
                 continue  # Skip individual patterns if detailed match found
             
             # Alternative venue pattern: "Hobart Sunday, 2 August 2020"
-            venue_date_match = re.match(r'^(.+?)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(.+)$', line)
+            venue_date_match = PJ.VENUE_DATE.match(line)
             if venue_date_match and not race_info['track'] and not race_info['date']:
                 race_info['track'] = venue_date_match.group(1).strip()
                 race_info['date'] = f"{venue_date_match.group(2)}, {venue_date_match.group(3)}".strip()
             
             # TAS 2020 format date extraction: "Sunday, 2 August 2020"
-            date_match = re.match(r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(.+)$', line)
+            date_match = PJ.DATE.match(line)
             if date_match and not race_info['date']:
                 race_info['date'] = f"{date_match.group(1)}, {date_match.group(2)}".strip()
             
             # Fallback individual timing extractions (only if detailed pattern didn't match)
-            timing_match = re.search(r'Gross Time:(\d:\d{2}\.\d{2})', line)
+            timing_match = PJ.GROSS_TIME.search(line)
             if timing_match and not race_info['gross_time']:
                 race_info['gross_time'] = timing_match.group(1)
             
-            mile_rate_match = re.search(r'MileRate:(\d:\d{2}\.\d{2})', line)
+            mile_rate_match = PJ.MILE_RATE.search(line)
             if mile_rate_match and not race_info['mile_rate']:
                 race_info['mile_rate'] = mile_rate_match.group(1)
             
-            quarter_1_match = re.search(r'First Qtr:\s*([\d\.]+)s', line)
+            quarter_1_match = PJ.QUARTER_1.search(line)
             if quarter_1_match and not race_info['quarter_1']:
                 race_info['quarter_1'] = f"{quarter_1_match.group(1)}s"
             
-            quarter_2_match = re.search(r'Second Qtr:\s*([\d\.]+)s', line)
+            quarter_2_match = PJ.QUARTER_2.search(line)
             if quarter_2_match and not race_info['quarter_2']:
                 race_info['quarter_2'] = f"{quarter_2_match.group(1)}s"
             
-            quarter_3_match = re.search(r'Third Qtr:\s*([\d\.]+)s', line)
+            quarter_3_match = PJ.QUARTER_3.search(line)
             if quarter_3_match and not race_info['quarter_3']:
                 race_info['quarter_3'] = f"{quarter_3_match.group(1)}s"
             
-            quarter_4_match = re.search(r'Fourth Qtr:\s*([\d\.]+)s', line)
+            quarter_4_match = PJ.QUARTER_4.search(line)
             if quarter_4_match and not race_info['quarter_4']:
                 race_info['quarter_4'] = f"{quarter_4_match.group(1)}s"
 
@@ -1619,13 +1591,13 @@ class PDFExtractor:
             potential_track = base_name.split('_')[0]
             # If the part before underscore contains numbers, extract just the letters
             # e.g., "MX130925" -> "MX", "GE120925" -> "GE"
-            letters_match = re.match(r'^([A-Za-z]+)', potential_track)
+            letters_match = Common.LEADING_LETTERS.match(potential_track)
             if letters_match:
                 potential_track = letters_match.group(1)
         else:
             # Handle patterns without underscore like "MX130925", "GE120925"
             # Extract letters from start of filename (before numbers)
-            match = re.match(r'^([A-Za-z]+)', base_name)
+            match = Common.LEADING_LETTERS.match(base_name)
             potential_track = match.group(1) if match else base_name
 
         # Map abbreviations to full names for all states
@@ -1678,8 +1650,8 @@ class PDFExtractor:
 
         # Try other filename patterns (track name at start without underscore)
         # Remove common date patterns and numbers
-        clean_name = re.sub(r'\d{4,8}', '', base_name)  # Remove dates like 20240315
-        clean_name = re.sub(r'[-_].*$', '', clean_name)  # Remove everything after first dash/underscore
+        clean_name = Common.FILENAME_DIGITS.sub('', base_name)  # Remove dates like 20240315
+        clean_name = Common.FILENAME_SUFFIX.sub('', clean_name)  # Remove everything after first dash/underscore
 
         if clean_name and clean_name.replace(' ', '').isalpha() and 3 <= len(clean_name) <= 25:
             return clean_name
@@ -1723,13 +1695,12 @@ class PDFExtractor:
                 
                 if pos_800 and '(' in pos_800:
                     # Extract width value from parentheses
-                    import re
-                    width_match = re.search(r'\((\d+)\)', pos_800)
+                    width_match = QldPJ.WIDTH.search(pos_800)
                     if width_match:
                         width_800 = int(width_match.group(1))
                 
                 if pos_400 and '(' in pos_400:
-                    width_match = re.search(r'\((\d+)\)', pos_400)
+                    width_match = QldPJ.WIDTH.search(pos_400)
                     if width_match:
                         width_400 = int(width_match.group(1))
                 
@@ -1760,7 +1731,6 @@ class PDFExtractor:
     
     def _extract_pj_qld_from_text(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Fallback text-based extraction for QLD PJ format"""
-        import re
         runners = []
         lines = text.split('\n')
         
@@ -1786,7 +1756,7 @@ class PDFExtractor:
                     if i + 1 < len(lines):
                         next_line = lines[i + 1].strip()
                         # Pattern: TabNo Plc Margin 800Posi 400Posi Time 3rdQtr 4thQtr [extras]
-                        match = re.match(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', next_line)
+                        match = QldPJ.DATA_LINE.match(next_line)
                         if match:
                             runners.append({
                                 'tab_number': int(match.group(1)),
@@ -1812,7 +1782,7 @@ class PDFExtractor:
                 
             # QLD Marburg format pattern: "6BEE GEES BANDIT 1 0.0m5.6m (1) 6.8m (1) 2:15.60 29.00s 29.89s"
             # Pattern: Number+Horse, Place, Margin+800_margin (800_width), 400_margin (400_width), Time, 3rd_Qtr, 4th_Qtr
-            qld_marburg_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', line)
+            qld_marburg_match = QldPJ.MARBURG_ROW.match(line)
             
             if qld_marburg_match:
                 runners.append({
@@ -1833,7 +1803,7 @@ class PDFExtractor:
             
             # QLD 2022 format pattern: "3WEWILLSEEHOWWE 1 0.0m13.0m (0) 3.4m (1) 2:04.40 29.00s 28.95s"
             # Pattern: Number+Horse, Place, Margin, 800_margin (800_width), 400_margin (400_width), Time, 3rd_Qtr, 4th_Qtr  
-            qld_2022_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', line)
+            qld_2022_match = QldPJ.ROW_2022.match(line)
             
             if qld_2022_match:
                 runners.append({
@@ -1855,7 +1825,7 @@ class PDFExtractor:
             # QLD PJ older pattern from Albion Park data:
             # "1PARISIAN ROCKSTAR 1 0.0m 1:57.10 54.80s (0) 27.69s (0) +4.4"
             # Pattern: Number+Horse Name, Place, Margin, Time, 800m time (W), 400m time (W), optional position change
-            qld_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)(?:\s+([\+\-]?\d+\.\d+))?', line)
+            qld_match = QldPJ.STANDARD_ROW.match(line)
             
             if qld_match:
                 runners.append({
@@ -1872,7 +1842,7 @@ class PDFExtractor:
                 continue
                 
             # QLD simpler format fallback - just tab, horse, place, margin, time
-            simple_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})', line)
+            simple_match = QldPJ.SIMPLE_ROW.match(line)
             if simple_match:
                 runners.append({
                     'tab_number': int(simple_match.group(1)),
@@ -2011,7 +1981,7 @@ class PDFExtractor:
                 
             # VIC Warragul format - horse name concatenated with tab number
             # "6PERSHING 1 0.0m3.8m (1) 1.5m (1) 2:46.40 30.52s 30.49s"
-            warragul_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', line)
+            warragul_match = VicPJ.WARRAGUL_ROW.match(line)
             
             if warragul_match:
                 runner_data = {
@@ -2033,7 +2003,7 @@ class PDFExtractor:
             # VIC enhanced pattern similar to QLD Marburg format
             # "7ANOTHER HORSE 2 1.2m4.5m (1) 2.3m (2) 2:47.80 30.10s 31.20s"
             elif not runner_data:
-                vic_enhanced_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                vic_enhanced_match = VicPJ.ENHANCED_ROW.match(line)
                 
                 if vic_enhanced_match:
                     runner_data = {
@@ -2054,7 +2024,7 @@ class PDFExtractor:
             
             # VIC standard format: "3 1 ANOTHER NAME 1.5m 2.1m (1) 1.8m (2) 2:45.90 29.80s 30.10s"
             elif not runner_data:
-                vic_standard_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                vic_standard_match = VicPJ.STANDARD_ROW.match(line)
                 
                 if vic_standard_match:
                     runner_data = {
@@ -2081,7 +2051,7 @@ class PDFExtractor:
             # VIC Ararat 2025 format - horse name in separate line above data
             # Data line: "3 1 0.0m 0.0m (0) 0.0m (0) 2:10.10 29.20s 28.50s 0.0 0.0"
             # Horse name line above: "American Alli"
-            ararat_2025_match = re.match(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s(?:\s+[\d\.\-\+]+\s+[\d\.\-\+]+)?', line)
+            ararat_2025_match = VicPJ.ARARAT_2025_ROW.match(line)
             
             if ararat_2025_match:
                 tab_number = int(ararat_2025_match.group(1))
@@ -2098,10 +2068,10 @@ class PDFExtractor:
                             potential_name_line = lines[k].strip()
                             
                             # Check if it looks like a horse name
-                            if (re.match(r'^[A-Z][A-Za-z\s&\-\']+$', potential_name_line) and 
+                            if (VicPJ.HORSE_NAME.match(potential_name_line) and 
                                 len(potential_name_line) > 2 and 
                                 potential_name_line not in {'DATA TABLE', 'NO HORSE', 'HORSE', 'POSITION', 'METRES', 'FINISH POSITION'} and
-                                not re.match(r'^\d+', potential_name_line)):  # Not starting with a number
+                                not VicPJ.LEADING_DIGITS.match(potential_name_line)):  # Not starting with a number
                                 horse_name = potential_name_line
                                 break
                         break
@@ -2109,7 +2079,7 @@ class PDFExtractor:
                 # VIC fallback - look directly above the data line
                 if not horse_name and i > 0:
                     prev_line = lines[i-1].strip()
-                    if (re.match(r'^[A-Z][A-Za-z\s&\-\']+$', prev_line) and len(prev_line) > 2 and
+                    if (VicPJ.HORSE_NAME.match(prev_line) and len(prev_line) > 2 and
                         prev_line not in {'DATA TABLE', 'NO HORSE', 'HORSE', 'POSITION', 'METRES'}):
                         horse_name = prev_line
                 
@@ -2133,7 +2103,7 @@ class PDFExtractor:
             # VIC Ararat variant - horse name in separate line above data (older format)
             # Data line: "6 1 0.0m 11.0m (1) 4.6m (2) 2:45.50 29.82s 30.84s"
             # Horse name line above: "JANES GEM"
-            ararat_match = re.match(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', line)
+            ararat_match = VicPJ.ARARAT_ROW.match(line)
             
             if ararat_match:
                 tab_number = int(ararat_match.group(1))
@@ -2150,7 +2120,7 @@ class PDFExtractor:
                             potential_name_line = lines[k].strip()
                             
                             # VIC horse name validation - must be all caps, no numbers at start
-                            if re.match(r'^[A-Z][A-Z\s&\-\']+$', potential_name_line) and len(potential_name_line) > 2:
+                            if VicPJ.UPPER_HORSE_NAME.match(potential_name_line) and len(potential_name_line) > 2:
                                 # VIC specific exclusions
                                 excluded_words = {
                                     'DATA TABLE', 'NO HORSE', 'HORSE', 'PLC', 'MAR', 'TIME', 'QTR', 'POSI',
@@ -2167,7 +2137,7 @@ class PDFExtractor:
                 # VIC fallback - look directly above the data line
                 if not horse_name and i > 0:
                     prev_line = lines[i-1].strip()
-                    if (re.match(r'^[A-Z][A-Z\s&\-\']+$', prev_line) and len(prev_line) > 2 and
+                    if (VicPJ.UPPER_HORSE_NAME.match(prev_line) and len(prev_line) > 2 and
                         prev_line not in {'DATA TABLE', 'NO HORSE', 'HORSE', 'POSITION', 'METRES'}):
                         horse_name = prev_line
                 
@@ -2187,7 +2157,7 @@ class PDFExtractor:
                 continue
                 
             # VIC standard PJ format fallback
-            vic_standard_match = re.match(r'^(\d+)\s*([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)', line)
+            vic_standard_match = VicPJ.FALLBACK_ROW.match(line)
             if vic_standard_match:
                 runners.append({
                     'tab_number': int(vic_standard_match.group(1)),
@@ -2316,7 +2286,6 @@ class PDFExtractor:
     
     def _identify_tas_format(self, text: str) -> str:
         """Identify TAS PDF format based on text structure and header patterns"""
-        import re
         lines = text.split('\n')
         
         # Look for format-specific indicators
@@ -2324,33 +2293,33 @@ class PDFExtractor:
             line = line.strip()
             
             # Format 3 (2025): Look for "800 Posi 400 Posi Time 3rd Qtr 4th Qtr"
-            if re.search(r'800\s+Posi\s+400\s+Posi\s+Time\s+3rd\s+Qtr\s+4th\s+Qtr', line):
+            if TasPJ.HEADER_2025.search(line):
                 return 'format_2025'
             
             # Format 2 (2021): Look for "800Time(W) 400Time(W)First100m" pattern
-            if re.search(r'800Time\(W\)\s+400Time\(W\)First100m', line):
+            if TasPJ.HEADER_2021.search(line):
                 return 'format_2021'
             
             # Format 1 (2020): Look for traditional "First 800m- Last 400m" pattern
-            if re.search(r'First\s+800m-\s+Last\s+400m', line) or re.search(r'800m-\s+Last\s+400m', line):
+            if TasPJ.HEADER_2020.search(line) or TasPJ.HEADER_2020_SHORT.search(line):
                 return 'format_2020'
         
         # Fallback: check data line patterns
         for line in lines:
             line = line.strip()
-            if not line or not re.match(r'^\d', line):
+            if not line or not TasPJ.LEADING_DIGIT.match(line):
                 continue
                 
             # Format 2025 pattern: "1Cincinnati 1 0.0m0.0m (0) 0.0m (0) 2:04.00 29.90s 30.40s"
-            if re.match(r'^\d+[A-Za-z\s&\-\']+\s+\d+\s+[\d\.]+m[\d\.]+m\s+\(\d+\)\s+[\d\.]+m\s+\(\d+\)\s+\d:\d{2}\.\d{2}\s+[\d\.]+s\s+[\d\.]+s', line):
+            if TasPJ.LINE_2025.match(line):
                 return 'format_2025'
             
             # Format 2021 pattern: "1SPRING QUEEN 1 0.0m2:45.20 60.40s (0) 30.20s (0) 6.65s"  
-            if re.match(r'^\d+[A-Za-z\s&\-\']+\s+\d+\s+[\d\.]+m\d:\d{2}\.\d{2}\s+[\d\.]+s\s+\(\d+\)\s+[\d\.]+s\s+\(\d+\)\s+[\d\.]+s', line):
+            if TasPJ.LINE_2021.match(line):
                 return 'format_2021'
             
             # Format 2020 pattern: "1 2 MACH CHARM 0 6.2 1 2 2:45.10 6.81s 28.55s 29.90s"
-            if re.match(r'^\d+\s+\d+\s+[A-Za-z\s&\-\']+\s+[\d\.]+\s+[\d\.]+\s+\d+\s+\d+\s+\d:\d{2}\.\d{2}\s+[\d\.]+s\s+[\d\.]+s(?:\s+[\d\.]+s)?', line):
+            if TasPJ.LINE_2020.match(line):
                 return 'format_2020'
                 
             # Only check first few data lines
@@ -2360,7 +2329,6 @@ class PDFExtractor:
     
     def _extract_tas_format_2025(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Extract Format 3 (2025): NoHorse Plc Mar 800 Posi 400 Posi Time 3rd Qtr 4th Qtr"""
-        import re
         runners = []
         lines = text.split('\n')
         
@@ -2370,7 +2338,7 @@ class PDFExtractor:
                 continue
                 
             # Pattern: "1Cincinnati 1 0.0m0.0m (0) 0.0m (0) 2:04.00 29.90s 30.40s"
-            match = re.match(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            match = TasPJ.ROW_2025.match(line)
             if match:
                 runner_data = {
                     'tab_number': int(match.group(1)),
@@ -2391,7 +2359,6 @@ class PDFExtractor:
     
     def _extract_tas_format_2021(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Extract Format 2 (2021): NoHorse Plc Margin Time 800Time(W) 400Time(W)[First100m]"""
-        import re
         runners = []
         lines = text.split('\n')
         
@@ -2401,7 +2368,7 @@ class PDFExtractor:
                 continue
                 
             # Pattern WITH First100m: "1SPRING QUEEN 1 0.0m2:45.20 60.40s (0) 30.20s (0) 6.65s"
-            match = re.match(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s', line)
+            match = TasPJ.ROW_2021.match(line)
             if match:
                 runner_data = {
                     'tab_number': int(match.group(1)),
@@ -2419,7 +2386,7 @@ class PDFExtractor:
                 continue
             
             # Pattern WITHOUT First100m: "6TARIFA GIRL 1 0.0m2:41.10 58.20s (0) 29.50s (0)"
-            match = re.match(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)$', line)
+            match = TasPJ.ROW_2021_NO_FIRST100.match(line)
             if match:
                 runner_data = {
                     'tab_number': int(match.group(1)),
@@ -2439,7 +2406,6 @@ class PDFExtractor:
     
     def _extract_tas_format_2020(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Extract Format 1 (2020): Plc No Horse Margin(m) 800margin(m) 800width 400Width OverallTime 800m-400m Last400m [First100m]"""
-        import re
         runners = []
         lines = text.split('\n')
         
@@ -2450,7 +2416,7 @@ class PDFExtractor:
                 
             # Pattern with First 100m: "1 2 MACH CHARM 0 6.2 1 2 2:45.10 6.81s 28.55s 29.90s"
             # Column order: Plc No Horse Margin 800margin 800width 400Width OverallTime First100m 800m-400m Last400m
-            match = re.match(r'^(\d+)\s+(\d+)\s+([A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            match = TasPJ.ROW_2020.match(line)
             if match:
                 runner_data = {
                     'finish_position': int(match.group(1)),
@@ -2469,7 +2435,7 @@ class PDFExtractor:
                 continue
                 
             # Pattern without First 100m: "1 2 MACH CHARM 0 6.2 1 2 2:45.10 6.81s 28.55s"
-            match = re.match(r'^(\d+)\s+(\d+)\s+([A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            match = TasPJ.ROW_2020_NO_FIRST100.match(line)
             if match:
                 runner_data = {
                     'finish_position': int(match.group(1)),
@@ -2489,7 +2455,6 @@ class PDFExtractor:
     
     def _extract_pj_tas_from_text(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Enhanced TAS extraction with automatic format detection"""
-        import re
         
         # Identify format first
         format_type = self._identify_tas_format(text)
@@ -2506,7 +2471,6 @@ class PDFExtractor:
     
     def _extract_tas_fallback_patterns(self, text: str, race_info: Dict) -> List[Dict[str, Any]]:
         """Fallback pattern-based extraction for unknown formats"""
-        import re
         runners = []
         lines = text.split('\n')
         
@@ -2521,7 +2485,7 @@ class PDFExtractor:
             
             # TAS 2022 format: "2WESTRAY 1 0.0m2:41.40 61.22s (0) 30.70s (0) 7.18s"
             # Pattern: NoHorse Plc Margin Time 800Time(W) 400Time(W) First100m
-            tas_2022_match = re.match(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s', line)
+            tas_2022_match = TasPJ.ROW_2022.match(line)
             if tas_2022_match:
                 runner_data = {
                     'tab_number': int(tas_2022_match.group(1)),
@@ -2539,7 +2503,7 @@ class PDFExtractor:
             # TAS 2024 format: "1IDEAL SON 1 0.0m0.0m (0) 0.0m (0) 2:39.30 29.90s 30.10s"
             # Pattern: NoHorse Plc Mar 800 Posi 400 Posi Time 3rd Qtr 4th Qtr
             elif not runner_data:
-                tas_2024_match = re.match(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                tas_2024_match = TasPJ.ROW_2024.match(line)
                 if tas_2024_match:
                     runner_data = {
                         'tab_number': int(tas_2024_match.group(1)),
@@ -2558,7 +2522,7 @@ class PDFExtractor:
             # TAS Launceston/Hobart subtype with First 100m (11 groups): "1 2 BRIDWOOD BELLA 0 0 0 0 2:02.60 6.95s 28.60s 28.90s"
             # Pattern: Plc No Horse Margin(m) 800margin(m) 800width 400Width OverallTime 800m-400m Last400m First100m
             elif not runner_data:
-                tas_first100m_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                tas_first100m_match = TasPJ.FIRST100M_ROW.match(line)
                 if tas_first100m_match:
                     runner_data = {
                         'finish_position': int(tas_first100m_match.group(1)),
@@ -2576,7 +2540,7 @@ class PDFExtractor:
             
             # TAS Carrick 2020 format (10 groups): "1 1 HELIKAON 0 0 0 0 2:42.00 29.10s 28.40s" 
             elif not runner_data:
-                tas_carrick_2020_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                tas_carrick_2020_match = TasPJ.CARRICK_2020_ROW.match(line)
                 if tas_carrick_2020_match:
                     runner_data = {
                         'finish_position': int(tas_carrick_2020_match.group(1)),
@@ -2593,7 +2557,7 @@ class PDFExtractor:
             
             # TAS Hobart format: "1IDEN BLACK PRINCE 1 0.0m7.0m (0) 4.0m (0) 2:40.90 28.59s 30.59s"
             elif not runner_data:
-                tas_hobart_match = re.match(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', line)
+                tas_hobart_match = TasPJ.HOBART_ROW.match(line)
                 if tas_hobart_match:
                     runner_data = {
                         'tab_number': int(tas_hobart_match.group(1)),
@@ -2611,7 +2575,7 @@ class PDFExtractor:
             
             # TAS standard format: need to define this pattern
             elif not runner_data:
-                tas_standard_match = re.match(r'^(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+(\d+)\s+([\d\.]+)s\s+(\d+)(?:\s+([\d\.]+)s)?', line)
+                tas_standard_match = TasPJ.STANDARD_ROW.match(line)
                 if tas_standard_match:
                     runner_data = {
                         'tab_number': int(tas_standard_match.group(1)),
@@ -2646,7 +2610,6 @@ class PDFExtractor:
         Standardize SA runner data to ensure consistent fields.
         Ensures all SA runners have both combined and granular width fields.
         """
-        import re
         standardized = runner_data.copy()
         
         # Helper function to parse width fields
@@ -2657,17 +2620,17 @@ class PDFExtractor:
             field_str = str(field).strip()
             
             # Pattern 1: "4.4m (0)" - distance and position
-            match = re.match(r'^([\d\.]+m)\s*\((\d+)\)$', field_str)
+            match = SaPJ.MARGIN_WIDTH.match(field_str)
             if match:
                 return match.group(1), int(match.group(2)), field_str
             
             # Pattern 2: Just distance "4.4m"
-            match = re.match(r'^([\d\.]+m)$', field_str)
+            match = SaPJ.MARGIN.match(field_str)
             if match:
                 return match.group(1), None, field_str
             
             # Pattern 3: Just position "(0)" or "0"
-            match = re.match(r'^\(?(\d+)\)?$', field_str)
+            match = SaPJ.WIDTH.match(field_str)
             if match:
                 return None, int(match.group(1)), field_str
             
@@ -2713,14 +2676,14 @@ class PDFExtractor:
         if 'third_quarter' in standardized and 'third_quarter_seconds' not in standardized:
             third_qtr = standardized['third_quarter']
             if third_qtr:
-                match = re.search(r'([\d\.]+)', str(third_qtr))
+                match = SaPJ.NUMBER.search(str(third_qtr))
                 if match:
                     standardized['third_quarter_seconds'] = float(match.group(1))
         
         if 'fourth_quarter' in standardized and 'fourth_quarter_seconds' not in standardized:
             fourth_qtr = standardized['fourth_quarter']
             if fourth_qtr:
-                match = re.search(r'([\d\.]+)', str(fourth_qtr))
+                match = SaPJ.NUMBER.search(str(fourth_qtr))
                 if match:
                     standardized['fourth_quarter_seconds'] = float(match.group(1))
         
@@ -2751,7 +2714,7 @@ class PDFExtractor:
         race_sections = []
         for i, line in enumerate(lines):
             # Look for race headers: "Race No. 1 Distance 1609m"
-            race_match = re.match(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m', line.strip())
+            race_match = SaPJ.RACE_HEADER.match(line.strip())
             if race_match:
                 race_sections.append({
                     'line_index': i,
@@ -2765,7 +2728,7 @@ class PDFExtractor:
         for line in lines[:5]:  # Check first few lines
             if 'Sectional information' in line:
                 # Pattern: "Sectional information Gawler Sunday, 17 October 2021"
-                match = re.match(r'Sectional information\s+(.+?)\s+(.+)$', line.strip())
+                match = SaPJ.SECTIONAL_VENUE_DATE.match(line.strip())
                 if match:
                     venue = match.group(1)
                     date = match.group(2)
@@ -2816,7 +2779,7 @@ class PDFExtractor:
                 page_text = page.extract_text()
                 
                 # Check if this is the multi-race format (Gawler style)
-                race_count = len(re.findall(r'Race\s+No\.\s+\d+\s+Distance\s+\d+m', page_text))
+                race_count = len(SaPJ.RACE_HEADERS.findall(page_text))
                 
                 if race_count > 1:
                     # This is multi-race format - use special handler
@@ -2916,7 +2879,7 @@ class PDFExtractor:
                     for col_idx in range(1, min(len(row), 3)):
                         if row[col_idx] and row[col_idx].strip():
                             potential_name = row[col_idx].strip()
-                            if re.match(r'^[A-Z][A-Za-z\s&\-\']+$', potential_name):
+                            if SaPJ.HORSE_NAME.match(potential_name):
                                 horse_name = potential_name
                                 break
                 
@@ -2956,7 +2919,7 @@ class PDFExtractor:
                 continue
             
             # SA TAS-2020-style format: "1 5 YANKEE CLIPPER 0 0.4 1 1 2:13.40 29.77s 29.60s"
-            sa_tas_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            sa_tas_match = SaPJ.TAS_STYLE_ROW.match(line)
             if sa_tas_match:
                 runners.append({
                     'finish_position': int(sa_tas_match.group(1)),
@@ -2974,7 +2937,7 @@ class PDFExtractor:
             
             # SA Gawler format: "1 1 MIXED MESSAGES 0 0 0 0 1:58.10 30.30s 29.10s"
             # Format: plc tab_num horse margin 800margin 800width 400width final_time 3rd_qtr 4th_qtr
-            gawler_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            gawler_match = SaPJ.GAWLER_ROW.match(line)
             if gawler_match:
                 runners.append({
                     'finish_position': int(gawler_match.group(1)),
@@ -2994,10 +2957,7 @@ class PDFExtractor:
             
             # Enhanced SA concatenated format with improved parsing
             # Pattern: "2HURRICANE ED 1 0.0m4.4m (0) 4.6m (1) 2:59.20 30.71s 28.87s"
-            sa_concat_match = re.match(
-                r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+)m([\d\.]+)m\s*\((\d+)\)\s+([\d\.]+)m\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s',
-                line
-            )
+            sa_concat_match = SaPJ.CONCAT_ROW.match(line)
             
             if sa_concat_match:
                 tab_number = int(sa_concat_match.group(1))
@@ -3028,7 +2988,7 @@ class PDFExtractor:
                     next_line = lines[i + 1].strip()
                     
                     # Pattern: "+4.4" or "–4.4" (note: uses special dash character)
-                    gain_loss_match = re.search(r'([+–-])([\d\.]+)', next_line)
+                    gain_loss_match = SaPJ.GAIN_LOSS.search(next_line)
                     if gain_loss_match:
                         sign = gain_loss_match.group(1)
                         value = float(gain_loss_match.group(2))
@@ -3082,7 +3042,7 @@ class PDFExtractor:
                     potential_name_line = lines[j].strip()
                     
                     # SA horse name validation - must be all caps, no numbers at start
-                    if (re.match(r'^[A-Z][A-Za-z\s&\-\']+$', potential_name_line) and 
+                    if (SaPJ.HORSE_NAME.match(potential_name_line) and 
                         len(potential_name_line) > 2 and
                         not potential_name_line.isdigit()):
                         
@@ -3104,7 +3064,7 @@ class PDFExtractor:
                         data_line = lines[k].strip()
                         
                         # SA data pattern: "1 0.0m 11.0m (1) 4.6m (2) 2:45.50 29.82s 30.84s"
-                        sa_data_match = re.match(r'^(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s', data_line)
+                        sa_data_match = SaPJ.DATA_ROW.match(data_line)
                         
                         if sa_data_match:
                             runners.append({
@@ -3140,7 +3100,7 @@ class PDFExtractor:
                 page_text = page.extract_text()
                 
                 # Check for multi-race format (Tamworth style)
-                race_count = len(re.findall(r'Race\s+No\.\s+\d+\s+Distance\s+\d+m', page_text))
+                race_count = len(NswPJ.RACE_HEADERS.findall(page_text))
                 
                 if race_count > 1:
                     # This is Tamworth-style multi-race format
@@ -3207,7 +3167,7 @@ class PDFExtractor:
         race_sections = []
         for i, line in enumerate(lines):
             # Look for race headers: "Race No. 1 Distance 1980m"
-            race_match = re.match(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m', line.strip())
+            race_match = NswPJ.RACE_HEADER.match(line.strip())
             if race_match:
                 race_sections.append({
                     'line_index': i,
@@ -3221,7 +3181,7 @@ class PDFExtractor:
         for line in lines[:5]:  # Check first few lines
             if 'Sectional information' in line:
                 # Pattern: "Sectional information TAMWORTH Sunday, 8 January 2017"
-                match = re.match(r'Sectional information\s+(.+?)\s+(.+)$', line.strip())
+                match = NswPJ.SECTIONAL_VENUE_DATE.match(line.strip())
                 if match:
                     venue = match.group(1)
                     date = match.group(2)
@@ -3270,7 +3230,7 @@ class PDFExtractor:
             
             # Try NSW 3-column sectional format first: "1 9 IDEAL SITUATION 0 10.5 1 2 1:52.50 55.76s 41.26s 27.15s"
             # Format: plc tab_num horse margin 800margin 800width 400width final_time last_800m last_600m last_400m
-            nsw_3col_sectional_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            nsw_3col_sectional_match = NswPJ.TAMWORTH_3COL_ROW.match(line)
             
             if nsw_3col_sectional_match:
                 runners.append({
@@ -3293,7 +3253,7 @@ class PDFExtractor:
             
             # Try NSW Penrith multi-race format: "1 8 BRACKEN KNIGHT 0 17.8 1 3 2:06.10 57.49s 28.36s"
             # Format: plc tab_num horse margin 800margin 800width 400width final_time last_800m last_400m
-            nsw_penrith_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            nsw_penrith_match = NswPJ.TAMWORTH_PENRITH_ROW.match(line)
             
             if nsw_penrith_match:
                 runners.append({
@@ -3314,7 +3274,7 @@ class PDFExtractor:
             
             # Original Tamworth format: "1 4 AUSSIE VISTA 0 0 0 0 2:27.40 60.80s 30.70s" (with margin column)
             # Format: plc tab_num horse margin 800margin 800width 400width final_time last_800m last_400m
-            original_tamworth_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+[\d\.]+\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            original_tamworth_match = NswPJ.TAMWORTH_ROW.match(line)
             
             if original_tamworth_match:
                 runners.append({
@@ -3464,7 +3424,7 @@ class PDFExtractor:
             
             # NSW 3-column sectional format - "1 9 IDEAL SITUATION 0 10.5 1 2 1:52.50 55.76s 41.26s 27.15s"
             # Format: Plc No Horse Margin 800_margin 800_width 400_width Overall_Time Last_800m Last_600m Last_400m
-            nsw_3col_sectional_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            nsw_3col_sectional_match = NswPJ.THREE_COL_ROW.match(line)
             
             if nsw_3col_sectional_match:
                 runner_data = {
@@ -3487,7 +3447,7 @@ class PDFExtractor:
             # NSW Newcastle tabular format - "1 6 STRATHLACHLANLUCKY 0 4.5 0 0 2:37.20 61.55s 30.58s"
             # Format: Plc No Horse Margin 800_margin 800_width 400_width Overall_Time Last_800m Last_400m
             # Note: Newcastle format only has width data, no separate 400m margin - we'll set margin_400m to match the main margin
-            newcastle_match = re.match(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+            newcastle_match = NswPJ.NEWCASTLE_ROW.match(line)
             
             if newcastle_match:
                 runner_data = {
@@ -3506,7 +3466,7 @@ class PDFExtractor:
             
             # NSW Dubbo format (similar to TAS PJ) - "8BROOKLYN BANDIT 1 0.0m7.2m (1) 1.4m (2) 2:40.40 29.48s 28.60s"
             elif not runner_data:
-                dubbo_match = re.match(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                dubbo_match = NswPJ.DUBBO_ROW.match(line)
                 
                 if dubbo_match:
                     runner_data = {
@@ -3526,7 +3486,7 @@ class PDFExtractor:
             # NSW Penrith format with separate horse name line
             # Data line: "1 1 0.0m 4.0m (0) 4.4m (0) 2:06.40 29.13s 28.29s"
             elif not runner_data:
-                penrith_match = re.match(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s', line)
+                penrith_match = NswPJ.PENRITH_ROW.match(line)
                 
                 if penrith_match:
                     # Look for horse name in surrounding lines
@@ -3536,7 +3496,7 @@ class PDFExtractor:
                             continue
                         potential_name = lines[j].strip()
                         # NSW horse name validation
-                        if (re.match(r'^[A-Z][A-Za-z\s&\-\']+$', potential_name) and 
+                        if (NswPJ.HORSE_NAME.match(potential_name) and 
                             len(potential_name) > 2 and len(potential_name) < 30):
                             # Exclude common headers
                             excluded_words = {'HORSE', 'DATA TABLE', 'POSITION', 'TIME', 'QUARTER'}
@@ -3581,7 +3541,7 @@ class PDFExtractor:
                 continue
                 
             # Standard PJ with full timing data
-            pj_match = re.match(r'^(\d+)\s*([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)', line)
+            pj_match = PJ.ROW.match(line)
             
             if pj_match:
                 runners.append({
@@ -3598,7 +3558,7 @@ class PDFExtractor:
                 continue
                 
             # Simpler format without timing details
-            simple_match = re.match(r'^(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})', line)
+            simple_match = PJ.SIMPLE_ROW.match(line)
             if simple_match:
                 runners.append({
                     'tab_number': int(simple_match.group(1)),
@@ -3634,22 +3594,11 @@ class PDFExtractor:
     
     def _detect_state_from_text(self, text: str) -> str:
         """Detect state from PDF text content - fallback method"""
-        text_lower = text.lower()
+        found = find_indicators(text.lower())
         
-        # State indicators - order by specificity, most specific first
-        state_indicators = {
-            'tas': ['tasmania', 'carrick', 'hobart', 'launceston', 'devonport', 'tas racing'],
-            'sa': ['south australia', 'gawler', 'globe derby', 'port pirie', 'adelaide'],
-            'qld': ['queensland', 'qld', 'redcliffe', 'albion park', 'ipswich', 'gold coast', 'sunshine coast', 'marburg'],
-            'vic': ['victoria', 'vic', 'cranbourne', 'ballarat', 'ararat', 'warrnambool', 'geelong', 'bendigo'],
-            'nsw': ['new south wales', 'nsw', 'menangle', 'bathurst', 'goulburn', 'newcastle', 'wagga'],
-            'wa': ['western australia', 'wa', 'gloucester', 'fremantle', 'narrogin', 'perth'],
-            'nt': ['northern territory', 'nt', 'darwin'],
-            'act': ['australian capital territory', 'act', 'canberra']
-        }
-        
-        for state, indicators in state_indicators.items():
-            if any(indicator in text_lower for indicator in indicators):
+        # STATE_INDICATORS is ordered by specificity, most specific first
+        for state, indicators in STATE_INDICATORS.items():
+            if count_indicators(found, indicators):
                 return state
         
         return 'unknown'
@@ -3660,28 +3609,28 @@ class PDFExtractor:
         
         if format_type == 'triples':
             # Extract lead time, quarters for TripleS
-            lead_time_match = re.search(r'Lead\s+Time\s+([\d:\.]+)', text, re.IGNORECASE)
+            lead_time_match = Common.LEAD_TIME.search(text)
             if lead_time_match:
                 summary['lead_time'] = lead_time_match.group(1)
                 
         elif format_type == 'pj':
             # Extract gross time, mile rate, quarters for PJ
-            gross_time_match = re.search(r'Gross Time:\s*([\d:\.]+)', text, re.IGNORECASE)
+            gross_time_match = Common.GROSS_TIME.search(text)
             if gross_time_match:
                 summary['gross_time'] = gross_time_match.group(1)
             
-            mile_rate_match = re.search(r'MileRate:\s*([\d:\.]+)', text, re.IGNORECASE)
+            mile_rate_match = Common.MILE_RATE.search(text)
             if mile_rate_match:
                 summary['mile_rate'] = mile_rate_match.group(1)
             
-            lead_time_match = re.search(r'LeadTime:\s*([-\d\.]+s)', text, re.IGNORECASE)
+            lead_time_match = Common.LEADTIME_SECONDS.search(text)
             if lead_time_match:
                 summary['lead_time'] = lead_time_match.group(1)
                 
             # Extract quarters
             quarters = {}
             for i in range(1, 5):
-                quarter_match = re.search(rf'{["First", "Second", "Third", "Fourth"][i-1]}\s+Qtr:\s*([\d\.]+s)', text, re.IGNORECASE)
+                quarter_match = Common.QUARTERS[i-1].search(text)
                 if quarter_match:
                     quarters[f'quarter_{i}'] = quarter_match.group(1)
             summary['quarters'] = quarters
@@ -3699,62 +3648,75 @@ class PDFExtractor:
             Dictionary containing extracted race data
         """
         try:
-            with pdfplumber.open(file_path) as pdf:
-                # Extract text from all pages
-                full_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + "\n"
-                
-                if not full_text.strip():
+            with ExitStack() as documents:
+                # Page text/tables are extracted on first use and shared with the format extractors
+                detection_backend = get_backend(self.backend)
+                pdf = LazyPDF(documents.enter_context(detection_backend.open(file_path)))
+                header_text = pdf.text(self.detection_pages)
+                has_more_pages = len(pdf.pages) > self.detection_pages
+
+                if not header_text.strip() and not pdf.text().strip():
                     return {'error': 'No text could be extracted from PDF'}
-                
-                # Detect format
-                pdf_format = self.detect_format(full_text)
-                
+                if not header_text.strip():
+                    header_text = pdf.text()
+
+                # Detect format from the leading pages, the whole document only if that is inconclusive
+                pdf_format = self.detect_format(header_text)
+                if pdf_format == 'unknown' and has_more_pages:
+                    pdf_format = self.detect_format(pdf.text())
+
                 if pdf_format == 'unknown':
                     error_msg = 'Unknown PDF format - cannot process'
                     return {'error': error_msg}
                 
                 print(f"Detected format: {pdf_format}")
                 
-                # Extract metadata
-                metadata = self.extract_metadata(full_text, pdf_format)
+                # Extract metadata, filling anything the first page lacks from the rest
+                metadata = self.extract_metadata(header_text, pdf_format)
+                if has_more_pages and not (metadata.get('venue') and metadata.get('date')):
+                    full_metadata = self.extract_metadata(pdf.text(), pdf_format)
+                    for key, value in full_metadata.items():
+                        if metadata.get(key) is None:
+                            metadata[key] = value
                 
                 # For triples_detailed, also try to extract venue from first line
                 if pdf_format == 'triples_detailed' and not metadata.get('venue'):
-                    first_line = full_text.split('\n')[0] if full_text else ''
-                    venue_match = re.search(r'^(\w+)\s+\w+\s*-', first_line.strip())
+                    first_line = header_text.split('\n')[0] if header_text else ''
+                    venue_match = Common.FIRST_LINE_VENUE.search(first_line.strip())
                     if venue_match:
                         metadata['venue'] = venue_match.group(1)
                 
                 # Detect state for state-specific extraction - use path first, fallback to text
                 detected_state = self._detect_state_from_path(file_path)
                 if detected_state == 'unknown':
-                    detected_state = self._detect_state_from_text(full_text)
+                    detected_state = self._detect_state_from_text(header_text)
+                    if detected_state == 'unknown' and has_more_pages:
+                        detected_state = self._detect_state_from_text(pdf.text())
                     print(f"Detected state: {detected_state} (from text)")
                 else:
                     print(f"Detected state: {detected_state} (from path)")
+
+                # Parse with the backend benchmarked for this state and format
+                backend = self.backend_for(detected_state, pdf_format)
+                if backend.name != detection_backend.name:
+                    pdf = LazyPDF(documents.enter_context(backend.open(file_path)))
                 
                 # Extract race data based on format and state
                 if pdf_format == 'triples':
                     # VIC files: check if they have PJ-style layout or TripleS detailed layout
                     if detected_state == 'vic':
                         # Check for VIC PJ-style indicators in the text
-                        vic_pj_indicators = ['nohorse plc mar', '800 posi 400 posi', 'position and metres gained from 800m']
-                        text_lower = full_text.lower()
-                        has_pj_indicators = any(indicator in text_lower for indicator in vic_pj_indicators)
+                        has_pj_indicators = count_indicators(find_indicators(pdf.text().lower()), VIC_PJ_INDICATORS) > 0
 
                         if has_pj_indicators:
                             # VIC PJ-style files (like Warragul) use PJ extraction
                             runners_data = self.extract_pj_data(pdf, detected_state, file_path)
                         else:
                             # VIC TripleS detailed files (like Geelong) use TripleS extraction
-                            runners_data = self.extract_triples_data(full_text, detected_state, pdf, file_path)
+                            runners_data = self.extract_triples_data(pdf.text(), detected_state, pdf, file_path)
                     else:
                         # For other TripleS, pass the PDF object for table extraction
-                        runners_data = self.extract_triples_data(full_text, detected_state, pdf, file_path)
+                        runners_data = self.extract_triples_data(pdf.text(), detected_state, pdf, file_path)
                 elif pdf_format == 'triples_detailed':
                     # For detailed TripleS format (like Redcliffe sub-type)
                     runners_data = self.extract_triples_detailed_data(pdf, detected_state, file_path)
@@ -3763,7 +3725,7 @@ class PDFExtractor:
                     if detected_state in ['qld', 'vic', 'tas', 'sa', 'nsw']:
                         runners_data = self.extract_pj_data(pdf, detected_state, file_path)
                     else:
-                        runners_data = self.extract_pj_data(full_text, detected_state, file_path)
+                        runners_data = self.extract_pj_data(pdf.text(), detected_state, file_path)
                 else:
                     runners_data = []
 
@@ -3788,7 +3750,7 @@ class PDFExtractor:
                                 runner['track'] = fallback_track
 
                 # Extract race summary
-                race_summary = self.extract_race_summary(full_text, pdf_format)
+                race_summary = self.extract_race_summary(pdf.text(), pdf_format)
                 
                 return {
                     'success': True,
@@ -3957,9 +3919,96 @@ class PDFExtractor:
                 continue
         
         # If parsing fails, create a safe filename version
-        safe_date = re.sub(r'[^\w\d]', '_', date_str)
+        safe_date = Common.NON_WORD.sub('_', date_str)
         return safe_date[:20]  # Limit length
 
+# ---------------------------------------------------------------------------
+# Batch extraction across worker processes
+# ---------------------------------------------------------------------------
+
+_worker_extractor = None
+
+
+def _init_extract_worker():
+    """Pool initializer: one PDFExtractor per worker process, reused for every file it is given"""
+    global _worker_extractor
+    _worker_extractor = PDFExtractor()
+
+
+def _extract_in_worker(file_path: str) -> Dict[str, Any]:
+    return _worker_extractor.extract_pdf_data(file_path)
+
+
+def iter_extractions(pdf_files: List[str], workers: int = 1, extractor: 'PDFExtractor' = None,
+                     state: str = None, cache=None):
+    """
+    Yield (pdf_file, extract) for each file in the order given, where extract() returns
+    extract_pdf_data's result or raises its error.
+
+    With workers > 1 the files are parsed in a process pool (pdfplumber is CPU bound) while the
+    caller still writes CSVs and stats in file order, so output matches a serial run. When a state
+    is given, results come from / go to the content-hash extraction cache.
+
+    Args:
+        pdf_files: PDF paths, already sorted
+        workers: Number of extraction processes (1 = extract inline with `extractor`)
+        extractor: PDFExtractor for the serial path (optional, will create if not provided)
+        state: State code for the extraction cache (optional, no caching without it)
+        cache: ExtractionCache instance (optional, defaults to the shared one)
+    """
+    if state and cache is None:
+        cache = get_shared_extraction_cache()
+    if not state:
+        cache = None
+
+    def lookup(pdf_file):
+        """(sha256, cached) where cached loads the stored result, None on a miss"""
+        if cache is None:
+            return None, None
+        try:
+            sha256 = cache.file_hash(pdf_file)
+        except OSError:
+            return None, None
+        if cache.contains(state, sha256):
+            return sha256, (lambda: cache.get(state, sha256))
+        return sha256, None
+
+    def storing(pdf_file, sha256, run):
+        def extract():
+            extracted_data = run()
+            if sha256:
+                cache.put(state, sha256, os.path.basename(pdf_file), extracted_data)
+            return extracted_data
+        return extract
+
+    if workers is None or workers <= 1 or len(pdf_files) <= 1:
+        extractor = extractor or PDFExtractor()
+        for pdf_file in pdf_files:
+            sha256, cached = lookup(pdf_file)
+            if cached is not None:
+                yield pdf_file, cached
+            else:
+                yield pdf_file, storing(pdf_file, sha256, lambda f=pdf_file: extractor.extract_pdf_data(f))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(pdf_files)), initializer=_init_extract_worker)
+    try:
+        pending = []
+        for pdf_file in pdf_files:
+            sha256, cached = lookup(pdf_file)
+            if cached is not None:
+                pending.append((pdf_file, cached))
+            else:
+                future = pool.submit(_extract_in_worker, pdf_file)
+                pending.append((pdf_file, storing(pdf_file, sha256, future.result)))
+        for pdf_file, extract in pending:
+            yield pdf_file, extract
+    finally:
+        # stops queued files if the caller bails out early
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
 def main():
     """Main function for command line usage"""
     if len(sys.argv) < 2:
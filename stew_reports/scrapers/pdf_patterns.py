@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Regular expressions and indicator tables for the sectional PDF extractor.
+
+Every pattern PDFExtractor runs is compiled once here at import instead of being looked up
+in the re module cache on every line of every page. Patterns are grouped per (state, format)
+as class attributes (VicPJ.WARRAGUL_ROW, QldTripleS.RANK, ...), state layouts inheriting the
+rows and headers their format shares; PATTERNS maps each (state, format) to its group.
+
+Format and state detection use plain substring indicators. find_indicators() tests every
+distinct indicator once per text, and the format, detailed TripleS and state tables are then
+counted from that one result.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet
+
+# ----------------------------------------------------------------------
+# Format and state indicators
+# ----------------------------------------------------------------------
+
+# TripleS format indicators - more comprehensive
+TRIPLES_INDICATORS = (
+    'triples',
+    'triplesdata',
+    'data processed by triples',
+    'fastest section',
+    'top speed',
+    'distance travelled',
+    'gross time',
+    'mile rate',
+    'horse/driver',
+    'first 50m',
+    'first 100m',
+    'first 200m',
+    'first half',
+    'middle half',
+    'last half',
+    'lead time',
+    '1st quarter',
+    '2nd quarter',
+    '3rd quarter',
+    '4th quarter',
+    # VIC-specific TripleS indicators
+    'gross time:',
+    'milerate:',
+    'mile rate:',
+    'leadtime:',
+    'lead time:',
+    'first qtr:',
+    'second qtr:',
+    'third qtr:',
+    'fourth qtr:',
+    'position and metres gained from 800m',
+    'finish position and metres gained',
+)
+
+# PJ format indicators - more comprehensive
+PJ_INDICATORS = (
+    'p j data',
+    'pj data',
+    'sectionals powered by',
+    'tasracing',
+    # SA-specific PJ indicators
+    'nohorse plc mar',  # Very specific SA PJ header pattern
+    'globe derby park',  # SA venue indicator
+    '800 posi 400 posi',  # SA column header pattern
+    # Other PJ indicators
+    'plc margin time',
+    '800time(w)',
+    '400time(w)',
+    'first100m',
+    'no horse',
+    'data table: 800 / 400',
+)
+
+# Detailed TripleS format (like Redcliffe sub-type), specific enough not to match VIC files
+DETAILED_TRIPLES_INDICATORS = (
+    'driver section 50m 100m 200m mile travelled',  # Very specific to detailed format
+    'fastest section',  # Specific detailed field
+    'first 50m',  # Specific detailed field
+    'first 100m',  # Specific detailed field
+    'first 200m',  # Specific detailed field
+    'distance travelled',  # Specific detailed field
+)
+
+# VIC TripleS files with a PJ-style layout (like Warragul)
+VIC_PJ_INDICATORS = ('nohorse plc mar', '800 posi 400 posi', 'position and metres gained from 800m')
+
+# State indicators - order by specificity, most specific first
+STATE_INDICATORS = {
+    'tas': ('tasmania', 'carrick', 'hobart', 'launceston', 'devonport', 'tas racing'),
+    'sa': ('south australia', 'gawler', 'globe derby', 'port pirie', 'adelaide'),
+    'qld': ('queensland', 'qld', 'redcliffe', 'albion park', 'ipswich', 'gold coast', 'sunshine coast', 'marburg'),
+    'vic': ('victoria', 'vic', 'cranbourne', 'ballarat', 'ararat', 'warrnambool', 'geelong', 'bendigo'),
+    'nsw': ('new south wales', 'nsw', 'menangle', 'bathurst', 'goulburn', 'newcastle', 'wagga'),
+    'wa': ('western australia', 'wa', 'gloucester', 'fremantle', 'narrogin', 'perth'),
+    'nt': ('northern territory', 'nt', 'darwin'),
+    'act': ('australian capital territory', 'act', 'canberra'),
+}
+
+# Fallback patterns when the indicators are inconclusive, matched against the lowercased text
+TRIPLES_FALLBACK_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'horse/\s*driver',
+    r'km/h.*fastest.*section',
+    r'speed.*section.*first.*50m.*100m.*200m',
+    r'r\s*t\s*a\s*a\s*n\s*b\s*k',  # The column headers pattern
+    r'lead\s*time.*quarter.*quarter.*quarter.*quarter',
+    r'\[(\d+)\].*\[(\d+)\].*\[(\d+)\]',  # Position indicators
+    r'first\s*half.*middle\s*half.*last\s*half',
+    r'margin.*travelled',
+    r'fastest\s*section',
+    r'first\s*50m',
+    r'first\s*100m',
+    r'first\s*200m',
+    r'middle\s*half',
+    r'last\s*half',
+    r'distance\s*travelled',
+    r'gross\s*time.*mile\s*rate.*travelled',
+    r'\d{2}\.\d{2}\s+0:\d{2}\.\d{2}',  # Speed + time pattern
+    r'lead\s*q[1-4]',
+    r'q[1-4]\s*q[1-4]',
+))
+
+PJ_FALLBACK_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'plc.*margin.*time.*800time',
+    r'finish position and metres gained',
+    r'gross time:.*mile.*rate:',
+    r'horse.*plc.*margin.*time.*800time.*400time',
+    r'metres gained from 800m',
+    r'\(\d+\).*\(\d+\)',  # Win indicators pattern
+    r'first\s*qtr:.*second\s*qtr:.*third\s*qtr:.*fourth\s*qtr:',
+    r'nohorse.*plc.*mar.*800.*posi.*400.*posi',
+    r'data\s*table:\s*800\s*/\s*400',
+    r'milerate:\s*\d+:\d+\.\d+',
+    r'leadtime:\s*\d+\.\d+s',
+    r'race\s+\d+\s+distance\s+\d+m',
+    r'sunday.*\d+\s+\w+\s+\d{4}',
+    r'saturday.*\d+\s+\w+\s+\d{4}',
+    r'monday.*\d+\s+\w+\s+\d{4}',
+    r'tuesday.*\d+\s+\w+\s+\d{4}',
+    r'wednesday.*\d+\s+\w+\s+\d{4}',
+    r'thursday.*\d+\s+\w+\s+\d{4}',
+    r'friday.*\d+\s+\w+\s+\d{4}',
+))
+
+# Every distinct indicator, longest first
+ALL_INDICATORS = tuple(sorted(
+    set(TRIPLES_INDICATORS) | set(PJ_INDICATORS) | set(DETAILED_TRIPLES_INDICATORS) | set(VIC_PJ_INDICATORS)
+    | {indicator for indicators in STATE_INDICATORS.values() for indicator in indicators},
+    key=lambda indicator: (-len(indicator), indicator)))
+
+
+@lru_cache(maxsize=8)
+def find_indicators(text_lower: str) -> FrozenSet[str]:
+    """
+    Indicators present in a lowercased text, each distinct indicator tested once
+
+    Detection looks at the same header (or full) text for format, detailed format and state,
+    so the result is memoised per text.
+    """
+    return frozenset(indicator for indicator in ALL_INDICATORS if indicator in text_lower)
+
+
+def count_indicators(found: FrozenSet[str], indicators) -> int:
+    """How many entries of an indicator table are in find_indicators() output"""
+    return sum(1 for indicator in indicators if indicator in found)
+
+
+# ----------------------------------------------------------------------
+# Extraction patterns per (state, format)
+# ----------------------------------------------------------------------
+
+class Common:
+    """Metadata, race summary, filename and field cleaning patterns shared by every state and format"""
+    VENUE_STATE = re.compile(r'(\w+(?:\s+\w+)*)\s+(VIC|QLD|NSW|SA|TAS|WA|NT|ACT)\s*-?\s*[A-Z-]*', re.IGNORECASE)
+    DATE = re.compile(r'(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})', re.IGNORECASE)
+    RACE = re.compile(r'Race\s+(\d+):\s*([^-\n]+?)\s*-\s*(\d+)m', re.IGNORECASE)
+    PJ_HEADER = re.compile(r'(\w+(?:\s+\w+)*)\s+Race\s+(\d+)\s+Distance\s+(\d+)m\s+(\w+,\s*\d{1,2}\s+\w+\s+\d{4})', re.IGNORECASE)
+    SECTIONAL_VENUE = re.compile(r'Sectional information\s+([A-Za-z]+)', re.IGNORECASE)
+    WEEKDAY_DATE = re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})', re.IGNORECASE)
+    RACE_2020 = re.compile(r'Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m', re.IGNORECASE)
+    NON_NUMERIC = re.compile(r'[^\d\.]')
+    TIME = re.compile(r'(\d:\d{2}\.\d{2})')
+    SECONDS = re.compile(r'(\d{2}\.\d{2})s')
+    MARGIN_WIDTH = re.compile(r'^([\d\.]+m)\s*\((\d+)\)$')
+    LEADING_LETTERS = re.compile(r'^([A-Za-z]+)')
+    FILENAME_DIGITS = re.compile(r'\d{4,8}')
+    FILENAME_SUFFIX = re.compile(r'[-_].*$')
+    LEAD_TIME = re.compile(r'Lead\s+Time\s+([\d:\.]+)', re.IGNORECASE)
+    GROSS_TIME = re.compile(r'Gross Time:\s*([\d:\.]+)', re.IGNORECASE)
+    MILE_RATE = re.compile(r'MileRate:\s*([\d:\.]+)', re.IGNORECASE)
+    LEADTIME_SECONDS = re.compile(r'LeadTime:\s*([-\d\.]+s)', re.IGNORECASE)
+    FIRST_LINE_VENUE = re.compile(r'^(\w+)\s+\w+\s*-')
+    NON_WORD = re.compile(r'[^\w\d]')
+    QUARTERS = [re.compile(rf'{quarter}\s+Qtr:\s*([\d\.]+s)', re.IGNORECASE)
+                for quarter in ('First', 'Second', 'Third', 'Fourth')]
+
+
+class TripleS:
+    """TripleS race headers and the text rows of the generic TripleS layout"""
+    RACE = re.compile(r'Race\s+(\d+):\s*([^-\n]+?)\s*-\s*(\d+)m', re.IGNORECASE)
+    TRACK = re.compile(r'^([A-Za-z\s]+?)\s+Race')
+    TRACK_LINE = re.compile(r'^[A-Za-z\s]+(?:\s+VIC)?(?:\s*-|$)')
+    VIC_SUFFIX = re.compile(r'\s+VIC\s*-.*$', re.IGNORECASE)
+    DASH_SUFFIX = re.compile(r'\s*-.*$')
+    DAY_MONTH_YEAR = re.compile(r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})', re.IGNORECASE)
+    WEEKDAY_DATE = re.compile(r'(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s*(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})', re.IGNORECASE)
+    RANK = re.compile(r'^(\d+)\s+(\d+)')
+    HORSE = re.compile(r'\b([A-Z][A-Z\s&\-\']{3,30})\b')
+    SPEED = re.compile(r'(\d{2}\.\d{2})\s+0:(\d{2}\.\d{2})')
+    QUARTERS = re.compile(r'(\d:\d{2}\.\d{2})\s+\[(\d+)\]')
+    TIME_MARGIN = re.compile(r'(\d:\d{2}\.\d{2})\s*(\+?\d+\.?\d*m|0m)')
+
+
+class VicTripleS(TripleS):
+    """VIC TripleS table cells (time, [position], margin, driver) on top of the TripleS rows"""
+    TIME = re.compile(r'(\d:\d{2}\.\d{2})')
+    POSITION = re.compile(r'\[(\d+)\]')
+    MARGIN = re.compile(r'(\+?\d+\.?\d*m|0m)')
+    TIME_POSITION = re.compile(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]')
+    DRIVER = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$')
+
+
+class NswTripleS(VicTripleS):
+    """NSW TripleS sheets use the VIC layout"""
+
+
+class QldTripleS:
+    """QLD TripleS text rows and the timing lines printed under each horse"""
+    TIME = re.compile(r'(\d:\d{2}\.\d{2})')
+    POSITION = re.compile(r'\[(\d+)\]')
+    MARGIN = re.compile(r'(\+?\d+\.?\d*m|0m)')
+    TIME_POSITION = re.compile(r'(\d:\d{2}\.\d{2})\s*\[(\d+)\]')
+    RANK = re.compile(r'^(\d+)\s+(\d+)\s+')
+    HORSE = re.compile(r'^([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d{1,2}\.\d{2})')
+    DRIVER = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+    RACE_TIME = re.compile(r'\d:\d{2}\.\d{2}')
+    QUARTER_TIMES = re.compile(r'\((\d:\d{2}\.\d{2})\)')
+    DISTANCE_LINE = re.compile(r'\d+m.*\d+m.*\d+m')
+    DISTANCES = re.compile(r'(\d+)m')
+
+
+class TripleSDetailed:
+    """Detailed TripleS (Redcliffe style) race header and table cells"""
+    RACE = re.compile(r'Race\s+(\d+).*?(\d+)m\s*$')
+    DATE = re.compile(r'(\d{1,2}\s+\w+\s+\d{4})')
+    TIME = re.compile(r'(\d:\d{2}\.\d{2})')
+
+
+class PJ:
+    """PJ race headers, timing lines and the rows and horse names shared by the state layouts"""
+    HEADER = re.compile(r'^(.+?)\s+Race\s+(\d+)\s+Distance\s+(\d+)m\s+(.+)$')
+    VIC_RACE = re.compile(r'^([A-Za-z\s]+?)\s+Race\s+(\d+)')
+    DISTANCE = re.compile(r'Distance\s+(\d+)m')
+    TRACK_LINE = re.compile(r'^[A-Za-z\s]+$')
+    ALT_HEADER = re.compile(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m(?:\s+.*)?')
+    TAS_2020_TIMING = re.compile(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s')
+    VENUE = re.compile(r'^Sectional information\s+(.+)$')
+    TAS_DETAILED = re.compile(r'Gross\s+Time:([\d:.]+).*?MileRate:([\d:.]+).*?LeadTime:\s*([\d.]+)s.*?First\s+Qtr:\s*([\d.]+)s.*?Second\s+Qtr:\s*([\d.]+)s.*?Third\s+Qtr:([\d.]+)s.*?Fourth\s+Qtr:\s*([\d.]+)s')
+    VENUE_DATE = re.compile(r'^(.+?)\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(.+)$')
+    DATE = re.compile(r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(.+)$')
+    GROSS_TIME = re.compile(r'Gross Time:(\d:\d{2}\.\d{2})')
+    MILE_RATE = re.compile(r'MileRate:(\d:\d{2}\.\d{2})')
+    QUARTER_1 = re.compile(r'First Qtr:\s*([\d\.]+)s')
+    QUARTER_2 = re.compile(r'Second Qtr:\s*([\d\.]+)s')
+    QUARTER_3 = re.compile(r'Third Qtr:\s*([\d\.]+)s')
+    QUARTER_4 = re.compile(r'Fourth Qtr:\s*([\d\.]+)s')
+    ROW = re.compile(r'^(\d+)\s*([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)')
+    SIMPLE_ROW = re.compile(r'^(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})')
+    HORSE_NAME = re.compile(r'^[A-Z][A-Za-z\s&\-\']+$')
+    RACE_HEADER = re.compile(r'^Race\s+No\.\s+(\d+)\s+Distance\s+(\d+)m')
+    RACE_HEADERS = re.compile(r'Race\s+No\.\s+\d+\s+Distance\s+\d+m')
+    SECTIONAL_VENUE_DATE = re.compile(r'Sectional information\s+(.+?)\s+(.+)$')
+
+
+class QldPJ(PJ):
+    """QLD PJ rows (Marburg, 2022 and Albion Park layouts)"""
+    WIDTH = re.compile(r'\((\d+)\)')
+    DATA_LINE = re.compile(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    MARBURG_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+    ROW_2022 = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+    STANDARD_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)(?:\s+([\+\-]?\d+\.\d+))?')
+    SIMPLE_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\'NZ]+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})')
+
+
+class VicPJ(PJ):
+    """VIC PJ rows (Warragul, Ararat and standard layouts)"""
+    WARRAGUL_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+    ENHANCED_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    STANDARD_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    ARARAT_2025_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s(?:\s+[\d\.\-\+]+\s+[\d\.\-\+]+)?')
+    LEADING_DIGITS = re.compile(r'^\d+')
+    ARARAT_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+    UPPER_HORSE_NAME = re.compile(r'^[A-Z][A-Z\s&\-\']+$')
+    FALLBACK_ROW = re.compile(r'^(\d+)\s*([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s*\((\d+)\)\s+(\d{2}\.\d{2})s\s*\((\d+)\)')
+
+
+class TasPJ(PJ):
+    """TAS PJ layouts (2020, 2021/2022, 2024/2025) and the lines that identify them"""
+    HEADER_2025 = re.compile(r'800\s+Posi\s+400\s+Posi\s+Time\s+3rd\s+Qtr\s+4th\s+Qtr')
+    HEADER_2021 = re.compile(r'800Time\(W\)\s+400Time\(W\)First100m')
+    HEADER_2020 = re.compile(r'First\s+800m-\s+Last\s+400m')
+    HEADER_2020_SHORT = re.compile(r'800m-\s+Last\s+400m')
+    LEADING_DIGIT = re.compile(r'^\d')
+    LINE_2025 = re.compile(r'^\d+[A-Za-z\s&\-\']+\s+\d+\s+[\d\.]+m[\d\.]+m\s+\(\d+\)\s+[\d\.]+m\s+\(\d+\)\s+\d:\d{2}\.\d{2}\s+[\d\.]+s\s+[\d\.]+s')
+    LINE_2021 = re.compile(r'^\d+[A-Za-z\s&\-\']+\s+\d+\s+[\d\.]+m\d:\d{2}\.\d{2}\s+[\d\.]+s\s+\(\d+\)\s+[\d\.]+s\s+\(\d+\)\s+[\d\.]+s')
+    LINE_2020 = re.compile(r'^\d+\s+\d+\s+[A-Za-z\s&\-\']+\s+[\d\.]+\s+[\d\.]+\s+\d+\s+\d+\s+\d:\d{2}\.\d{2}\s+[\d\.]+s\s+[\d\.]+s(?:\s+[\d\.]+s)?')
+    ROW_2025 = re.compile(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    ROW_2021 = re.compile(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s')
+    ROW_2021_NO_FIRST100 = re.compile(r'^(\d+)([A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)$')
+    ROW_2020 = re.compile(r'^(\d+)\s+(\d+)\s+([A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s')
+    ROW_2020_NO_FIRST100 = re.compile(r'^(\d+)\s+(\d+)\s+([A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    ROW_2022 = re.compile(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s\s+\((\d+)\)\s+([\d\.]+)s')
+    ROW_2024 = re.compile(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s+\((\d+)\)\s+([\d\.]+m)\s+\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    FIRST100M_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s')
+    CARRICK_2020_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    HOBART_ROW = re.compile(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+    STANDARD_ROW = re.compile(r'^(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+(\d+)\s+([\d\.]+)s\s+(\d+)(?:\s+([\d\.]+)s)?')
+
+
+class SaPJ(PJ):
+    """SA PJ rows (Gawler, TAS-style and concatenated layouts) and width fields"""
+    MARGIN_WIDTH = re.compile(r'^([\d\.]+m)\s*\((\d+)\)$')
+    MARGIN = re.compile(r'^([\d\.]+m)$')
+    WIDTH = re.compile(r'^\(?(\d+)\)?$')
+    NUMBER = re.compile(r'([\d\.]+)')
+    TAS_STYLE_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    GAWLER_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    CONCAT_ROW = re.compile(r'^(\d+)([A-Z][A-Za-z\s&\-\']+?)\s+(\d+)\s+([\d\.]+)m([\d\.]+)m\s*\((\d+)\)\s+([\d\.]+)m\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    GAIN_LOSS = re.compile(r'([+–-])([\d\.]+)')
+    DATA_ROW = re.compile(r'^(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+(\d{2}\.\d{2})s\s+(\d{2}\.\d{2})s')
+
+
+class NswPJ(PJ):
+    """NSW PJ rows (Tamworth, Penrith, Newcastle and Dubbo layouts)"""
+    TAMWORTH_3COL_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s')
+    TAMWORTH_PENRITH_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    TAMWORTH_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Za-z\s&\-\']+?)\s+[\d\.]+\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    THREE_COL_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s\s+([\d\.]+)s')
+    NEWCASTLE_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([A-Z][A-Z\s&\-\']+?)\s+([\d\.]+)\s+([\d\.]+)\s+(\d+)\s+(\d+)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    DUBBO_ROW = re.compile(r'^(\d+)([A-Z][A-Z\s&\-\']+?)\s+(\d+)\s+([\d\.]+m)([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+    PENRITH_ROW = re.compile(r'^(\d+)\s+(\d+)\s+([\d\.]+m)\s+([\d\.]+m)\s*\((\d+)\)\s+([\d\.]+m)\s*\((\d+)\)\s+(\d:\d{2}\.\d{2})\s+([\d\.]+)s\s+([\d\.]+)s')
+
+
+# (state, format) -> patterns, None for the format-wide group
+PATTERNS: Dict[tuple, type] = {
+    (None, None): Common,
+    (None, 'triples'): TripleS,
+    ('vic', 'triples'): VicTripleS,
+    ('nsw', 'triples'): NswTripleS,
+    ('qld', 'triples'): QldTripleS,
+    (None, 'triples_detailed'): TripleSDetailed,
+    (None, 'pj'): PJ,
+    ('qld', 'pj'): QldPJ,
+    ('vic', 'pj'): VicPJ,
+    ('tas', 'pj'): TasPJ,
+    ('sa', 'pj'): SaPJ,
+    ('nsw', 'pj'): NswPJ,
+}
+
+
+def patterns_for(state: str, pdf_format: str) -> type:
+    """Pattern group for a (state, format), falling back to the format's and then the common group"""
+    return PATTERNS.get((state, pdf_format)) or PATTERNS.get((None, pdf_format)) or Common
@@ -27,7 +27,7 @@ import argparse
 
 # Add the parent directory to the path to import pdf_extractor
 sys.path.append(str(Path(__file__).parent))
-from pdf_extractor import PDFExtractor
+from pdf_extractor import PDFExtractor, iter_extractions
 
 def setup_logging(sample_mode: bool = False):
     """Set up logging for the NSW processing script"""
@@ -229,7 +229,7 @@ def save_format_specific_csv(runners: List[Dict], format_type: str, sub_format:
 
     return csv_path
 
-def process_all_nsw_pdfs(input_dir=None, output_dir=None, logger=None, sample_size: int = None, debug: bool = False, force_reprocess: bool = True):
+def process_all_nsw_pdfs(input_dir=None, output_dir=None, logger=None, sample_size: int = None, debug: bool = False, force_reprocess: bool = True, workers: int = 1):
     """Enhanced NSW PDF processing with comprehensive analysis and error handling
 
     Args:
@@ -239,6 +239,7 @@ def process_all_nsw_pdfs(input_dir=None, output_dir=None, logger=None, sample_si
         sample_size: Number of files to process (optional)
         debug: Enable debug mode (optional)
         force_reprocess: If True, reprocess files even if they already exist (default: True for meta_processor)
+        workers: Number of PDF extraction processes, results are still written in file order (default: 1)
     """
 
     # Setup logging
@@ -294,6 +295,8 @@ def process_all_nsw_pdfs(input_dir=None, output_dir=None, logger=None, sample_si
     
     start_time = datetime.now()
     
+    # Check which files already exist in a format folder
+    to_process = []
     for i, pdf_file in enumerate(pdf_files, 1):
         filename = os.path.basename(pdf_file)
         base_name = os.path.splitext(filename)[0]
@@ -314,12 +317,21 @@ def process_all_nsw_pdfs(input_dir=None, output_dir=None, logger=None, sample_si
 
             if already_exists:
                 continue
+        to_process.append((i, pdf_file))
+
+    if workers > 1:
+        logger.info(f"Extracting {len(to_process)} PDFs with {workers} worker processes")
+    extractions = iter_extractions([pdf_file for _, pdf_file in to_process], workers, extractor, state='nsw')
+
+    # Process each PDF file, in order even when extracted in parallel
+    for (i, pdf_file), (_, extract) in zip(to_process, extractions):
+        filename = os.path.basename(pdf_file)
         
         print(f"[{i:3d}/{len(pdf_files)}] Processing: {filename}")
         
         try:
             # Extract data
-            extracted_data = extractor.extract_pdf_data(pdf_file)
+            extracted_data = extract()
             
             if extracted_data and 'runners' in extracted_data and len(extracted_data['runners']) > 0:
                 # Extract track name
@@ -10,10 +10,10 @@ import traceback
 import glob
 from datetime import datetime
 from pathlib import Path
-from pdf_extractor import PDFExtractor
+from pdf_extractor import PDFExtractor, iter_extractions
 
 
-def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True):
+def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True, workers=1):
     """Process all QLD PDFs and extract to CSV files
 
     Args:
@@ -21,6 +21,7 @@ def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
         output_dir: Output directory path (optional)
         logger: Logger instance (optional)
         force_reprocess: If True, reprocess files even if they already exist (default: True for meta_processor)
+        workers: Number of PDF extraction processes, results are still written in file order (default: 1)
     """
 
     # Initialize extractor
@@ -57,6 +58,7 @@ def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
     processed = 0
     successful = 0
     failed = 0
+    skipped = 0
     total_runners = 0
     total_races = 0
     format_counts = {}
@@ -64,10 +66,11 @@ def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
     
     start_time = datetime.now()
     
+    # Check which files already exist in a format folder
+    to_process = []
     for i, pdf_file in enumerate(pdf_files, 1):
         filename = os.path.basename(pdf_file)
         output_filename = filename.replace('.pdf', '_extracted.csv')
-        output_path = os.path.join(output_dir, output_filename)
         
         # Skip if already processed (check all format folders)
         if not force_reprocess:
@@ -77,16 +80,27 @@ def process_all_qld_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
                 if os.path.exists(format_output_path):
                     print(f"[{i:3d}/{len(pdf_files)}] SKIPPED: {filename} (already exists in {format_type}/)")
                     already_exists = True
+                    skipped += 1
                     break
 
             if already_exists:
                 continue
+        to_process.append((i, pdf_file))
+
+    if workers > 1:
+        print(f"Extracting {len(to_process)} PDFs with {workers} worker processes")
+    extractions = iter_extractions([pdf_file for _, pdf_file in to_process], workers, extractor, state='qld')
+
+    # Process each PDF file, in order even when extracted in parallel
+    for (i, pdf_file), (_, extract) in zip(to_process, extractions):
+        filename = os.path.basename(pdf_file)
+        output_filename = filename.replace('.pdf', '_extracted.csv')
         
         print(f"[{i:3d}/{len(pdf_files)}] Processing: {filename}")
         
         try:
             # Extract data
-            extracted_data = extractor.extract_pdf_data(pdf_file)
+            extracted_data = extract()
             
             if extracted_data and 'runners' in extracted_data and len(extracted_data['runners']) > 0:
                 runners = len(extracted_data['runners'])
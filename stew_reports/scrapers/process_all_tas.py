@@ -10,9 +10,9 @@ import sys
 import traceback
 import glob
 from datetime import datetime
-from pdf_extractor import PDFExtractor
+from pdf_extractor import PDFExtractor, iter_extractions
 
-def process_all_tas_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True):
+def process_all_tas_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True, workers=1):
     """Process all TAS PDFs and extract to format-specific CSV folders
 
     Args:
@@ -20,6 +20,7 @@ def process_all_tas_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
         output_dir: Output directory path (optional)
         logger: Logger instance (optional)
         force_reprocess: If True, reprocess files even if they already exist (default: True for meta_processor)
+        workers: Number of PDF extraction processes, results are still written in file order (default: 1)
     """
 
     # Initialize extractor
@@ -64,6 +65,8 @@ def process_all_tas_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
     
     start_time = datetime.now()
     
+    # Check which files already exist in a format folder
+    to_process = []
     for i, pdf_file in enumerate(pdf_files, 1):
         filename = os.path.basename(pdf_file)
         output_filename = filename.replace('.pdf', '_extracted.csv')
@@ -83,12 +86,22 @@ def process_all_tas_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
 
             if already_exists:
                 continue
+        to_process.append((i, pdf_file))
+
+    if workers > 1:
+        print(f"Extracting {len(to_process)} PDFs with {workers} worker processes")
+    extractions = iter_extractions([pdf_file for _, pdf_file in to_process], workers, extractor, state='tas')
+
+    # Process each PDF file, in order even when extracted in parallel
+    for (i, pdf_file), (_, extract) in zip(to_process, extractions):
+        filename = os.path.basename(pdf_file)
+        output_filename = filename.replace('.pdf', '_extracted.csv')
         
         print(f"[{i:3d}/{len(pdf_files)}] Processing: {filename}")
         
         try:
             # Extract data
-            extracted_data = extractor.extract_pdf_data(pdf_file)
+            extracted_data = extract()
             
             if extracted_data and 'runners' in extracted_data and len(extracted_data['runners']) > 0:
                 runners = len(extracted_data['runners'])
@@ -19,7 +19,7 @@ import logging
 
 # Add the parent directory to the path to import pdf_extractor
 sys.path.append(str(Path(__file__).parent))
-from pdf_extractor import PDFExtractor
+from pdf_extractor import PDFExtractor, iter_extractions
 
 def setup_logging():
     """Set up logging for the VIC processing script"""
@@ -227,7 +227,7 @@ def save_format_specific_csv(runners: List[Dict], format_type: str, output_dir:
 
     return csv_path
 
-def process_all_vic_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True):
+def process_all_vic_pdfs(input_dir=None, output_dir=None, logger=None, force_reprocess=True, workers=1):
     """Enhanced VIC PDF processing with comprehensive analysis and error handling
 
     Args:
@@ -235,6 +235,7 @@ def process_all_vic_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
         output_dir: Output directory path (optional)
         logger: Logger instance (optional)
         force_reprocess: If True, reprocess files even if they already exist (default: True for meta_processor)
+        workers: Number of PDF extraction processes, results are still written in file order (default: 1)
     """
 
     # Setup logging
@@ -283,7 +284,8 @@ def process_all_vic_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
     
     start_time = datetime.now()
     
-    # Process each PDF file
+    # Check which files already exist in a format folder
+    to_process = []
     for i, pdf_file in enumerate(pdf_files, 1):
         filename = os.path.basename(pdf_file)
         base_name = os.path.splitext(filename)[0]
@@ -304,13 +306,22 @@ def process_all_vic_pdfs(input_dir=None, output_dir=None, logger=None, force_rep
 
             if already_exists:
                 continue
+        to_process.append((i, pdf_file))
+
+    if workers > 1:
+        logger.info(f"Extracting {len(to_process)} PDFs with {workers} worker processes")
+    extractions = iter_extractions([pdf_file for _, pdf_file in to_process], workers, extractor, state='vic')
+
+    # Process each PDF file, in order even when extracted in parallel
+    for (i, pdf_file), (_, extract) in zip(to_process, extractions):
+        filename = os.path.basename(pdf_file)
         
         logger.info(f"[{i:3d}/{len(pdf_files)}] Processing: {filename}")
         stats['processed'] += 1
         
         try:
             # Extract data using enhanced extractor
-            extracted_data = extractor.extract_pdf_data(pdf_file)
+            extracted_data = extract()
             
             if extracted_data and 'runners' in extracted_data and len(extracted_data['runners']) > 0:
                 runners = extracted_data['runners']
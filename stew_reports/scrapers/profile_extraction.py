@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Profile PDF extraction on a corpus and report how much of the time goes to regular expressions.
+
+Every PDF is extracted under cProfile. Time spent inside the re module (pattern compilation
+and the compiled pattern cache included) and inside compiled pattern methods counts as regex time.
+The report gives the share of total extraction time spent in the extractor's own patterns
+(regex calls made by the PDF library while parsing are listed apart) and the PDFExtractor
+methods that spend the most of it. Run it before and after changing pdf_patterns.py to compare.
+
+Usage:
+    python profile_extraction.py --states vic tas --sample 20
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import argparse
+import contextlib
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
+
+sys.path.append(str(Path(__file__).parent))
+from pdf_extractor import PDFExtractor
+from benchmark_backends import DEFAULT_BASE_DIR, find_corpus
+
+RE_MODULE_DIR = os.path.dirname(__import__('re').__file__)
+
+
+def is_regex_function(func: Tuple[str, int, str]) -> bool:
+    """True for profile entries of the re module, its compiler and compiled pattern methods"""
+    filename, _, name = func
+    if filename == '~':
+        return "'re.Pattern'" in name or '_sre.' in name
+    return filename.startswith(RE_MODULE_DIR + os.sep) or os.path.basename(filename) in ('re.py', 'sre_compile.py', 'sre_parse.py')
+
+
+def regex_time_by_caller(stats: pstats.Stats) -> Dict[Tuple[str, str], List[float]]:
+    """[calls, cumulative regex seconds] per (file, function) that called into the re module"""
+    by_caller = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not is_regex_function(func):
+            continue
+        for caller, (_, calls, _, cumulative) in callers.items():
+            if is_regex_function(caller):
+                continue
+            entry = by_caller.setdefault((caller[0], caller[2]), [0, 0.0])
+            entry[0] += calls
+            entry[1] += cumulative
+    return by_caller
+
+
+def profile_extraction(corpus: List[Tuple[str, str]], backend: Optional[str] = None) -> Dict:
+    """
+    Extract every PDF under cProfile and split the regex time between the extractor's own
+    patterns (called from this directory) and the PDF library's parsing
+    """
+    extractor = PDFExtractor(backend=backend)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    for state, pdf_file in corpus:
+        with contextlib.redirect_stdout(io.StringIO()):
+            profiler.runcall(extractor.extract_pdf_data, pdf_file)
+    wall_seconds = time.perf_counter() - start
+
+    stats = pstats.Stats(profiler)
+    by_caller = regex_time_by_caller(stats)
+    extractor_dir = str(Path(__file__).parent)
+    extractor_callers = {name: entry for (filename, name), entry in by_caller.items() if filename.startswith(extractor_dir)}
+    return {
+        'files': len(corpus),
+        'wall_seconds': wall_seconds,
+        'profiled_seconds': stats.total_tt,
+        'regex_seconds': sum(seconds for _, seconds in extractor_callers.values()),
+        'regex_calls': sum(calls for calls, _ in extractor_callers.values()),
+        'library_regex_seconds': sum(seconds for (filename, _), (_, seconds) in by_caller.items()
+                                     if not filename.startswith(extractor_dir)),
+        'by_method': extractor_callers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the regex share of PDF extraction time')
+    parser.add_argument('--states', nargs='+', default=['nsw', 'vic', 'qld', 'sa', 'tas'],
+                        help='States whose PDFs make up the corpus')
+    parser.add_argument('--base-dir', default=str(DEFAULT_BASE_DIR), help='stew_reports directory')
+    parser.add_argument('--backend', help='Force one PDF backend (default: per state/format defaults)')
+    parser.add_argument('--sample', type=int, help='Only use the first N PDFs per state')
+    parser.add_argument('--top', type=int, default=15, help='Methods to list by regex time (default: 15)')
+    parser.add_argument('--save', action='store_true', help='Also write the report to logs/')
+    args = parser.parse_args()
+
+    corpus = find_corpus(args.states, Path(args.base_dir))
+    if args.sample:
+        corpus = [item for state in args.states for item in [c for c in corpus if c[0] == state][:args.sample]]
+    if not corpus:
+        print(f"No PDFs found for {args.states} under {args.base_dir}")
+        return
+
+    print(f"Profiling extraction of {len(corpus)} PDFs")
+    report = profile_extraction(corpus, args.backend)
+    share = report['regex_seconds'] / report['profiled_seconds'] if report['profiled_seconds'] else 0.0
+
+    print("\n" + "=" * 80)
+    print("REGEX SHARE OF EXTRACTION TIME")
+    print("=" * 80)
+    print(f"  Files:                {report['files']}")
+    print(f"  Extraction time:      {report['profiled_seconds']:.3f}s profiled ({report['wall_seconds']:.3f}s wall)")
+    print(f"  Extractor regex time: {report['regex_seconds']:.3f}s ({share:.1%}) in {report['regex_calls']:,} calls")
+    print(f"  PDF library regex:    {report['library_regex_seconds']:.3f}s (parsing, not affected by pdf_patterns)")
+    print(f"\n  Top {args.top} extractor methods by regex time:")
+    top = sorted(report['by_method'].items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (calls, seconds) in top:
+        print(f"    {name:<45} {seconds:.4f}s  {calls:8,d} calls")
+
+    if args.save:
+        report_file = Path(args.base_dir) / "logs" / f"regex_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        report_file.parent.mkdir(exist_ok=True)
+        rows = [['total', 'extraction', None, report['profiled_seconds']],
+                ['total', 'extractor_regex', report['regex_calls'], report['regex_seconds']],
+                ['total', 'library_regex', None, report['library_regex_seconds']]]
+        rows += [['method', name, calls, seconds] for name, (calls, seconds) in sorted(report['by_method'].items())]
+        pd.DataFrame(rows, columns=['kind', 'name', 'calls', 'seconds']).to_csv(report_file, index=False)
+        print(f"\nReport saved to {report_file}")
+
+
+if __name__ == "__main__":
+    main()
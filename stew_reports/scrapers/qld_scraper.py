@@ -11,6 +11,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from utils.base_scraper import BaseScraper
 from utils.selenium_scraper import SeleniumScraper
 from config.states import STATES_CONFIG
+from scrapers.extraction_cache import get_shared_extraction_cache
 
 class QLDScraper(BaseScraper):
     def __init__(self, base_dir: str = None):
@@ -18,11 +19,17 @@ class QLDScraper(BaseScraper):
         self.config = STATES_CONFIG['qld']
     
     def _has_extracted_csv(self, pdf_filename: str) -> bool:
-        """Check if a PDF has already been extracted to CSV"""
+        """Check if a PDF has already been extracted with the current QLD extractor version
+
+        The link's bytes aren't known before download, so this goes by the filenames recorded
+        in the extraction cache; renamed copies are still caught by content hash at processing.
+        PDFs extracted before the cache existed are still recognised by their _extracted.csv.
+        """
+        if get_shared_extraction_cache().has_filename('qld', pdf_filename):
+            return True
         csv_filename = pdf_filename.replace('.pdf', '_extracted.csv')
         processed_dir = os.path.join(self.base_dir, 'data', 'processed', 'qld')
-        csv_path = os.path.join(processed_dir, csv_filename)
-        return os.path.exists(csv_path)
+        return os.path.exists(os.path.join(processed_dir, csv_filename))
     
     def scrape_specific_date(self, target_date: str, file_types: List[str] = None) -> Dict:
         """Scrape PDFs for a specific date
@@ -15,7 +15,8 @@ from typing import Dict, List, Optional
 import logging
 
 # Import the PDF extractor
-from .pdf_extractor import PDFExtractor
+from .pdf_extractor import PDFExtractor, iter_extractions
+from .extraction_cache import get_shared_extraction_cache
 
 class StateProcessor:
     """Unified processor for all state PDF/XLS files"""
@@ -26,6 +27,7 @@ class StateProcessor:
             base_dir = str(Path(__file__).parent.parent)
         self.base_dir = Path(base_dir)
         self.extractor = PDFExtractor()
+        self.cache = get_shared_extraction_cache()
 
         # Track mapping for all states (consolidated from all process_all files)
         self.track_mappings = {
@@ -83,7 +85,7 @@ class StateProcessor:
         }
 
     def process_state_files(self, state: str, input_dir: str, output_dir: str,
-                           logger: Optional[logging.Logger] = None) -> Dict:
+                           logger: Optional[logging.Logger] = None, workers: int = 1) -> Dict:
         """
         Process all PDF/XLS files for a specific state using the actual process_all_{state} functions
 
@@ -92,6 +94,7 @@ class StateProcessor:
             input_dir: Directory containing input files
             output_dir: Directory for output CSVs
             logger: Optional logger instance
+            workers: Number of PDF extraction processes (default: 1, serial)
 
         Returns:
             Dictionary with processing statistics
@@ -105,19 +108,19 @@ class StateProcessor:
         try:
             if state == 'vic':
                 from scrapers.process_all_vic import process_all_vic_pdfs
-                return process_all_vic_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger)
+                return process_all_vic_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger, workers=workers)
             elif state == 'nsw':
                 from scrapers.process_all_nsw import process_all_nsw_pdfs
-                return process_all_nsw_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger)
+                return process_all_nsw_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger, workers=workers)
             elif state == 'qld':
                 from scrapers.process_all_qld import process_all_qld_pdfs
-                return process_all_qld_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger)
+                return process_all_qld_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger, workers=workers)
             elif state == 'sa':
                 from scrapers.process_all_sa import process_all_sa_pdfs
-                return process_all_sa_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger)
+                return process_all_sa_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger, workers=workers)
             elif state == 'tas':
                 from scrapers.process_all_tas import process_all_tas_pdfs
-                return process_all_tas_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger)
+                return process_all_tas_pdfs(input_dir=input_dir, output_dir=output_dir, logger=logger, workers=workers)
             elif state == 'wa':
                 from scrapers.process_all_wa import process_all_wa_files
                 return process_all_wa_files(input_dir=input_dir, output_dir=output_dir, logger=logger)
@@ -127,14 +130,15 @@ class StateProcessor:
         except Exception as e:
             logger.error(f"Error calling process_all_{state}: {e}")
             logger.info(f"Falling back to default processing for {state}")
-            return self._fallback_processing(state, input_dir, output_dir, logger)
+            return self._fallback_processing(state, input_dir, output_dir, logger, workers)
 
     def _fallback_processing(self, state: str, input_dir: str, output_dir: str,
-                           logger: Optional[logging.Logger] = None) -> Dict:
+                           logger: Optional[logging.Logger] = None, workers: int = 1) -> Dict:
         """
         Fallback processing method when process_all_{state} functions aren't available or compatible
 
-        This is the original processing logic from StateProcessor
+        This is the original processing logic from StateProcessor. With workers > 1 PDFs are
+        extracted in a process pool and written back in file order.
         """
         if logger is None:
             logger = logging.getLogger(__name__)
@@ -186,24 +190,34 @@ class StateProcessor:
 
         start_time = datetime.now()
 
-        # Process each file
+        # Skip files whose content was already extracted under the state's current extractor
+        # version (whatever they are called now) and still has its CSV. Cached content without
+        # a CSV goes through below, served from the cache, so the CSV is written again.
+        to_process = []
         for i, file_path in enumerate(files_to_process, 1):
             filename = os.path.basename(file_path)
-            base_name = os.path.splitext(filename)[0]
-
-            # Check if file already exists in any format folder
-            already_exists = False
-            for format_dir in ['pj', 'triples', 'unknown']:
-                check_path = os.path.join(output_dir, format_dir, f"{base_name}*.csv")
-                existing_files = glob.glob(check_path)
-                if existing_files:
-                    logger.info(f"[{i:3d}/{len(files_to_process)}] SKIPPED: {filename} (already exists in {format_dir}/)")
+            file_hash = self.cache.file_hash(file_path)
+            if self.cache.contains(state, file_hash):
+                names = {filename} | set(self.cache.filenames(state, file_hash))
+                if any(self._has_output_csv(output_dir, name) for name in names):
+                    logger.info(f"[{i:3d}/{len(files_to_process)}] SKIPPED: {filename} (unchanged, extracted with {state} extractor v{self.cache.version(state)})")
                     stats['skipped'] += 1
-                    already_exists = True
-                    break
+                    continue
+            to_process.append((i, file_path, file_hash))
 
-            if already_exists:
-                continue
+        # PDFs are extracted (in parallel when workers > 1) and consumed here in file order
+        if state.lower() == 'wa':
+            extractions = [(file_path, None) for _, file_path, _ in to_process]
+        else:
+            if workers > 1:
+                logger.info(f"Extracting {len(to_process)} PDFs with {workers} worker processes")
+            extractions = iter_extractions([file_path for _, file_path, _ in to_process], workers, self.extractor,
+                                           state=state, cache=self.cache)
+
+        # Process each file
+        for (i, file_path, file_hash), (_, extract) in zip(to_process, extractions):
+            filename = os.path.basename(file_path)
+            base_name = os.path.splitext(filename)[0]
 
             logger.info(f"[{i:3d}/{len(files_to_process)}] Processing: {filename}")
             stats['processed'] += 1
@@ -211,9 +225,13 @@ class StateProcessor:
             try:
                 # Process the file based on type
                 if state.lower() == 'wa':
-                    extracted_data = self._process_wa_xls(file_path)
+                    extracted_data = self.cache.get(state, file_hash)
+                    if extracted_data is None:
+                        extracted_data = self._process_wa_xls(file_path)
+                        if extracted_data and extracted_data.get('success'):
+                            self.cache.put(state, file_hash, filename, extracted_data)
                 else:
-                    extracted_data = self._process_pdf_with_state_logic(file_path, state)
+                    extracted_data = self._process_pdf_with_state_logic(file_path, state, extract)
 
                 if extracted_data and extracted_data.get('success'):
                     runners = extracted_data.get('runners', [])
@@ -319,14 +337,22 @@ class StateProcessor:
 
         return stats
 
-    def _process_pdf_with_state_logic(self, file_path: str, state: str) -> Dict:
+    @staticmethod
+    def _has_output_csv(output_dir: str, filename: str) -> bool:
+        """True if a CSV for this source file exists in any format folder"""
+        base_name = os.path.splitext(filename)[0]
+        return any(glob.glob(os.path.join(output_dir, format_dir, f"{glob.escape(base_name)}*.csv"))
+                   for format_dir in ['pj', 'triples', 'unknown'])
+
+    def _process_pdf_with_state_logic(self, file_path: str, state: str, extract=None) -> Dict:
         """
         Process PDF using state-specific logic from the enhanced extractors
 
-        This uses all the improvements we made in the individual process_all_{state} files
+        This uses all the improvements we made in the individual process_all_{state} files.
+        extract is the pending result from iter_extractions when the PDF was parsed in a worker.
         """
         # Use the enhanced PDF extractor with all our improvements
-        extracted_data = self.extractor.extract_pdf_data(file_path)
+        extracted_data = extract() if extract is not None else self.extractor.extract_pdf_data(file_path)
 
         # Add state information
         if extracted_data and extracted_data.get('runners'):